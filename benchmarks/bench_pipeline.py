@@ -0,0 +1,152 @@
+"""解析 → 匹配 → 渲染 全流程分阶段基准测试（合成数据）
+
+用法（在仓库根目录）:
+    python -m benchmarks.bench_pipeline [--rows 1000 10000 100000] [--format xlsx]
+    python -m benchmarks.bench_pipeline --rows 10000 --compare benchmarks/results/旧结果.json
+
+结果写入JSON（默认 benchmarks/results/pipeline-<版本>-<时间>.json），可与其他版本的结果对比。
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+
+import pandas as pd
+
+from mwgen import __version__
+from mwgen.generator import ZTEScriptGenerator
+from mwgen.ingest import IngestReport, excel_engine, read_table
+from mwgen.log import NullLog
+from mwgen.network import LinkTable
+from mwgen.packaging import package_rendered
+from mwgen.processor import DataProcessor, convert_ip_format
+
+from .synthetic import make_workbooks
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def timed(stages, name, func, items):
+    """执行func并记录该阶段的耗时和吞吐量，返回func的结果"""
+    start = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - start
+    stages[name] = {
+        'seconds': round(seconds, 6),
+        'items': items,
+        'items_per_second': round(items / seconds, 1) if seconds > 0 else None,
+    }
+    return value
+
+
+def run_pipeline(rows, file_format='xlsx', lookups=1000):
+    """对rows条链路的合成数据逐阶段计时，返回 {阶段名: 计时结果}"""
+    dcn_file, datasheet_file = make_workbooks(rows, file_format)
+    stages = {}
+
+    convert_ip_format.cache_clear()
+    dcn_data = timed(stages, 'parse_dcn_file', lambda: DataProcessor.parse_dcn_file(dcn_file), rows)
+    if dcn_data is None:
+        raise RuntimeError('DCN解析失败')
+
+    # 单独计时清理和IP修复：先读取原始表格（不计时）
+    dcn_file.seek(0)
+    raw = read_table(dcn_file, IngestReport(dcn_file.name, 'dcn'), sheet_selector=DataProcessor.select_dcn_sheet)
+    cleaned = timed(stages, 'clean_dcn_data', lambda: DataProcessor.clean_dcn_data(raw), rows)
+    convert_ip_format.cache_clear()
+    timed(stages, 'fix_ip_addresses', lambda: DataProcessor.fix_ip_addresses(cleaned, NullLog()), rows)
+
+    datasheet_data = timed(stages, 'parse_datasheet_file',
+                           lambda: DataProcessor.parse_datasheet_file(datasheet_file), rows)
+    if datasheet_data is None:
+        raise RuntimeError('Datasheet解析失败')
+    timed(stages, 'auto_detect_columns',
+          lambda: DataProcessor.auto_detect_columns(datasheet_data, NullLog()), 1)
+    chave_index, site_index = timed(stages, 'build_indexes', lambda: (
+        DataProcessor.build_chave_index(datasheet_data), DataProcessor.build_site_index(dcn_data)
+    ), rows * 2)
+
+    # 查找和渲染只取均匀分布的部分CHAVE
+    all_chaves = chave_index.all_chaves()
+    step = max(1, len(all_chaves) // lookups)
+    chaves = all_chaves[::step][:lookups]
+    configs = timed(stages, 'find_site_config', lambda: [
+        DataProcessor.find_site_config(dcn_data, datasheet_data, chave, NullLog(),
+                                       chave_index=chave_index, site_index=site_index)
+        for chave in chaves
+    ], len(chaves))
+    missing = sum(config is None for config in configs)
+    if missing:
+        raise RuntimeError(f'{missing} 个CHAVE未生成配置')
+    # 全网配置表：一次计算所有链路，再按同样的CHAVE读表
+    link_table = timed(stages, 'build_link_table',
+                       lambda: LinkTable.build(dcn_data, datasheet_data, chave_index, site_index), rows)
+    timed(stages, 'link_table_lookup', lambda: link_table.results(chaves), len(chaves))
+
+    rendered = timed(stages, 'generate_script', lambda: [
+        (chave, config, '',
+         ZTEScriptGenerator.generate_script(config, for_site_a=True),
+         ZTEScriptGenerator.generate_script(config, for_site_a=False))
+        for chave, config in zip(chaves, configs)
+    ], len(configs) * 2)
+    zip_bytes, _ = timed(stages, 'zip_packaging', lambda: package_rendered(rendered), len(rendered))
+    stages['zip_packaging']['bytes'] = len(zip_bytes)
+    return stages
+
+
+def environment(file_format):
+    return {
+        'mwgen_version': __version__,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'format': file_format,
+        'excel_engine': excel_engine('.xlsx') if file_format == 'xlsx' else 'csv',
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def print_run(rows, stages, baseline=None):
+    print(f"\n== {rows:,} 行 ==")
+    for name, stage in stages.items():
+        line = f"  {name:<22} {stage['seconds']:>10.4f}s  {stage['items']:>8,} 项"
+        if baseline and name in baseline and stage['seconds'] > 0:
+            line += f"  ×{baseline[name]['seconds'] / stage['seconds']:.2f} (对比基线)"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help='链路数（可多个）')
+    parser.add_argument('--format', choices=('xlsx', 'csv'), default='xlsx', help='合成文件格式')
+    parser.add_argument('--lookups', type=int, default=1000, help='每个规模下查找和渲染的CHAVE数')
+    parser.add_argument('--output', help='结果JSON路径（默认写入 benchmarks/results/）')
+    parser.add_argument('--compare', help='基线结果JSON，输出各阶段相对基线的加速比')
+    args = parser.parse_args(argv)
+
+    baselines = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baselines = {run['rows']: run['stages'] for run in json.load(baseline_file)['runs']}
+
+    result = {'environment': environment(args.format), 'runs': []}
+    for rows in args.rows:
+        stages = run_pipeline(rows, args.format, args.lookups)
+        result['runs'].append({'rows': rows, 'stages': stages})
+        print_run(rows, stages, baselines.get(rows))
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f'pipeline-{__version__}-{stamp}.json')
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(result, output_file, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存: {output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""模板引擎与原f-string实现的吞吐量对比
+
+用法（在仓库根目录）:
+    python -m benchmarks.bench_template [--links 2000]
+"""
+import argparse
+import time
+
+from mwgen.generator import ZTEScriptGenerator
+
+
+def legacy_generate_script(config, for_site_a=True):
+    """重构前的f-string实现，仅作为基准对照"""
+    if for_site_a:
+        site = config['site_a']
+        peer = config['site_b']
+        site_id = site['site_name']
+        tx_frequency = site['tx_frequency']  # 使用站点A自己的TX频率
+        rx_frequency = site['rx_frequency']  # 使用站点A自己的RX频率
+    else:
+        site = config['site_b']
+        peer = config['site_a']
+        site_id = site['site_name']
+        tx_frequency = site['tx_frequency']  # 使用站点B自己的TX频率
+        rx_frequency = site['rx_frequency']  # 使用站点B自己的RX频率
+    
+    # 生成对端描述
+    peer_suffix = peer['site_name'].split('-')[-1] if '-' in peer['site_name'] else peer['site_name']
+    
+    script = f"""configure terminal
+
+radio-global-switch enable 
+
+!
+device-para siteId  {site_id} 
+hostname {site['device_name']}
+
+!
+device-para neIpType  ipv4 
+device-para neIpv4  {site['ip']} 
+
+!
+nms-vlan  {site['vlan']} 
+interface   vlan{site['vlan']} 
+ip address  {site['ip']}  255.255.255.248 
+$
+
+!
+ip route 0.0.0.0 0.0.0.0  {site['gateway']} 
+
+!
+
+clock timezone  America/Sao_Paulo  -3 
+
+
+!
+ntp  enable 
+ntp poll-interval  8 
+ntp source ipv4  {site['ip']} 
+
+!
+ntp server     10.192.12.200  priority  1 
+
+ntp server     10.216.96.174  priority  2 
+
+!
+snmp-server version v3  enable 
+snmp-server  enable trap snmp 
+snmp-server trap-source  {site['ip']} 
+
+!
+snmp-server group   group1 v3 priv read AllView write AllView notify AllView 
+snmp-server user  zte  group1 v3 auth  md5   ZXMW.nr10 priv des56   Ztesnmp2014 
+
+snmp-server group   group1 v3 priv read AllView write AllView notify AllView 
+snmp-server user  telco_zte  group1 v3 auth  md5   Telco@zte123 priv des56   Telco@zte123 
+
+!
+snmp-server host    10.98.178.109 trap version 3 priv  zte udp-port 162 snmp 
+
+snmp-server host    10.103.67.13 trap version 3 priv  zte udp-port 162 snmp 
+
+snmp-server host    10.216.59.50 trap version 3 priv  telco_zte udp-port 162 snmp 
+
+snmp-server host    10.192.67.183 trap version 3 priv  telco_zte udp-port 162 snmp 
+
+snmp-server host    10.221.63.226 trap version 3 priv  telco_zte udp-port 162 snmp 
+
+
+radio-group xpic
+xpic  xpic-1 
+mode auto
+members
+member  tu-1/1/0/1 horizontal 
+member  tu-1/1/0/2 vertical 
+activate
+yes
+$
+$
+$
+!
+pla
+pla-group  pla-1/1/0/1 
+member  tu-1/1/0/1 
+yes
+$
+member  tu-1/1/0/2 
+yes
+$
+$
+
+!
+radio-channel  radio-1/1/0/1 
+bandwidth  {config['radio_params']['bandwidth']} 
+yes
+modulation
+fixed-modulation  {config['radio_params']['modulation']} 
+$
+tx-frequency  {tx_frequency} 
+rx-frequency  {rx_frequency} 
+tx-power  {config['radio_params']['tx_power']} 
+discription  To_{peer_suffix}_H1 
+operation-mode  {config['radio_params']['operation_mode']} 
+yes
+$
+
+!
+radio-channel  radio-1/1/0/2 
+bandwidth  {config['radio_params']['bandwidth']} 
+yes
+modulation
+fixed-modulation  {config['radio_params']['modulation']} 
+$
+tx-frequency  {tx_frequency} 
+rx-frequency  {rx_frequency} 
+tx-power  {config['radio_params']['tx_power']} 
+discription  To_{peer_suffix}_V1 
+operation-mode  {config['radio_params']['operation_mode']} 
+yes
+$
+
+!
+!
+
+antenna 1
+tu-name radio-1/1/0/1
+azimuth 256.38
+elevation -1.09
+height 19.0
+install-pol-type horizontal
+manufactures ZTE
+size 0.6
+type MA06U15
+$
+
+antenna 2
+tu-name radio-1/1/0/2
+azimuth 256.38
+elevation -1.09
+height 19.0
+install-pol-type vertical
+manufactures ZTE
+size 0.6
+type MA06U15
+$
+
+$
+interface  xgei-1/1/0/5 
+no shutdown
+description  
+speed  speed-10G 
+$
+
+interface  xgei-1/1/0/6 
+no shutdown
+description  
+speed  speed-10G 
+$
+
+interface  xgei-1/1/0/7 
+no shutdown
+description  
+speed  speed-10G 
+$
+
+interface  xgei-1/1/0/8 
+no shutdown
+description  
+speed  speed-10G 
+$
+
+!
+switchvlan-configuration
+interface  pla-1/1/0/1 
+switchport mode trunk
+switchport trunk vlan  {site['vlan']} 
+$
+$
+
+switchvlan-configuration
+interface  xgei-1/1/0/5 
+switchport mode trunk
+switchport trunk vlan  {site['vlan']} 
+$
+$
+
+switchvlan-configuration
+interface  xgei-1/1/0/6 
+switchport mode trunk
+switchport trunk vlan  {site['vlan']} 
+$
+$
+
+switchvlan-configuration
+interface  xgei-1/1/0/7 
+switchport mode trunk
+switchport trunk vlan  {site['vlan']} 
+$
+$
+
+switchvlan-configuration
+interface  xgei-1/1/0/8 
+switchport mode trunk
+switchport trunk vlan  {site['vlan']} 
+$
+$
+
+! 
+
+line   netconf absolute-timeout 0  
+
+line netconf   idle-timeout 0  
+
+exit 
+
+write
+"""
+    return script
+
+
+def sample_config(i):
+    """构造第i条链路的配置"""
+    return {
+        'chave_number': f'CHV{i:05d}',
+        'site_a': {
+            'site_name': f'SITE-A{i:05d}', 'device_name': f'MWE-ZT-A{i:05d}-N1',
+            'ip': f'10.226.{i // 256 % 256}.{i % 256}', 'vlan': 2900 + i % 50,
+            'gateway': '10.226.0.1', 'mask': '255.255.255.248', 'tx_frequency': 14977000, 'rx_frequency': 14577000,
+        },
+        'site_b': {
+            'site_name': f'SITE-B{i:05d}', 'device_name': f'MWE-ZT-B{i:05d}-N1',
+            'ip': f'10.227.{i // 256 % 256}.{i % 256}', 'vlan': 2900 + i % 50,
+            'gateway': '10.227.0.1', 'mask': '255.255.255.248', 'tx_frequency': 14577000, 'rx_frequency': 14977000,
+        },
+        'radio_params': {'bandwidth': 112000, 'tx_power': 220, 'modulation': 'bpsk', 'operation_mode': 'G02'},
+    }
+
+
+def measure(render, configs):
+    """返回渲染全部链路两端脚本的耗时（秒）"""
+    start = time.perf_counter()
+    for config in configs:
+        render(config, True)
+        render(config, False)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--links', type=int, default=2000, help='链路数量（每条渲染两端脚本）')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数，取最快一次')
+    args = parser.parse_args(argv)
+
+    configs = [sample_config(i) for i in range(args.links)]
+    for config in configs[:50]:
+        for for_site_a in (True, False):
+            assert ZTEScriptGenerator.generate_script(config, for_site_a) == \
+                legacy_generate_script(config, for_site_a), '模板输出与原实现不一致'
+
+    scripts = args.links * 2
+    for label, render in (('f-string', legacy_generate_script), ('template', ZTEScriptGenerator.generate_script)):
+        seconds = min(measure(render, configs) for _ in range(args.repeat))
+        print(f"{label:<10} {scripts} scripts in {seconds:.3f}s  ({scripts / seconds:,.0f} scripts/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""合成测试数据 - 生成与现网格式一致的DCN和Datasheet工作簿
+
+DCN: 表头前有横幅行，'End. IP' 列混合多种IP写法（点分、逗号分隔、连写数字）。
+Datasheet: 第一行为横幅，第二行为带换行符的葡萄牙语表头，另含若干不使用的列。
+"""
+import io
+import random
+
+import pandas as pd
+
+from mwgen.ingest import NamedBytesIO
+
+DCN_BANNER_ROWS = (
+    ('REDE DCN - PROJETO LÓGICO',),
+    ('Gerado automaticamente - não editar',),
+)
+DCN_HEADER = ('Item', 'End. IP', 'Subnet', 'Obs', 'Vlan', 'Gateway', 'Responsável')
+
+DATASHEET_HEADER = (
+    'Chave', 'Status', 'Site ID\nEstação 1', 'Site ID\nEstação 2',
+    'Nome Elemento\nEstação 1', 'Nome Elemento\nEstação 2', 'Modelo\nEquipamento',
+    'Largura de banda do canal\n(MHz)', 'Potência TX máxima\n(dBm)',
+    'Frequência Central Estação 1\n(MHz)', 'Frequência Central Estação 2\n(MHz)',
+    'Polarização', 'Observações',
+)
+
+BANDWIDTHS = (28, 56, 112)
+TX_POWERS = (18, 20, 22, 24)
+FREQUENCY_PAIRS = ((14977, 14577), (15200, 14780), (18060, 17050), (23240, 22010))
+
+
+def site_name(i):
+    return f"S{i:06d}"
+
+
+def format_ip(octets, style):
+    """按指定写法输出IP：dotted / comma / packed（11位连写数字）"""
+    if style == 'comma':
+        return ','.join(str(octet) for octet in octets)
+    if style == 'packed':
+        return f"{octets[0]:02d}{octets[1]:03d}{octets[2]:03d}{octets[3]:03d}"
+    return '.'.join(str(octet) for octet in octets)
+
+
+def dcn_rows(sites, seed=0):
+    """DCN表格的全部行（含横幅和表头），每个站点一行"""
+    rng = random.Random(seed)
+    rows = [list(row) + [None] * (len(DCN_HEADER) - len(row)) for row in DCN_BANNER_ROWS]
+    rows.append(list(DCN_HEADER))
+    for i in range(sites):
+        subnet = (10, 226, 100 + (i // 32) % 150, (i % 32) * 8)
+        host = subnet[:3] + (subnet[3] + 2,)
+        style = rng.choices(('dotted', 'comma', 'packed'), weights=(80, 10, 10))[0]
+        rows.append([
+            i + 1,
+            format_ip(host, style),
+            f"{'.'.join(str(octet) for octet in subnet)}/29",
+            f"{rng.choice(('MW', 'RAN', 'BH'))}-{site_name(i)}",
+            rng.choice((2900, 2901, 2929)),
+            '.'.join(str(octet) for octet in subnet[:3] + (subnet[3] + 1,)),
+            rng.choice(('Equipe A', 'Equipe B', 'Equipe C')),
+        ])
+    return rows
+
+
+def datasheet_rows(links, sites, seed=0):
+    """Datasheet表格的全部行（含横幅和表头），每条链路连接两个不同站点"""
+    rng = random.Random(seed + 1)
+    rows = [['LEVANTAMENTO MW'] + [None] * (len(DATASHEET_HEADER) - 1), list(DATASHEET_HEADER)]
+    for i in range(links):
+        site_a = i % sites
+        site_b = (site_a + 1 + rng.randrange(sites - 1)) % sites if sites > 1 else site_a
+        tx_freq, rx_freq = rng.choice(FREQUENCY_PAIRS)
+        rows.append([
+            f"CH{i:06d}",
+            rng.choice(('Planejado', 'Instalado')),
+            site_name(site_a),
+            site_name(site_b),
+            f"MWE-NO-{site_name(site_a)}-N1",
+            f"MWE-NO-{site_name(site_b)}-N1",
+            'ZXMW NR8250',
+            rng.choice(BANDWIDTHS),
+            rng.choice(TX_POWERS),
+            tx_freq,
+            rx_freq,
+            rng.choice(('H', 'V')),
+            '',
+        ])
+    return rows
+
+
+def to_file(rows, name, sheet_name='Sheet1'):
+    """把行写成内存中的xlsx或csv文件（按文件扩展名）"""
+    frame = pd.DataFrame(rows)
+    buffer = io.BytesIO()
+    if name.endswith('.csv'):
+        frame.to_csv(buffer, header=False, index=False)
+    else:
+        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+            frame.to_excel(writer, sheet_name=sheet_name, header=False, index=False)
+    return NamedBytesIO(buffer.getvalue(), name)
+
+
+def make_workbooks(rows, file_format='xlsx', seed=0):
+    """生成rows条链路的 (DCN文件, Datasheet文件)，站点数与链路数相同"""
+    dcn = to_file(dcn_rows(rows, seed), f'dcn_{rows}.{file_format}', sheet_name='PROJETO LÓGICO')
+    datasheet = to_file(datasheet_rows(rows, rows, seed), f'datasheet_{rows}.{file_format}')
+    return dcn, datasheet
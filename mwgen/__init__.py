@@ -0,0 +1,48 @@
+"""ZTE微波脚本生成核心库
+
+解析DCN/Datasheet、按CHAVE匹配配置并渲染设备脚本，不依赖Streamlit。
+子模块按需加载，保证命令行启动时只导入实际用到的部分。
+"""
+import importlib
+
+__version__ = '0.2.0'
+
+_EXPORTS = {
+    'DataProcessor': 'processor',
+    'convert_ip_format': 'processor',
+    'ZTEScriptGenerator': 'generator',
+    'ChaveIndex': 'indexes',
+    'SiteIndex': 'indexes',
+    'SiteMatch': 'indexes',
+    'ParseCache': 'caching',
+    'DiskCache': 'caching',
+    'DatasetHandle': 'caching',
+    'DatasetRegistry': 'caching',
+    'NullLog': 'log',
+    'EventLog': 'log',
+    'LoggingLog': 'log',
+    'build_link_zip': 'packaging',
+    'build_batch_zip': 'packaging',
+    'package_rendered': 'packaging',
+    'render_results': 'packaging',
+    'generate_parallel': 'parallel',
+    'LinkResult': 'results',
+    'ResultCache': 'results',
+    'resolve_link': 'results',
+    'LinkTable': 'network',
+    'address_conflicts': 'addressing',
+    'pack_ipv4': 'addressing',
+    'ValidationReport': 'validation',
+    'validate_links': 'validation',
+    'PerfRecorder': 'perf',
+    'recording': 'perf',
+    'safe_filename': 'packaging',
+}
+
+__all__ = ['__version__'] + sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
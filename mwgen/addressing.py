@@ -0,0 +1,135 @@
+"""IPv4地址和子网的整数表示 - 加载时把地址打包为32位整数，网关、掩码、子网归属和冲突检测按数组计算
+
+打包后的值存为int64数组，无效或缺失的地址为 INVALID（-1）。
+"""
+import numpy as np
+import pandas as pd
+
+INVALID = -1
+# 子网缺失时使用的前缀长度（对应掩码 255.255.255.248）
+DEFAULT_PREFIX = 29
+
+_DOTTED = r'^\s*(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})\s*'
+
+
+def _pack_octets(octets):
+    """四列八位组（字符串）打包为整数，任一段缺失或超过255时为INVALID"""
+    values = octets.apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64')
+    valid = ~np.isnan(values).any(axis=1) & (np.nan_to_num(values, nan=256) <= 255).all(axis=1)
+    packed = np.full(len(values), INVALID, dtype=np.int64)
+    octet_values = values[valid].astype(np.int64)
+    packed[valid] = ((octet_values[:, 0] << 24) | (octet_values[:, 1] << 16)
+                     | (octet_values[:, 2] << 8) | octet_values[:, 3])
+    return packed
+
+
+def pack_ipv4(values):
+    """点分IP地址列 -> int64数组"""
+    text = pd.Series(values).astype(object).map(str)
+    return _pack_octets(text.str.extract(_DOTTED + '$'))
+
+
+def unpack_ipv4(packed):
+    """int64数组 -> 点分IP地址（object数组，INVALID为None）"""
+    packed = np.asarray(packed, dtype=np.int64)
+    text = pd.Series((packed >> 24) & 255).astype(str)
+    for shift in (16, 8, 0):
+        text = text + '.' + pd.Series((packed >> shift) & 255).astype(str)
+    dotted = text.to_numpy(dtype=object)
+    dotted[packed < 0] = None
+    return dotted
+
+
+def format_ipv4(packed):
+    """单个打包地址 -> 点分IP地址（逐条查找使用，避免为单个值构造数组）"""
+    return '.'.join(str((int(packed) >> shift) & 255) for shift in (24, 16, 8, 0))
+
+
+def prefix_masks(prefixes):
+    """前缀长度 -> 掩码整数（无效前缀为INVALID）"""
+    prefixes = np.asarray(prefixes, dtype=np.int64)
+    valid = (prefixes >= 0) & (prefixes <= 32)
+    masks = (0xFFFFFFFF << (32 - np.clip(prefixes, 0, 32))) & 0xFFFFFFFF
+    return np.where(valid, masks, INVALID)
+
+
+# 前缀长度 0..32 对应的掩码（随前缀递增），掩码写法按此表换算为前缀长度
+PREFIX_MASKS = prefix_masks(np.arange(33))
+# 子网缺失时脚本中使用的掩码
+DEFAULT_MASK = format_ipv4(PREFIX_MASKS[DEFAULT_PREFIX])
+
+
+def parse_subnets(values):
+    """'地址/前缀' 或 '地址/掩码' 列 -> (按原样打包的地址, 前缀长度) 两个int64数组"""
+    text = pd.Series(values).astype(object).map(str)
+    parts = text.str.extract(_DOTTED + r'/\s*(\S+?)\s*$')
+    addresses = _pack_octets(parts[[0, 1, 2, 3]])
+    suffix = parts[4]
+
+    prefixes = pd.to_numeric(suffix.where(suffix.str.fullmatch(r'\d{1,2}', na=False)), errors='coerce')
+    prefixes = prefixes.where(prefixes <= 32).fillna(INVALID).to_numpy(dtype=np.int64)
+    # 掩码写法：必须是表中的连续掩码
+    masks = pack_ipv4(suffix)
+    mask_prefixes = np.clip(np.searchsorted(PREFIX_MASKS, masks), 0, 32)
+    contiguous = (masks >= 0) & (PREFIX_MASKS[mask_prefixes] == masks)
+    prefixes = np.where(contiguous, mask_prefixes, prefixes)
+
+    valid = (addresses >= 0) & (prefixes >= 0)
+    return np.where(valid, addresses, INVALID), np.where(valid, prefixes, INVALID)
+
+
+def network_addresses(addresses, prefixes):
+    """地址所在子网的网络地址"""
+    masks = prefix_masks(prefixes)
+    return np.where((addresses >= 0) & (masks >= 0), addresses & masks, INVALID)
+
+
+def gateway_addresses(subnet_addresses):
+    """网关为子网地址加1（与原先按最后一段加1的规则一致，最后一段为255时无效）"""
+    subnet_addresses = np.asarray(subnet_addresses, dtype=np.int64)
+    valid = (subnet_addresses >= 0) & ((subnet_addresses & 255) < 255)
+    return np.where(valid, subnet_addresses + 1, INVALID)
+
+
+def in_subnet(addresses, subnet_addresses, prefixes):
+    """地址是否属于对应的子网（任一无效时为False）"""
+    masks = prefix_masks(prefixes)
+    valid = (addresses >= 0) & (subnet_addresses >= 0) & (masks >= 0)
+    return valid & ((addresses & masks) == (subnet_addresses & masks))
+
+
+def address_conflicts(addresses, subnet_addresses, prefixes):
+    """全表冲突检测，返回与输入对齐的布尔数组字典
+
+    duplicate_ip: 同一IP出现在多行；outside_subnet: IP不在本行子网内；
+    overlapping_subnet: 本行子网与另一个不同的子网重叠（包含或部分重叠）。
+    """
+    addresses = np.asarray(addresses, dtype=np.int64)
+    valid_ip = addresses >= 0
+    _, inverse, counts = np.unique(addresses, return_inverse=True, return_counts=True)
+    duplicate_ip = valid_ip & (counts[inverse] > 1)
+
+    networks = network_addresses(subnet_addresses, prefixes)
+    valid_subnet = networks >= 0
+    outside_subnet = valid_ip & valid_subnet & ~in_subnet(addresses, subnet_addresses, prefixes)
+
+    # 不同子网按起始地址排序：与前面任一子网的区间相交，或下一个子网从本区间内开始，即为重叠
+    overlapping_subnet = np.zeros(len(addresses), dtype=bool)
+    if valid_subnet.any():
+        ends = networks + (~prefix_masks(prefixes) & 0xFFFFFFFF)
+        subnets = np.unique(np.stack([networks[valid_subnet], ends[valid_subnet]], axis=1), axis=0)
+        starts, stops = subnets[:, 0], subnets[:, 1]
+        overlaps = np.zeros(len(subnets), dtype=bool)
+        if len(subnets) > 1:
+            reach = np.maximum.accumulate(stops)
+            overlaps[1:] |= starts[1:] <= reach[:-1]
+            overlaps[:-1] |= starts[1:] <= stops[:-1]
+        lookup = pd.MultiIndex.from_arrays([starts, stops])
+        positions = lookup.get_indexer(pd.MultiIndex.from_arrays([networks[valid_subnet], ends[valid_subnet]]))
+        overlapping_subnet[valid_subnet] = overlaps[positions]
+
+    return {
+        'duplicate_ip': duplicate_ip,
+        'outside_subnet': outside_subnet,
+        'overlapping_subnet': overlapping_subnet,
+    }
@@ -0,0 +1,350 @@
+"""解析结果缓存（进程内存 + 可选的磁盘持久化）"""
+import hashlib
+import importlib.util
+import os
+import pickle
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from functools import lru_cache
+
+import pandas as pd
+
+# 解析缓存配置（可通过环境变量调整）
+# 每个会话最多持有8个句柄（两个数据集、三个索引/版本、配置表、校验报告、批量结果），默认可容纳8个会话
+PARSE_CACHE_MAX_ENTRIES = int(os.environ.get('MWGEN_PARSE_CACHE_ENTRIES', '64'))
+PARSE_CACHE_MAX_BYTES = int(os.environ.get('MWGEN_PARSE_CACHE_MB', '512')) * 1024 * 1024
+# 磁盘缓存配置，MWGEN_DISK_CACHE_MB=0 表示禁用
+DISK_CACHE_DIR = os.environ.get('MWGEN_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'mwgen'))
+DISK_CACHE_MAX_BYTES = int(os.environ.get('MWGEN_DISK_CACHE_MB', '2048')) * 1024 * 1024
+
+# 影响解析结果的源码文件，任一变化都会使磁盘缓存失效
+_VERSIONED_MODULES = ('addressing.py', 'caching.py', 'compact.py', 'indexes.py', 'ingest.py', 'network.py', 'processor.py', 'validation.py', 'versioning.py')
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """解析代码版本：包版本 + 解析相关源码的哈希"""
+    from . import __version__
+    digest = hashlib.sha256(__version__.encode())
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in _VERSIONED_MODULES:
+        with open(os.path.join(package_dir, module), 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:16]
+
+
+class ParseCache:
+    """解析结果缓存 - 按文件内容哈希和解析选项缓存，LRU淘汰"""
+
+    def __init__(self, max_entries=PARSE_CACHE_MAX_ENTRIES, max_bytes=PARSE_CACHE_MAX_BYTES, disk=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk = disk  # DiskCache，内存未命中时先查磁盘
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_digest(file):
+        """计算上传文件内容的SHA-256哈希"""
+        if hasattr(file, 'getvalue'):
+            data = file.getvalue()
+        else:
+            position = file.tell()
+            file.seek(0)
+            data = file.read()
+            file.seek(position)
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def make_key(kind, file, **options):
+        """生成缓存键：(类型, 内容哈希, 文件扩展名, 解析选项)"""
+        extension = os.path.splitext(file.name)[1].lower()
+        return (kind, ParseCache.file_digest(file), extension, tuple(sorted(options.items())))
+
+    @staticmethod
+    def estimate_size(value):
+        """估算缓存值占用的内存（字节）"""
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        if isinstance(value, (tuple, list)):
+            return sum(ParseCache.estimate_size(item) for item in value)
+        if hasattr(value, 'memory_usage'):
+            return int(value.memory_usage())
+        return 0
+
+    def get_or_parse(self, key, parse_func, persist=True):
+        """命中则直接返回缓存结果，否则依次尝试磁盘缓存和parse_func，并写入缓存
+
+        persist=False 时只缓存在内存中（如体积大、可随时重建的批量ZIP包）。
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        disk = self.disk if persist else None
+        value = disk.get(key) if disk is not None else None
+        if value is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            value = parse_func()
+            # 解析失败不缓存，下次重新尝试
+            if value is None:
+                return None
+            if disk is not None:
+                disk.put(key, value)
+
+        size = self.estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            self._evict()
+        return value
+
+    def contains(self, key):
+        """是否已缓存（内存或磁盘），用于判断是否需要解析"""
+        with self._lock:
+            if key in self._entries:
+                return True
+        return self.disk is not None and self.disk.contains(key)
+
+    def _evict(self):
+        """按LRU顺序淘汰，直到满足条目数和内存上限（至少保留最新一项）"""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self):
+        """返回缓存统计信息"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+            }
+
+
+class DatasetHandle:
+    """数据集句柄 - 会话只持有句柄；句柄被回收或调用release()时释放注册表中的引用"""
+
+    def __init__(self, registry, key, value):
+        self.key = key
+        self._value = value
+        self._finalizer = weakref.finalize(self, registry._schedule_release, key)
+
+    @property
+    def value(self):
+        """共享的只读数据（DataFrame或索引），调用方不得原地修改"""
+        return self._value
+
+    def release(self):
+        """立即释放引用（可重复调用）"""
+        self._finalizer()
+
+
+class DatasetRegistry(ParseCache):
+    """进程级只读数据集注册表 - 按内容哈希共享同一份数据，按会话引用计数
+
+    多个会话加载同一文件时只保留一份；超出内存预算时按LRU淘汰未被任何会话引用的条目。
+    """
+
+    def __init__(self, max_entries=PARSE_CACHE_MAX_ENTRIES, max_bytes=PARSE_CACHE_MAX_BYTES, disk=None):
+        super().__init__(max_entries, max_bytes, disk)
+        self._refs = {}          # key -> 持有句柄数
+        self._pending = deque()  # 句柄回收时登记的待释放键
+
+    def acquire(self, key, parse_func, persist=True):
+        """获取数据集句柄，未加载时调用parse_func；解析失败返回None"""
+        with self._lock:
+            self._drain_pending()
+            # 先登记引用，避免刚写入就被淘汰
+            self._refs[key] = self._refs.get(key, 0) + 1
+        value = self.get_or_parse(key, parse_func, persist)
+        if value is None:
+            self._schedule_release(key)
+            return None
+        return DatasetHandle(self, key, value)
+
+    def references(self, key):
+        """当前持有该数据集句柄的数量"""
+        with self._lock:
+            self._drain_pending()
+            return self._refs.get(key, 0)
+
+    def _schedule_release(self, key):
+        # 可能在垃圾回收中被调用（任意线程、可能正持有锁），只登记并尽力处理
+        self._pending.append(key)
+        if self._lock.acquire(blocking=False):
+            try:
+                self._drain_pending()
+            finally:
+                self._lock.release()
+
+    def _drain_pending(self):
+        released = False
+        while self._pending:
+            key = self._pending.popleft()
+            count = self._refs.get(key, 0) - 1
+            if count > 0:
+                self._refs[key] = count
+            else:
+                self._refs.pop(key, None)
+            released = True
+        if released:
+            self._evict()
+
+    def _evict(self):
+        """按LRU顺序淘汰未被引用的条目，直到满足条目数和内存上限（至少保留最新一项）"""
+        for key in list(self._entries):
+            if len(self._entries) <= 1 or (
+                len(self._entries) <= self.max_entries and self._total_bytes <= self.max_bytes
+            ):
+                break
+            if self._refs.get(key):
+                continue
+            _, size = self._entries.pop(key)
+            self._total_bytes -= size
+
+    def stats(self):
+        """返回注册表统计信息（含被会话引用的条目数和句柄总数）"""
+        with self._lock:
+            self._drain_pending()
+        stats = super().stats()
+        with self._lock:
+            stats['referenced'] = sum(1 for key in self._entries if self._refs.get(key))
+            stats['handles'] = sum(self._refs.values())
+        return stats
+
+
+class DiskCache:
+    """磁盘缓存 - 清洗后的数据集和索引跨会话、跨重启复用
+
+    键为 (代码版本, 缓存键) 的哈希；DataFrame 在安装了 pyarrow 时写为 Parquet，
+    其余对象（以及 Parquet 无法表示的混合类型列）用 pickle。
+    总大小超过上限时按最近使用时间淘汰。
+    """
+
+    def __init__(self, directory=DISK_CACHE_DIR, max_bytes=DISK_CACHE_MAX_BYTES, version=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version or code_version()
+        self.use_parquet = importlib.util.find_spec('pyarrow') is not None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _stem(self, key):
+        return os.path.join(self.directory, hashlib.sha256(repr((self.version, key)).encode()).hexdigest())
+
+    def contains(self, key):
+        """缓存文件是否存在（不读取内容）"""
+        stem = self._stem(key)
+        return any(os.path.exists(stem + suffix) for suffix in ('.parquet', '.pkl'))
+
+    def get(self, key):
+        """读取缓存值，未命中或文件损坏时返回None"""
+        stem = self._stem(key)
+        for suffix in ('.parquet', '.pkl'):
+            path = stem + suffix
+            if not os.path.exists(path):
+                continue
+            started = time.perf_counter()
+            try:
+                if suffix == '.parquet':
+                    value = pd.read_parquet(path)
+                else:
+                    with open(path, 'rb') as cache_file:
+                        value = pickle.load(cache_file)
+                os.utime(path)  # 记录最近使用时间，供淘汰排序
+            except Exception:
+                self._remove(path)
+                return None
+            if isinstance(value, pd.DataFrame):
+                value.attrs['disk_cache_seconds'] = time.perf_counter() - started
+            return value
+        return None
+
+    def put(self, key, value):
+        """写入缓存值（先写临时文件再原子替换），写入失败不影响调用方"""
+        stem = self._stem(key)
+        temp_path = f"{stem}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            path = None
+            if self.use_parquet and isinstance(value, pd.DataFrame):
+                try:
+                    value.to_parquet(temp_path)
+                    path = stem + '.parquet'
+                except Exception:
+                    path = None
+            if path is None:
+                with open(temp_path, 'wb') as cache_file:
+                    pickle.dump(value, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+                path = stem + '.pkl'
+            os.replace(temp_path, path)
+        except OSError:
+            self._remove(temp_path)
+            return
+        self._evict()
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _files(self):
+        """返回缓存文件列表 [(最近使用时间, 大小, 路径), ...]"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(('.parquet', '.pkl')):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _evict(self):
+        """按最近使用时间淘汰，直到总大小满足上限（至少保留最新一项）"""
+        with self._lock:
+            files = sorted(self._files())
+            total = sum(size for _, size, _ in files)
+            while len(files) > 1 and total > self.max_bytes:
+                _, size, path = files.pop(0)
+                self._remove(path)
+                total -= size
+
+    def clear(self):
+        """删除全部缓存文件"""
+        with self._lock:
+            for _, _, path in self._files():
+                self._remove(path)
+
+    def stats(self):
+        """返回磁盘缓存统计信息"""
+        files = self._files()
+        return {
+            'directory': self.directory,
+            'entries': len(files),
+            'bytes': sum(size for _, size, _ in files),
+            'format': 'parquet' if self.use_parquet else 'pickle',
+        }
@@ -0,0 +1,174 @@
+"""命令行入口 - 供定时任务和批量作业使用，不导入Streamlit
+
+用法示例:
+    python -m mwgen generate --dcn DCN.xlsx --datasheet Datasheet.xlsx --chave CODV29
+    python -m mwgen generate --dcn DCN.xlsx --datasheet Datasheet.xlsx --all --zip wave.zip
+    python -m mwgen validate --dcn DCN.xlsx --datasheet Datasheet.xlsx --report report.csv
+"""
+import argparse
+import logging
+import os
+import sys
+
+from . import __version__
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='mwgen', description='ZTE微波脚本生成器（命令行）')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate = subparsers.add_parser('generate', help='按CHAVE生成链路两端的脚本')
+    generate.add_argument('--dcn', required=True, help='DCN文件 (xlsx/xls/csv)')
+    generate.add_argument('--dcn-header-row', type=int, default=None,
+                          help='DCN表头所在的Excel行号（默认自动检测）')
+    generate.add_argument('--datasheet', required=True, help='Datasheet文件 (xlsx/xls/csv)')
+    selection = generate.add_mutually_exclusive_group(required=True)
+    selection.add_argument('--chave', action='append', help='CHAVE号码，可重复指定')
+    selection.add_argument('--chave-file', help='CHAVE列表CSV（Chave列或第一列）')
+    selection.add_argument('--all', action='store_true', help='生成Datasheet中的全部CHAVE')
+    generate.add_argument('--out', default='output', help='脚本输出目录（默认: output）')
+    generate.add_argument('--zip', help='改为输出单个ZIP包到该路径')
+    generate.add_argument('--workers', type=int, default=1, help='并行进程数（默认1，0表示CPU核数）')
+    generate.add_argument('--chunk-size', type=int, default=None, help='每个并行任务包含的CHAVE数量')
+    generate.add_argument('--no-cache', action='store_true', help='不读写磁盘解析缓存')
+    generate.add_argument('-v', '--verbose', action='count', default=0, help='输出处理日志（-vv 更详细）')
+    generate.set_defaults(handler=run_generate)
+
+    validate = subparsers.add_parser('validate', help='检查全部链路，输出错误和警告报告')
+    validate.add_argument('--dcn', required=True, help='DCN文件 (xlsx/xls/csv)')
+    validate.add_argument('--dcn-header-row', type=int, default=None,
+                          help='DCN表头所在的Excel行号（默认自动检测）')
+    validate.add_argument('--datasheet', required=True, help='Datasheet文件 (xlsx/xls/csv)')
+    validate.add_argument('--report', help='校验报告CSV路径（默认只输出汇总）')
+    validate.add_argument('--no-cache', action='store_true', help='不读写磁盘解析缓存')
+    validate.add_argument('-v', '--verbose', action='count', default=0, help='输出处理日志（-vv 更详细）')
+    validate.set_defaults(handler=run_validate)
+    return parser
+
+
+def _configure_logging(verbosity):
+    level = {0: logging.WARNING, 1: logging.INFO}.get(verbosity, logging.DEBUG)
+    logging.basicConfig(level=level, format='%(levelname)s %(message)s', stream=sys.stderr)
+
+
+def _load_inputs(args):
+    """解析DCN和Datasheet并构建索引（使用磁盘缓存），任一文件解析失败时返回None"""
+    from .caching import DISK_CACHE_MAX_BYTES, DiskCache, ParseCache
+    from .log import LoggingLog
+    from .processor import DataProcessor
+
+    log = LoggingLog()
+    disk = None
+    if not args.no_cache and DISK_CACHE_MAX_BYTES > 0:
+        try:
+            disk = DiskCache()
+        except OSError:
+            disk = None
+    cache = ParseCache(disk=disk)
+    with open(args.dcn, 'rb') as dcn_file:
+        dcn_key = ParseCache.make_key('dcn', dcn_file, header_row=args.dcn_header_row)
+        dcn_data = cache.get_or_parse(
+            dcn_key, lambda: DataProcessor.parse_dcn_file(dcn_file, log, header_row=args.dcn_header_row))
+    with open(args.datasheet, 'rb') as datasheet_file:
+        datasheet_key = ParseCache.make_key('datasheet', datasheet_file)
+        datasheet_data = cache.get_or_parse(
+            datasheet_key, lambda: DataProcessor.parse_datasheet_file(datasheet_file, log))
+    if dcn_data is None or datasheet_data is None:
+        return None
+
+    chave_index = cache.get_or_parse(
+        ('chave_index',) + datasheet_key[1:], lambda: DataProcessor.build_chave_index(datasheet_data))
+    site_index = cache.get_or_parse(
+        ('site_index',) + dcn_key[1:], lambda: DataProcessor.build_site_index(dcn_data))
+    return dcn_data, datasheet_data, chave_index, site_index
+
+
+def run_generate(args):
+    # 重量级依赖在此处才导入，保证 --help / --version 秒级响应
+    from .network import LinkTable
+    from .packaging import package_rendered, safe_filename
+    from .parallel import DEFAULT_CHUNK_SIZE, generate_parallel
+    from .processor import DataProcessor
+
+    inputs = _load_inputs(args)
+    if inputs is None:
+        return 2
+    dcn_data, datasheet_data, chave_index, site_index = inputs
+    # 全网配置表只在内存中缓存（依赖两个数据集，体积与Datasheet相当）
+    link_table = LinkTable.build(dcn_data, datasheet_data, chave_index, site_index)
+    if args.all:
+        chave_numbers = chave_index.all_chaves() if chave_index is not None else []
+    elif args.chave_file:
+        with open(args.chave_file, 'rb') as chave_file:
+            chave_numbers = DataProcessor.read_chave_csv(chave_file)
+    else:
+        chave_numbers = DataProcessor.parse_chave_list('\n'.join(args.chave))
+    if not chave_numbers:
+        print('未提供任何CHAVE', file=sys.stderr)
+        return 2
+
+    rendered = generate_parallel(
+        dcn_data, datasheet_data, chave_numbers,
+        workers=args.workers or None,
+        chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE,
+        chave_index=chave_index, site_index=site_index, link_table=link_table,
+    )
+
+    outcomes = []
+
+    def track(items):
+        # 边生成边记录每个CHAVE的结果，用于最后的汇总输出
+        for item in items:
+            chave_number, config, reason = item[:3]
+            if config is None:
+                outcomes.append((chave_number, False, reason))
+            else:
+                outcomes.append((chave_number, True,
+                                 f"{config['site_a']['device_name']} <-> {config['site_b']['device_name']}"))
+            yield item
+
+    if args.zip:
+        zip_bytes, _ = package_rendered(track(rendered))
+        with open(args.zip, 'wb') as zip_file:
+            zip_file.write(zip_bytes)
+    else:
+        for chave_number, config, _, script_a, script_b in track(rendered):
+            if config is None:
+                continue
+            folder = os.path.join(args.out, safe_filename(chave_number))
+            os.makedirs(folder, exist_ok=True)
+            for site_key, script in (('site_a', script_a), ('site_b', script_b)):
+                path = os.path.join(folder, f"{safe_filename(config[site_key]['device_name'])}.txt")
+                with open(path, 'w', encoding='utf-8') as script_file:
+                    script_file.write(script)
+
+    failed = 0
+    for chave_number, ok, detail in outcomes:
+        if not ok:
+            failed += 1
+        print(f"{'OK  ' if ok else 'FAIL'}  {chave_number}  {detail}")
+    print(f"完成: 成功 {len(outcomes) - failed} 个，失败 {failed} 个", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def run_validate(args):
+    from .network import LinkTable
+    from .validation import validate_links
+
+    inputs = _load_inputs(args)
+    if inputs is None:
+        return 2
+    validation = validate_links(LinkTable.build(*inputs))
+    if args.report:
+        validation.report().to_csv(args.report, index=False, encoding='utf-8-sig')
+    else:
+        print(validation.by_check().to_string(index=False) if validation else '未发现问题')
+    print(validation.summary(), file=sys.stderr)
+    return 1 if validation.count('error') else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    _configure_logging(getattr(args, 'verbose', 0))
+    return args.handler(args)
@@ -0,0 +1,59 @@
+"""数据集压缩 - 只保留用到的列，重复文本转为分类类型，数值列收窄为更小的类型"""
+import pandas as pd
+
+# 唯一值占比不超过该比例的文本列转换为分类类型
+CATEGORY_MAX_RATIO = 0.5
+# float32 可精确表示的整数上限
+FLOAT32_EXACT_LIMIT = 2 ** 24
+
+
+def frame_memory(df):
+    """DataFrame占用的内存（字节，含对象内容）"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def to_category(series, max_ratio=CATEGORY_MAX_RATIO):
+    """重复较多的文本列转换为分类类型，其余保持不变"""
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return series
+    if len(series) == 0 or series.nunique(dropna=True) > max_ratio * len(series):
+        return series
+    return series.astype('category')
+
+
+def narrow_numeric(series):
+    """数值列无损收窄：整数按取值范围降级，整数值的浮点列（含空值）转为float32"""
+    if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast='integer')
+    values = series.dropna()
+    if len(values) and (values % 1 == 0).all() and values.abs().max() < FLOAT32_EXACT_LIMIT:
+        return series.astype('float32')
+    return series
+
+
+def compact_frame(df, keep_columns=None, category_columns=(), numeric_columns=()):
+    """压缩DataFrame，返回新的DataFrame，并在attrs中记录压缩前后的内存
+
+    keep_columns 为要保留的列（None表示全部保留）；category_columns 中的列按重复程度
+    转为分类类型；numeric_columns 中的列做无损数值收窄。
+    """
+    memory_before = frame_memory(df)
+    attrs = dict(df.attrs)
+    if keep_columns is not None:
+        df = df[[col for col in df.columns if col in set(keep_columns)]]
+
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col in numeric_columns:
+            series = narrow_numeric(series)
+        if col in category_columns:
+            series = to_category(series)
+        columns[col] = series
+    compacted = pd.DataFrame(columns, index=df.index)
+    compacted.attrs = attrs
+    compacted.attrs['memory_before'] = memory_before
+    compacted.attrs['memory_after'] = frame_memory(compacted)
+    return compacted
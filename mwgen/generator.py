@@ -0,0 +1,60 @@
+"""ZTE微波设备脚本生成 - 基于预编译模板（见 mwgen/templates）"""
+from . import perf
+from .addressing import DEFAULT_MASK
+from .template import DEFAULT_TEMPLATE, load_template
+
+
+class ZTEScriptGenerator:
+    # 模板中按列表重复的块
+    RADIO_CHANNELS = (
+        {'name': 'radio-1/1/0/1', 'suffix': 'H1', 'antenna': 1, 'polarization': 'horizontal'},
+        {'name': 'radio-1/1/0/2', 'suffix': 'V1', 'antenna': 2, 'polarization': 'vertical'},
+    )
+    ETHERNET_PORTS = ('xgei-1/1/0/5', 'xgei-1/1/0/6', 'xgei-1/1/0/7', 'xgei-1/1/0/8')
+    TRUNK_INTERFACES = ('pla-1/1/0/1',) + ETHERNET_PORTS
+
+    @staticmethod
+    def build_context(config, for_site_a=True):
+        """组装模板渲染参数 - 每个站点使用自己的TX/RX频率"""
+        if for_site_a:
+            site = config['site_a']
+            peer = config['site_b']
+        else:
+            site = config['site_b']
+            peer = config['site_a']
+        
+        # 未给出掩码的配置（如库调用方自行构造的）使用默认掩码
+        if 'mask' not in site:
+            site = {**site, 'mask': DEFAULT_MASK}
+        
+        # 生成对端描述
+        peer_suffix = peer['site_name'].split('-')[-1] if '-' in peer['site_name'] else peer['site_name']
+        
+        return {
+            'site': site,
+            'peer': peer,
+            'radio': config['radio_params'],
+            'tx_frequency': site['tx_frequency'],
+            'rx_frequency': site['rx_frequency'],
+            'peer_suffix': peer_suffix,
+            'radio_channels': ZTEScriptGenerator.RADIO_CHANNELS,
+            'ethernet_ports': ZTEScriptGenerator.ETHERNET_PORTS,
+            'trunk_interfaces': ZTEScriptGenerator.TRUNK_INTERFACES,
+        }
+
+    @staticmethod
+    def generate_script(config, for_site_a=True, template_name=DEFAULT_TEMPLATE):
+        """生成精确的ZTE脚本"""
+        template = load_template(template_name)
+        # 批量渲染的热点路径：未启用性能记录时不经过计时器
+        if not perf.active():
+            return template.render(ZTEScriptGenerator.build_context(config, for_site_a))
+        with perf.timer('render'):
+            script = template.render(ZTEScriptGenerator.build_context(config, for_site_a))
+        perf.count('render', scripts=1, chars=len(script))
+        return script
+
+    @staticmethod
+    def template_version(template_name=DEFAULT_TEMPLATE):
+        """当前模板版本（源码哈希）"""
+        return load_template(template_name).version
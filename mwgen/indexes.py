@@ -0,0 +1,290 @@
+"""CHAVE索引和DCN站点名称索引 - 加载数据时构建一次，查询为常数级探测"""
+import re
+from bisect import bisect_left
+from collections import Counter
+
+import pandas as pd
+
+
+def edit_distance(a, b, max_distance):
+    """Levenshtein编辑距离；超过max_distance时提前结束并返回max_distance + 1"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """三元组模糊索引 - 按共享三元组数筛选少量候选，再按编辑距离排序
+
+    过于常见的三元组（倒排表超过MAX_POSTING）不参与计数，单次查询的工作量有上限。
+    """
+
+    NGRAM = 3
+    MAX_POSTING = 5000
+    CANDIDATES = 32
+
+    def __init__(self, terms):
+        self.terms = list(terms)  # 词条编号 -> 规范化词条
+        self._postings = {}       # 三元组 -> [词条编号, ...]
+        for term_id, term in enumerate(self.terms):
+            for gram in self._grams(term):
+                self._postings.setdefault(gram, []).append(term_id)
+
+    @classmethod
+    def _grams(cls, term):
+        padded = f"^{term}$"
+        return {padded[i:i + cls.NGRAM] for i in range(len(padded) - cls.NGRAM + 1)}
+
+    @staticmethod
+    def default_max_distance(term):
+        """默认允许的编辑距离：约每4个字符1处，至少1处"""
+        return max(1, len(term) // 4)
+
+    def search(self, term, limit=5, max_distance=None):
+        """返回 [(词条编号, 编辑距离), ...]，按距离从小到大"""
+        if max_distance is None:
+            max_distance = self.default_max_distance(term)
+        shared = Counter()
+        for gram in self._grams(term):
+            posting = self._postings.get(gram)
+            if posting and len(posting) <= self.MAX_POSTING:
+                shared.update(posting)
+        matches = []
+        for term_id, _ in shared.most_common(self.CANDIDATES):
+            distance = edit_distance(term, self.terms[term_id], max_distance)
+            if distance <= max_distance:
+                matches.append((distance, term_id))
+        matches.sort()
+        return [(term_id, distance) for distance, term_id in matches[:limit]]
+
+    def memory_usage(self):
+        """粗略估算索引占用的内存（字节）"""
+        return sum(len(ids) * 8 + 64 for ids in self._postings.values())
+
+
+class ChaveIndex:
+    """CHAVE索引 - 规范化CHAVE到行位置的哈希映射，加载时构建一次"""
+
+    def __init__(self, chave_series):
+        self.column = chave_series.name
+        self._positions = {}  # 规范化CHAVE -> [行位置, ...]
+        self._display = {}    # 规范化CHAVE -> 原始CHAVE（首次出现）
+        for position, value in enumerate(chave_series.tolist()):
+            key = self.normalize(value)
+            if not key:
+                continue
+            if key not in self._positions:
+                self._positions[key] = []
+                self._display[key] = str(value).strip()
+            self._positions[key].append(position)
+        # 按规范化CHAVE排序，用于前缀查询（二分查找）
+        self._sorted = sorted(self._positions)
+        # 三元组模糊索引，用于拼写错误时给出候选
+        self._fuzzy = FuzzyIndex(self._positions)
+
+    @staticmethod
+    def normalize(value):
+        """规范化CHAVE：去除首尾空格并忽略大小写"""
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            return ''
+        return str(value).strip().casefold()
+
+    def lookup(self, chave_number):
+        """查找CHAVE对应的全部行位置，重复CHAVE返回多个位置"""
+        return list(self._positions.get(self.normalize(chave_number), []))
+
+    def duplicates(self):
+        """返回所有重复的CHAVE及其行位置"""
+        return {
+            self._display[key]: positions
+            for key, positions in self._positions.items()
+            if len(positions) > 1
+        }
+
+    def all_chaves(self):
+        """按首次出现顺序返回全部CHAVE（原始写法，已去重）"""
+        return list(self._display.values())
+
+    def suggest(self, prefix, limit=10):
+        """按前缀返回CHAVE建议（原始写法，按字母顺序），最多limit个"""
+        key = self.normalize(prefix)
+        start = bisect_left(self._sorted, key)
+        suggestions = []
+        for candidate in self._sorted[start:start + limit]:
+            if not candidate.startswith(key):
+                break
+            suggestions.append(self._display[candidate])
+        return suggestions
+
+    def closest(self, chave_number, limit=10):
+        """逐步缩短前缀，返回有匹配的最长前缀下的CHAVE建议"""
+        key = self.normalize(chave_number)
+        for length in range(len(key), 0, -1):
+            suggestions = self.suggest(key[:length], limit)
+            if suggestions:
+                return suggestions
+        return []
+
+    def fuzzy(self, chave_number, limit=5, max_distance=None):
+        """模糊匹配CHAVE，返回 [(原始CHAVE, 编辑距离), ...]"""
+        key = self.normalize(chave_number)
+        if not key:
+            return []
+        return [(self._display[self._fuzzy.terms[term_id]], distance)
+                for term_id, distance in self._fuzzy.search(key, limit, max_distance)]
+
+    def sample(self, n=10):
+        """返回前n个CHAVE（原始写法），用于提示"""
+        return list(self._display.values())[:n]
+
+    def memory_usage(self):
+        """粗略估算索引占用的内存（字节）"""
+        return sum(
+            len(key) * 2 + len(positions) * 8 + 72
+            for key, positions in self._positions.items()
+        ) + self._fuzzy.memory_usage()
+
+    def __len__(self):
+        return len(self._positions)
+
+
+class SiteMatch:
+    """站点匹配结果"""
+
+    def __init__(self, kind=None, names=None, positions=None, distance=None):
+        self.kind = kind                  # 'exact' / 'token' / 'substring' / 'fuzzy' / None
+        self.names = names or []          # 匹配到的DCN站点名称
+        self.positions = positions or []  # 对应的DCN行位置
+        self.distance = distance          # 模糊匹配的编辑距离
+
+    @property
+    def ambiguous(self):
+        return len(self.positions) > 1
+
+
+class SiteIndex:
+    """DCN站点名称索引 - 精确匹配、分词匹配、三元组子串匹配和模糊匹配，加载时构建一次"""
+
+    NGRAM = 3
+    # 参与模糊匹配的分词最短长度（过短的分词如'mw'没有区分度）
+    FUZZY_MIN_TOKEN = 3
+
+    def __init__(self, site_series):
+        self._names = []      # 名称编号 -> 规范化站点名称
+        self._display = []    # 名称编号 -> 原始站点名称
+        self._rows = []       # 名称编号 -> [行位置, ...]
+        self._exact = {}      # 规范化站点名称 -> 名称编号
+        self._tokens = {}     # 分词 -> {名称编号}
+        self._ngrams = {}     # 三元组 -> {名称编号}
+        for position, value in enumerate(site_series.tolist()):
+            key = ChaveIndex.normalize(value)
+            if not key:
+                continue
+            name_id = self._exact.get(key)
+            if name_id is None:
+                name_id = len(self._names)
+                self._exact[key] = name_id
+                self._names.append(key)
+                self._display.append(str(value).strip())
+                self._rows.append([])
+                for token in re.split(r'[\W_]+', key):
+                    if token:
+                        self._tokens.setdefault(token, set()).add(name_id)
+                for gram in self._ngrams_of(key):
+                    self._ngrams.setdefault(gram, set()).add(name_id)
+            self._rows[name_id].append(position)
+        # 模糊匹配的词条：完整名称和较长的分词
+        fuzzy_terms = dict.fromkeys(self._names)
+        fuzzy_terms.update(dict.fromkeys(token for token in self._tokens if len(token) >= self.FUZZY_MIN_TOKEN))
+        self._fuzzy = FuzzyIndex(fuzzy_terms)
+
+    @classmethod
+    def _ngrams_of(cls, text):
+        return {text[i:i + cls.NGRAM] for i in range(len(text) - cls.NGRAM + 1)}
+
+    def _substring_ids(self, key):
+        """通过三元组倒排表筛选候选名称，再做子串校验"""
+        if len(key) < self.NGRAM:
+            candidates = range(len(self._names))
+        else:
+            postings = sorted((self._ngrams.get(gram, set()) for gram in self._ngrams_of(key)), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+        return sorted(name_id for name_id in candidates if key in self._names[name_id])
+
+    def _term_ids(self, term):
+        """模糊词条对应的名称编号"""
+        if term in self._exact:
+            return {self._exact[term]}
+        return self._tokens.get(term, set())
+
+    def fuzzy(self, site, limit=5, max_distance=None):
+        """模糊匹配站点，返回 [(原始站点名称, 编辑距离), ...]"""
+        key = ChaveIndex.normalize(site)
+        if not key:
+            return []
+        results = {}
+        for term_id, distance in self._fuzzy.search(key, limit, max_distance):
+            for name_id in sorted(self._term_ids(self._fuzzy.terms[term_id])):
+                results.setdefault(name_id, distance)
+        return [(self._display[name_id], distance) for name_id, distance in list(results.items())[:limit]]
+
+    def lookup(self, site, fuzzy=False):
+        """查找站点：精确名称 → 完整分词 → 子串，按DCN行顺序返回全部匹配
+
+        fuzzy=True 时最后再尝试模糊匹配（唯一的最佳候选）。拼写相近的往往是另一个物理站点，
+        生成配置时不使用模糊匹配，只通过 fuzzy() 给出候选。
+        """
+        key = ChaveIndex.normalize(site)
+        if not key:
+            return SiteMatch()
+        
+        distance = None
+        if key in self._exact:
+            kind, name_ids = 'exact', [self._exact[key]]
+        elif key in self._tokens:
+            kind, name_ids = 'token', sorted(self._tokens[key])
+        else:
+            name_ids = self._substring_ids(key)
+            kind = 'substring' if name_ids else None
+        
+        if not name_ids and fuzzy:
+            # 只有编辑距离最小的站点唯一时才自动采用
+            matches = self._fuzzy.search(key)
+            if matches:
+                distance = matches[0][1]
+                best_ids = set()
+                for term_id, term_distance in matches:
+                    if term_distance == distance:
+                        best_ids |= self._term_ids(self._fuzzy.terms[term_id])
+                if len(best_ids) == 1:
+                    kind, name_ids = 'fuzzy', sorted(best_ids)
+                else:
+                    distance = None
+        
+        names, positions = [], []
+        for name_id in name_ids:
+            names.append(self._display[name_id])
+            positions.extend(self._rows[name_id])
+        return SiteMatch(kind, names, positions, distance)
+
+    def memory_usage(self):
+        """粗略估算索引占用的内存（字节）"""
+        name_bytes = sum(len(name) * 4 + 64 for name in self._names)
+        posting_bytes = sum(len(ids) * 8 + 64 for ids in self._ngrams.values())
+        posting_bytes += sum(len(ids) * 8 + 64 for ids in self._tokens.values())
+        return name_bytes + posting_bytes + self._fuzzy.memory_usage()
+
+    def __len__(self):
+        return len(self._names)
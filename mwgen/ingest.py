@@ -0,0 +1,118 @@
+"""文件读取 - 每个工作簿只打开一次，只读取需要的列，并记录解析耗时和吞吐量"""
+import importlib.util
+import io
+import os
+import time
+
+import pandas as pd
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+SUPPORTED_EXTENSIONS = ('.csv',) + EXCEL_EXTENSIONS
+
+
+class NamedBytesIO(io.BytesIO):
+    """带文件名的内存文件，模拟Streamlit上传的文件对象（也用于把上传内容交给工作进程）"""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+def file_extension(file):
+    """返回文件扩展名（小写）"""
+    return os.path.splitext(file.name)[1].lower()
+
+
+def excel_engine(extension):
+    """选择Excel读取引擎：优先calamine（流式读取，需安装python-calamine），
+    否则xlsx使用openpyxl（pandas以只读模式打开），xls使用xlrd"""
+    if importlib.util.find_spec('python_calamine') is not None:
+        return 'calamine'
+    return 'xlrd' if extension == '.xls' else 'openpyxl'
+
+
+class IngestReport:
+    """单个文件的解析报告：读取引擎、工作表、行列数、耗时和每秒行数"""
+
+    def __init__(self, file_name, kind):
+        self.file_name = file_name
+        self.kind = kind
+        self.engine = None
+        self.sheet = None
+        self.rows = 0
+        self.columns_read = 0
+        self.columns_total = 0
+        self.read_seconds = 0.0
+        self.total_seconds = 0.0
+        self._started = time.perf_counter()
+
+    def finish(self, df):
+        """记录最终行数和总耗时（含清理等后续步骤）"""
+        self.rows = len(df)
+        self.total_seconds = time.perf_counter() - self._started
+        return self
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.total_seconds if self.total_seconds > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            'file': self.file_name,
+            'kind': self.kind,
+            'engine': self.engine,
+            'sheet': self.sheet,
+            'rows': self.rows,
+            'columns_read': self.columns_read,
+            'columns_total': self.columns_total,
+            'read_seconds': round(self.read_seconds, 4),
+            'total_seconds': round(self.total_seconds, 4),
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
+
+    def summary(self):
+        """一行文字摘要"""
+        sheet = f" [{self.sheet}]" if self.sheet else ''
+        return (f"{self.file_name}{sheet}: {self.rows:,} 行，读取 {self.columns_read}/{self.columns_total} 列，"
+                f"耗时 {self.total_seconds:.2f} 秒（读取 {self.read_seconds:.2f} 秒），"
+                f"{self.rows_per_second:,.0f} 行/秒，引擎 {self.engine}")
+
+
+def read_table(file, report, header=0, sheet_selector=None, column_selector=None):
+    """读取CSV或Excel文件（工作簿只打开一次）
+
+    sheet_selector(工作表名列表) 返回要读取的工作表；
+    column_selector(列名列表) 返回要读取的列位置列表，返回None表示读取全部列。
+    """
+    extension = file_extension(file)
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"不支持的文件格式: {extension or file.name}")
+
+    started = time.perf_counter()
+    if extension == '.csv':
+        report.engine = 'csv'
+        usecols = None
+        if column_selector is not None:
+            columns = pd.read_csv(file, header=header, nrows=0).columns
+            file.seek(0)
+            usecols = column_selector(list(columns))
+            report.columns_total = len(columns)
+        df = pd.read_csv(file, header=header, usecols=usecols)
+    else:
+        report.engine = excel_engine(extension)
+        with pd.ExcelFile(file, engine=report.engine) as workbook:
+            sheet_names = workbook.sheet_names
+            report.sheet = sheet_selector(sheet_names) if sheet_selector is not None else sheet_names[0]
+            usecols = None
+            if column_selector is not None:
+                # 只解析表头行来确定需要的列
+                columns = workbook.parse(report.sheet, header=header, nrows=0).columns
+                usecols = column_selector(list(columns))
+                report.columns_total = len(columns)
+            df = workbook.parse(report.sheet, header=header, usecols=usecols)
+
+    report.read_seconds = time.perf_counter() - started
+    report.columns_read = len(df.columns)
+    if not report.columns_total:
+        report.columns_total = len(df.columns)
+    return df
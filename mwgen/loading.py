@@ -0,0 +1,94 @@
+"""DCN和Datasheet并行加载 - 两个文件互不依赖，同时解析，总等待时间取较慢的一个
+
+每个加载任务在工作进程中完成解析及其后续步骤（站点索引，或CHAVE索引和版本指纹），
+只传递文件内容和文件名，返回可序列化的结果；openpyxl读取受GIL限制，因此使用进程而不是线程。
+调用方启用了性能记录时，工作进程中的各阶段耗时随结果返回并并入调用方的记录器。
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from . import perf
+from .ingest import NamedBytesIO
+from .log import EventLog
+from .processor import DataProcessor
+from .versioning import DatasheetVersion
+
+# 加载进程数（两个文件各一个进程；单核机器或设为 1 时在当前进程内顺序加载）
+LOAD_WORKERS = int(os.environ.get('MWGEN_LOAD_WORKERS', str(min(2, os.cpu_count() or 1))))
+
+
+def load_dcn(content, name, header_row=None):
+    """解析DCN文件并构建站点索引，返回 {'data', 'site_index', 'log'}"""
+    event_log = EventLog()
+    dcn_data = DataProcessor.parse_dcn_file(NamedBytesIO(content, name), event_log, header_row=header_row)
+    site_index = DataProcessor.build_site_index(dcn_data) if dcn_data is not None else None
+    return {'data': dcn_data, 'site_index': site_index, 'log': event_log}
+
+
+def load_datasheet(content, name, digest=None):
+    """解析Datasheet并构建CHAVE索引和版本指纹，返回 {'data', 'chave_index', 'version', 'log'}"""
+    event_log = EventLog()
+    datasheet_data = DataProcessor.parse_datasheet_file(NamedBytesIO(content, name), event_log)
+    chave_index = version = None
+    if datasheet_data is not None:
+        chave_index = DataProcessor.build_chave_index(datasheet_data)
+        version = DatasheetVersion.from_frame(datasheet_data, digest)
+    return {'data': datasheet_data, 'chave_index': chave_index, 'version': version, 'log': event_log}
+
+
+def _recorded(func, *args):
+    """在工作进程中记录各阶段耗时，返回 (结果, 记录器快照)"""
+    recorder = perf.PerfRecorder()
+    with perf.recording(recorder):
+        value = func(*args)
+    return value, recorder.snapshot()
+
+
+def make_pool(workers=LOAD_WORKERS):
+    """创建加载进程池，workers 不大于 1 时返回None（顺序加载）"""
+    return ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+
+def load_concurrently(jobs, executor=None, on_done=None):
+    """执行一组加载任务 {名称: (函数, 参数...)}，返回 {名称: 结果}
+
+    多于一个任务且提供了executor时并行执行，否则在当前进程内顺序执行；
+    每完成一个任务调用 on_done(名称, 已完成数, 总数)。进程池不可用时退回当前进程执行。
+    """
+    results = {}
+    total = len(jobs)
+
+    def finish(name, value):
+        results[name] = value
+        if on_done is not None:
+            on_done(name, len(results), total)
+
+    if executor is None or total < 2:
+        for name, (func, *args) in jobs.items():
+            finish(name, func(*args))
+        return results
+
+    # 记录器（ContextVar）不会传到工作进程，需要时在进程内单独记录
+    recorded = perf.active()
+    try:
+        futures = {
+            (executor.submit(_recorded, func, *args) if recorded else executor.submit(func, *args)): name
+            for name, (func, *args) in jobs.items()
+        }
+    except (BrokenProcessPool, RuntimeError):
+        futures = {}
+    for future in as_completed(futures):
+        name = futures[future]
+        try:
+            value = future.result()
+        except BrokenProcessPool:
+            continue
+        if recorded:
+            value, snapshot = value
+            perf.merge(snapshot)
+        finish(name, value)
+    for name, (func, *args) in jobs.items():
+        if name not in results:
+            finish(name, func(*args))
+    return results
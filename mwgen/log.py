@@ -0,0 +1,112 @@
+"""结构化日志接口
+
+核心处理代码只依赖 info/success/warning/error 四个方法，
+每个方法接收一条消息以及可选的阶段(stage)和计数(count)。
+EventLog 在内存中收集事件供界面汇总展示，LoggingLog 转发到标准库logging。
+"""
+import logging
+
+logger = logging.getLogger('mwgen')
+
+
+class NullLog:
+    """空日志容器 - 与log_container接口一致，丢弃所有输出"""
+
+    def info(self, message, stage=None, count=None):
+        pass
+
+    success = warning = error = info
+
+
+# 处理阶段的显示名称
+STAGE_LABELS = {
+    'parse': '文件解析',
+    'ip_repair': 'IP修复',
+    'columns': '列检测',
+    'lookup': 'CHAVE查找',
+    'site_match': '站点匹配',
+    'radio': '无线参数',
+}
+
+LEVELS = ('info', 'success', 'warning', 'error')
+
+
+class EventLog:
+    """结构化事件日志 - 只在内存中追加事件（级别、阶段、消息、计数），由调用方一次性汇总展示"""
+
+    def __init__(self):
+        self.events = []  # [(级别, 阶段, 消息, 计数), ...]
+
+    def info(self, message, stage=None, count=None):
+        self.events.append(('info', stage, message, count))
+
+    def success(self, message, stage=None, count=None):
+        self.events.append(('success', stage, message, count))
+
+    def warning(self, message, stage=None, count=None):
+        self.events.append(('warning', stage, message, count))
+
+    def error(self, message, stage=None, count=None):
+        self.events.append(('error', stage, message, count))
+
+    def messages(self, level):
+        """返回指定级别的全部消息"""
+        return [message for event_level, _, message, _ in self.events if event_level == level]
+
+    def level_counts(self):
+        """按级别统计事件数"""
+        counts = dict.fromkeys(LEVELS, 0)
+        for level, _, _, _ in self.events:
+            counts[level] += 1
+        return counts
+
+    def stage_summary(self):
+        """按阶段汇总：事件数、警告数、错误数以及计数字段之和（如修复的IP数量）"""
+        summary = {}
+        for level, stage, _, count in self.events:
+            row = summary.setdefault(stage, {'events': 0, 'warnings': 0, 'errors': 0, 'count': 0})
+            row['events'] += 1
+            row['warnings'] += level == 'warning'
+            row['errors'] += level == 'error'
+            row['count'] += count or 0
+        return [
+            {'stage': stage, 'label': STAGE_LABELS.get(stage, stage or '其他'), **row}
+            for stage, row in summary.items()
+        ]
+
+    def records(self):
+        """全部事件（字典列表），用于表格展示和导出"""
+        return [
+            {'seq': seq, 'level': level, 'stage': stage or '', 'message': message, 'count': count}
+            for seq, (level, stage, message, count) in enumerate(self.events, start=1)
+        ]
+
+    def __len__(self):
+        return len(self.events)
+
+
+class LoggingLog:
+    """标准库logging适配器 - 供命令行和脚本调用使用"""
+
+    def __init__(self, target=None):
+        self.logger = target or logger
+
+    def _log(self, level, message, stage, count):
+        self.logger.log(level, message, extra={'stage': stage, 'count': count})
+
+    def info(self, message, stage=None, count=None):
+        self._log(logging.INFO, message, stage, count)
+
+    def success(self, message, stage=None, count=None):
+        self._log(logging.INFO, message, stage, count)
+
+    def warning(self, message, stage=None, count=None):
+        self._log(logging.WARNING, message, stage, count)
+
+    def error(self, message, stage=None, count=None):
+        self._log(logging.ERROR, message, stage, count)
+
+
+def resolve_log(log_container):
+    """未指定日志容器时，回退到标准库logging"""
+    return LoggingLog() if log_container is None else log_container
@@ -0,0 +1,323 @@
+"""全网链路配置表 - 用列运算一次算出Datasheet中每条链路的完整配置
+
+规则与 DataProcessor.find_site_config 的逐条查找一致：每个不同的站点名只通过站点索引匹配一次，
+再按DCN行位置连接；频率和功率换算、站点B收发互换、网关和设备名改写都按列计算。
+单条查找、批量导出和数据校验都可以直接读取这张表。
+"""
+import numpy as np
+import pandas as pd
+
+from . import perf
+from .addressing import INVALID, address_conflicts, prefix_masks, unpack_ipv4
+from .indexes import ChaveIndex
+from .log import EventLog
+from .processor import (ADDRESS_COLUMNS, DATASHEET_HEADER_ROW, DEFAULT_GATEWAY, DEFAULT_MASK, DEFAULT_SITE_IPS,
+                        DEFAULT_VLAN, RADIO_COLUMN_TYPES, RADIO_DEFAULTS, RADIO_SCALES, DataProcessor)
+
+SITES = ('site_a', 'site_b')
+SITE_LABELS = {'site_a': 'A', 'site_b': 'B'}
+REQUIRED_COLUMNS = ('chave', 'site_a', 'site_b', 'device')
+MISSING_INFO = "❌ 缺少必要的站点或设备信息"
+
+
+def _text(series):
+    """与 str(value).strip() 一致的文本列（缺失值为'nan'）"""
+    return series.astype(object).map(str).str.strip()
+
+
+def truncate_integers(series):
+    """与 int(value) 一致地向零取整，无法转换的值为缺失"""
+    numbers = pd.to_numeric(series.astype(object), errors='coerce').astype('float64')
+    return np.trunc(numbers.where(np.isfinite(numbers))).astype('Int64')
+
+
+class LinkTable:
+    """全网链路配置表 - 每行对应Datasheet中的一行，列为生成脚本所需的全部配置值
+
+    frame 的主要列：excel_row（Datasheet中的Excel行号）、chave（chave_key 为规范化CHAVE）、site_a/site_b、device（原始设备名）、device_a/device_b、
+    <站点>_row（DCN行位置，-1 表示未匹配并使用默认值）、<站点>_kind、<站点>_matches、
+    <站点>_ip/_vlan/_subnet/_gateway/_mask（<站点>_gateway_default 表示使用默认网关）、
+    <站点>_ip_packed、<站点>_duplicate_ip/_outside_subnet/_overlapping_subnet（DCN中的地址冲突）、
+    bandwidth、tx_power、tx_frequency_a/rx_frequency_a/tx_frequency_b/rx_frequency_b（换算后）、
+    <参数>_raw（Datasheet原始值）、error（该行无法生成配置的原因）。
+    """
+
+    def __init__(self, frame, chave_index, site_matches, column_log, missing_columns=(), radio_defaults=(),
+                 site_suggestions=None):
+        self.frame = frame
+        self.chave_index = chave_index
+        self.site_matches = site_matches        # 站点名 -> SiteMatch
+        self.site_suggestions = site_suggestions or {}  # 未找到的站点名 -> [(相近站点, 编辑距离), ...]
+        self.column_log = column_log            # 列检测日志
+        self.missing_columns = list(missing_columns)
+        self.radio_defaults = list(radio_defaults)  # 缺少列、使用默认值的无线参数
+        self._values = None
+
+    @classmethod
+    def build(cls, dcn_data, datasheet_data, chave_index=None, site_index=None):
+        """为整个Datasheet计算链路配置表"""
+        with perf.timer('resolve'):
+            table = cls._build(dcn_data, datasheet_data, chave_index, site_index)
+        perf.count('resolve', links=len(table.frame), sites=len(table.site_matches))
+        return table
+
+    @classmethod
+    def _build(cls, dcn_data, datasheet_data, chave_index, site_index):
+        column_log = EventLog()
+        detected_columns = DataProcessor.auto_detect_columns(datasheet_data, column_log)
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in detected_columns]
+        if missing_columns:
+            column_log.error(f"❌ 缺少必要的列: {missing_columns}", stage='lookup')
+            return cls(pd.DataFrame(index=datasheet_data.index[:0]), None, {}, column_log, missing_columns)
+
+        chave_col = detected_columns['chave']
+        if chave_index is None or chave_index.column != chave_col:
+            chave_index = ChaveIndex(datasheet_data[chave_col])
+        if not dcn_data.attrs.get('ip_normalized') or ADDRESS_COLUMNS[-1] not in dcn_data.columns:
+            dcn_data = DataProcessor.fix_ip_addresses(dcn_data, EventLog())
+        if site_index is None:
+            site_index = DataProcessor.build_site_index(dcn_data)
+
+        frame = pd.DataFrame(index=datasheet_data.index)
+        # 数据行在工作簿中的Excel行号（Excel保留空行，CSV中的空行在读取时已被跳过）
+        header_row = datasheet_data.attrs.get('header_row', DATASHEET_HEADER_ROW)
+        frame['excel_row'] = np.arange(len(frame), dtype=np.int64) + header_row + 1
+        frame['chave'] = _text(datasheet_data[chave_col])
+        frame['chave_key'] = datasheet_data[chave_col].astype(object).map(ChaveIndex.normalize)
+        for site in SITES:
+            frame[site] = _text(datasheet_data[detected_columns[site]])
+        # 设备名 NO → ZT 并合并连续连字符；站点B的设备名由站点A的名称替换得到
+        frame['device'] = _text(datasheet_data[detected_columns['device']])
+        device_a = frame['device'].str.replace('NO', 'ZT', regex=False).str.replace(r'-+', '-', regex=True)
+        # 逐行替换（np.char 在空表上会出错）
+        device_b = [
+            device.replace(name_a, name_b) if name_a in device else f"MWE-4G-{name_b}-N1-ZT"
+            for device, name_a, name_b in zip(device_a.tolist(), frame['site_a'].tolist(), frame['site_b'].tolist())
+        ]
+        frame['device_a'] = device_a
+        frame['device_b'] = pd.Series(device_b, index=frame.index, dtype=object).str.replace(r'-+', '-', regex=True)
+        missing_info = (frame['site_a'] == '') | (frame['site_b'] == '') | (device_a == '')
+
+        # 每个不同的站点名只匹配一次，再按DCN行位置取出IP、VLAN和子网
+        site_names = pd.unique(pd.concat([frame['site_a'][~missing_info], frame['site_b'][~missing_info]]))
+        site_matches = {name: site_index.lookup(name, fuzzy=False) for name in site_names}
+        perf.count('site_match', lookups=len(site_matches))
+        # 未找到的站点只记录拼写相近的候选，配置仍使用默认值
+        site_suggestions = {
+            name: DataProcessor.site_suggestions(site_index, name)
+            for name, match in site_matches.items() if not match.positions
+        }
+        dcn_values = {
+            column: (dcn_data[column].astype(object).to_numpy() if column in dcn_data.columns
+                     else np.full(len(dcn_data), None, dtype=object))
+            for column in ('IP地址', 'VLAN', '子网掩码')
+        }
+        packed = {column: dcn_data[column].to_numpy(dtype=np.int64) for column in ADDRESS_COLUMNS}
+        conflicts = address_conflicts(packed['IP数值'], packed['子网数值'], packed['前缀长度'])
+        for site in SITES:
+            matches = [site_matches.get(name) for name in frame[site].tolist()]
+            rows = np.array([match.positions[0] if match and match.positions else -1 for match in matches],
+                            dtype=np.int64)
+            matched = rows >= 0
+            frame[f'{site}_row'] = rows
+            frame[f'{site}_kind'] = [match.kind if match else None for match in matches]
+            frame[f'{site}_matches'] = [len(match.positions) if match else 0 for match in matches]
+
+            def take(values, default):
+                taken = np.full(len(frame), default, dtype=values.dtype)
+                taken[matched] = values[rows[matched]]
+                return taken
+
+            frame[f'{site}_ip'] = take(dcn_values['IP地址'], DEFAULT_SITE_IPS[site])
+            frame[f'{site}_vlan'] = take(dcn_values['VLAN'], DEFAULT_VLAN)
+            frame[f'{site}_subnet'] = take(dcn_values['子网掩码'], None)
+            frame[f'{site}_ip_packed'] = take(packed['IP数值'], INVALID)
+            # 网关和掩码由打包的子网整数计算，子网缺失或无效时使用默认值
+            gateways = take(packed['网关数值'], INVALID)
+            prefixes = take(packed['前缀长度'], INVALID)
+            frame[f'{site}_gateway_default'] = gateways < 0
+            frame[f'{site}_gateway'] = np.where(gateways >= 0, unpack_ipv4(gateways), DEFAULT_GATEWAY)
+            frame[f'{site}_mask'] = np.where(prefixes >= 0, unpack_ipv4(prefix_masks(prefixes)), DEFAULT_MASK)
+            for conflict, flags in conflicts.items():
+                frame[f'{site}_{conflict}'] = take(flags, False)
+
+        # 无线参数：MHz → kHz，功率 ×10，站点B的收发频率与站点A互换
+        radio_defaults = [field for field in RADIO_COLUMN_TYPES if field not in detected_columns]
+        radio, invalid = {}, {}
+        for field in RADIO_COLUMN_TYPES:
+            if field in detected_columns:
+                raw = datasheet_data[detected_columns[field]]
+            else:
+                raw = pd.Series(RADIO_DEFAULTS[field], index=frame.index)
+            frame[f'{field}_raw'] = raw.astype(object)
+            scale, label = RADIO_SCALES[field]
+            values = truncate_integers(raw)
+            radio[field] = values * scale
+            invalid[label] = values.isna()
+        frame['bandwidth'] = radio['bandwidth']
+        frame['tx_power'] = radio['tx_power']
+        frame['tx_frequency_a'] = radio['tx_freq']
+        frame['rx_frequency_a'] = radio['rx_freq']
+        frame['tx_frequency_b'] = radio['rx_freq']
+        frame['rx_frequency_b'] = radio['tx_freq']
+
+        invalid = pd.DataFrame(invalid, index=frame.index)
+        invalid_labels = invalid.dot(invalid.columns + '、').str.rstrip('、')
+        frame['error'] = np.select(
+            [missing_info.to_numpy(), invalid.any(axis=1).to_numpy()],
+            [MISSING_INFO, ("❌ 无线参数无效: " + invalid_labels).to_numpy(dtype=object)],
+            '',
+        ).astype(object)
+        return cls(frame, chave_index, site_matches, column_log, radio_defaults=radio_defaults,
+                   site_suggestions=site_suggestions)
+
+    def __getstate__(self):
+        # 逐列取值的缓存不随表一起序列化（传给工作进程时）
+        state = self.__dict__.copy()
+        state['_values'] = None
+        return state
+
+    def _column_values(self):
+        if self._values is None:
+            self._values = {column: self.frame[column].tolist() for column in self.frame.columns}
+        return self._values
+
+    def row_warnings(self, position):
+        """某一行的警告（与逐条查找的顺序相同）：匹配不唯一、使用默认站点信息"""
+        values = self._column_values()
+        warnings = []
+        for site in SITES:
+            match = self.site_matches.get(values[site][position])
+            if match is None or not match.positions:
+                continue
+            if match.ambiguous:
+                warnings.append(f"⚠️ 站点{SITE_LABELS[site]}在DCN中匹配不唯一（{match.kind}匹配 {len(match.positions)} 行）: "
+                                f"{match.names[:10]}，使用第一个")
+        if values['site_a_row'][position] < 0 or values['site_b_row'][position] < 0:
+            warnings.append("⚠️ 在DCN中未找到完整的站点信息，使用默认值")
+        return warnings
+
+    def config(self, position, chave_number):
+        """第position行的完整配置，与 find_site_config 的结构相同"""
+        values = self._column_values()
+        config = {'chave_number': chave_number}
+        for site, suffix in (('site_a', 'a'), ('site_b', 'b')):
+            config[site] = {
+                'site_name': values[site][position],
+                'device_name': values[f'device_{suffix}'][position],
+                'ip': values[f'{site}_ip'][position],
+                'vlan': values[f'{site}_vlan'][position],
+                'gateway': values[f'{site}_gateway'][position],
+                'mask': values[f'{site}_mask'][position],
+                'tx_frequency': values[f'tx_frequency_{suffix}'][position],
+                'rx_frequency': values[f'rx_frequency_{suffix}'][position],
+            }
+        config['radio_params'] = {
+            'bandwidth': values['bandwidth'][position],
+            'tx_power': values['tx_power'][position],
+            'modulation': 'bpsk',
+            'operation_mode': 'G02',
+        }
+        return config
+
+    def find_config(self, chave_number, log_container):
+        """查找一个CHAVE，按 find_site_config 的顺序记录处理日志，返回config或None"""
+        log_container.info(f"🔍 正在查找CHAVE: {chave_number}", stage='lookup')
+        for level, stage, message, count in self.column_log.events:
+            getattr(log_container, level)(message, stage=stage, count=count)
+        if self.chave_index is None:
+            log_container.info("💡 请检查Datasheet文件格式，或手动指定列名", stage='lookup')
+            return None
+
+        with perf.timer('lookup'):
+            positions = self.chave_index.lookup(chave_number)
+        perf.count('lookup', lookups=1, rows_matched=len(positions))
+        if len(positions) != 1:
+            DataProcessor.log_chave_miss(self.chave_index, chave_number, positions, self.frame.index, log_container)
+            return None
+
+        position = positions[0]
+        values = self._column_values()
+        log_container.success("✅ 找到CHAVE配置", stage='lookup')
+        log_container.info(f"📡 站点A: {values['site_a'][position]}", stage='lookup')
+        log_container.info(f"📡 站点B: {values['site_b'][position]}", stage='lookup')
+        log_container.info(f"🖥️  设备: {values['device'][position]}", stage='lookup')
+        if values['error'][position] == MISSING_INFO:
+            log_container.error(MISSING_INFO, stage='lookup')
+            return None
+        log_container.info(f"🔄 设备名转换后: {values['device_a'][position]}", stage='lookup')
+
+        for site in SITES:
+            label, name = SITE_LABELS[site], values[site][position]
+            match = self.site_matches.get(name)
+            if match is None or not match.positions:
+                candidates = self.site_suggestions.get(name)
+                if candidates:
+                    log_container.info(DataProcessor.format_site_suggestions(name, label, candidates),
+                                       stage='site_match')
+                continue
+            if match.ambiguous:
+                log_container.warning(
+                    f"⚠️ 站点{label}在DCN中匹配不唯一（{match.kind}匹配 {len(match.positions)} 行）: "
+                    f"{match.names[:10]}，使用第一个",
+                    stage='site_match'
+                )
+            log_container.success(f"✅ 在DCN中找到站点{label}: {match.names[0]}", stage='site_match')
+            log_container.info(f"   IP地址: {values[f'{site}_ip'][position]}", stage='site_match')
+        if values['site_a_row'][position] < 0 or values['site_b_row'][position] < 0:
+            log_container.warning("⚠️ 在DCN中未找到完整的站点信息，使用默认值", stage='site_match')
+
+        if values['error'][position]:
+            log_container.error(values['error'][position], stage='radio')
+            return None
+        raw = {field: values[f'{field}_raw'][position] for field in RADIO_SCALES}
+        log_container.info(f"📡 无线参数:", stage='radio')
+        log_container.info(f"  - 带宽: {raw['bandwidth']}MHz → {values['bandwidth'][position]}KHz", stage='radio')
+        log_container.info(f"  - 功率: {raw['tx_power']}dBm(原始) → {values['tx_power'][position]}dBm(修正)",
+                           stage='radio')
+        log_container.info(f"  - 站点A: TX={raw['tx_freq']}MHz→{values['tx_frequency_a'][position]}KHz, "
+                           f"RX={raw['rx_freq']}MHz→{values['rx_frequency_a'][position]}KHz", stage='radio')
+        log_container.info(f"  - 站点B: TX={raw['rx_freq']}MHz→{values['tx_frequency_b'][position]}KHz, "
+                           f"RX={raw['tx_freq']}MHz→{values['rx_frequency_b'][position]}KHz", stage='radio')
+        return self.config(position, chave_number)
+
+    def result(self, chave_number):
+        """查找一个CHAVE，返回 (CHAVE, config或None, 说明)，说明与批量查找的规则相同"""
+        errors = self.column_log.messages('error')
+        warnings = self.column_log.messages('warning')
+        config = None
+        # 缺少必要列时列检测日志中已有错误
+        positions = self.chave_index.lookup(chave_number) if self.chave_index is not None else None
+        if positions is not None:
+            if len(positions) == 0:
+                errors.append(f"❌ 未找到CHAVE: {chave_number}")
+            elif len(positions) > 1:
+                row_labels = [self.frame.index[pos] for pos in positions]
+                errors.append(f"❌ CHAVE重复: {chave_number} 出现在 {len(positions)} 行 {row_labels}")
+            elif self._column_values()['error'][positions[0]]:
+                errors.append(self._column_values()['error'][positions[0]])
+            else:
+                config = self.config(positions[0], chave_number)
+                warnings += self.row_warnings(positions[0])
+        reason = errors[0] if errors else ''
+        if config is not None and warnings:
+            reason = warnings[0]
+        return chave_number, config, reason
+
+    def results(self, chave_numbers, progress=None):
+        """批量查找，返回 [(CHAVE, config或None, 说明), ...]"""
+        results = []
+        total = len(chave_numbers)
+        for done, chave_number in enumerate(chave_numbers, start=1):
+            results.append(self.result(chave_number))
+            if progress is not None:
+                progress(done, total)
+        return results
+
+    def memory_usage(self):
+        """粗略估算占用的内存（字节），含逐列取值的缓存"""
+        size = int(self.frame.memory_usage(index=True, deep=True).sum())
+        return size * 2 if self._values is not None else size
+
+    def __len__(self):
+        return len(self.frame)
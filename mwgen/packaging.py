@@ -0,0 +1,102 @@
+"""脚本打包 - 生成ZIP字节流，与界面展示方式无关"""
+import hashlib
+import io
+import re
+import zipfile
+
+import pandas as pd
+
+from . import perf
+from .generator import ZTEScriptGenerator
+from .indexes import ChaveIndex
+
+
+class BatchArchive:
+    """一次批量生成的输出：ZIP包、汇总表、复用统计，以及供下次增量生成复用的渲染结果（RenderedBatch）"""
+
+    def __init__(self, zip_bytes, summary, stats, rendered, filename):
+        self.zip_bytes = zip_bytes
+        self.summary = summary
+        self.stats = stats        # {'reused', 'regenerated'}
+        self.rendered = rendered  # RenderedBatch
+        self.filename = filename
+
+    @staticmethod
+    def make_key(dcn_key, datasheet_key, template_version, chave_numbers):
+        """生成共享注册表中的键：(数据集键, 模板版本, 规范化CHAVE列表的哈希)"""
+        digest = hashlib.sha256('\n'.join(ChaveIndex.normalize(chave) for chave in chave_numbers).encode())
+        return ('batch', dcn_key, datasheet_key, template_version, digest.hexdigest())
+
+    def memory_usage(self):
+        """粗略估算占用的内存（字节）"""
+        return (len(self.zip_bytes) + int(self.summary.memory_usage(index=True, deep=True).sum())
+                + self.rendered.memory_usage())
+
+
+def build_link_zip(script_a, script_b, site_a_name, site_b_name):
+    """将单条链路两端的脚本打包为ZIP，返回ZIP字节"""
+    zip_buffer = io.BytesIO()
+    
+    with perf.timer('zip'):
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            # 添加站点A脚本
+            zip_file.writestr(f"{site_a_name}.txt", script_a)
+            # 添加站点B脚本
+            zip_file.writestr(f"{site_b_name}.txt", script_b)
+    
+    perf.count('zip', archives=1, bytes=zip_buffer.tell())
+    return zip_buffer.getvalue()
+
+
+def safe_filename(name):
+    """将名称转换为可安全用作ZIP内路径的文件名"""
+    return re.sub(r'[\\/:*?"<>|]+', '_', str(name)).strip() or '_'
+
+
+def render_results(results, generator=ZTEScriptGenerator):
+    """为批量查找结果渲染两端脚本，逐条产出 (CHAVE, config, 说明, 脚本A, 脚本B)"""
+    for chave_number, config, reason in results:
+        if config is None:
+            yield chave_number, None, reason, None, None
+        else:
+            yield (chave_number, config, reason,
+                   generator.generate_script(config, for_site_a=True),
+                   generator.generate_script(config, for_site_a=False))
+
+
+def build_batch_zip(results, generator=ZTEScriptGenerator):
+    """为批量结果生成单个ZIP（每个CHAVE一个目录，含两端脚本），返回(ZIP字节, 汇总表)"""
+    return package_rendered(render_results(results, generator))
+
+
+def package_rendered(rendered):
+    """把已渲染的批量结果打包为ZIP（可边生成边写入），返回(ZIP字节, 汇总表)"""
+    zip_buffer = io.BytesIO()
+    summary = []
+    
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        written = set()
+        for chave_number, config, reason, script_a, script_b in rendered:
+            # 同一CHAVE只打包一次
+            if ChaveIndex.normalize(chave_number) in written:
+                continue
+            written.add(ChaveIndex.normalize(chave_number))
+            
+            if config is None:
+                summary.append({'CHAVE': chave_number, '状态': '❌ 失败', '站点A': '', '站点B': '', '说明': reason})
+                continue
+            
+            folder = safe_filename(chave_number)
+            site_a_name = config['site_a']['device_name']
+            site_b_name = config['site_b']['device_name']
+            with perf.timer('zip'):
+                zip_file.writestr(f"{folder}/{safe_filename(site_a_name)}.txt", script_a)
+                zip_file.writestr(f"{folder}/{safe_filename(site_b_name)}.txt", script_b)
+            summary.append({'CHAVE': chave_number, '状态': '✅ 成功', '站点A': site_a_name,
+                            '站点B': site_b_name, '说明': reason})
+        
+        if summary:
+            zip_file.writestr("summary.csv", pd.DataFrame(summary).to_csv(index=False).encode('utf-8-sig'))
+    
+    perf.count('zip', archives=1, bytes=zip_buffer.tell())
+    return zip_buffer.getvalue(), pd.DataFrame(summary, columns=['CHAVE', '状态', '站点A', '站点B', '说明'])
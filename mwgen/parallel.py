@@ -0,0 +1,83 @@
+"""多进程批量生成 - 按CHAVE分片到进程池，结果按输入顺序流式返回
+
+每个工作进程在启动时通过 initializer 接收一次DCN、Datasheet及其索引，
+之后每个任务只传递一个CHAVE分片，避免重复序列化整个数据集。
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .generator import ZTEScriptGenerator
+from .packaging import render_results
+from .processor import DataProcessor
+
+DEFAULT_CHUNK_SIZE = int(os.environ.get('MWGEN_CHUNK_SIZE', '200'))
+
+# 工作进程内的数据集（由 _init_worker 填充）
+_worker_state = {}
+
+
+def _init_worker(dcn_data, datasheet_data, chave_index, site_index, link_table=None):
+    _worker_state.update(
+        dcn_data=dcn_data,
+        datasheet_data=datasheet_data,
+        chave_index=chave_index,
+        site_index=site_index,
+        link_table=link_table,
+    )
+
+
+def _process_chunk(chave_numbers):
+    """在工作进程中处理一个CHAVE分片：查找配置并渲染两端脚本"""
+    # 有全网配置表时直接读表，否则逐条查找
+    link_table = _worker_state.get('link_table')
+    if link_table is not None:
+        results = link_table.results(chave_numbers)
+    else:
+        results = DataProcessor.find_site_configs(
+            _worker_state['dcn_data'],
+            _worker_state['datasheet_data'],
+            chave_numbers,
+            chave_index=_worker_state['chave_index'],
+            site_index=_worker_state['site_index'],
+        )
+    return list(render_results(results, ZTEScriptGenerator))
+
+
+def generate_parallel(dcn_data, datasheet_data, chave_numbers, workers=None,
+                      chunk_size=DEFAULT_CHUNK_SIZE, chave_index=None, site_index=None, link_table=None):
+    """并行生成一批CHAVE，按输入顺序逐条产出 (CHAVE, config, 说明, 脚本A, 脚本B)
+
+    workers 为进程数（默认CPU核数，1 表示在当前进程内顺序执行），
+    chunk_size 为每个任务包含的CHAVE数量；提供 link_table（全网配置表）时直接读表取配置。
+    """
+    # 索引在父进程构建一次，随数据集一起交给工作进程；读配置表时不再需要索引和数据集
+    if link_table is not None:
+        dcn_data = datasheet_data = chave_index = site_index = None
+    else:
+        if chave_index is None:
+            chave_index = DataProcessor.build_chave_index(datasheet_data)
+        if site_index is None:
+            site_index = DataProcessor.build_site_index(dcn_data)
+    
+    chave_numbers = list(chave_numbers)
+    chunk_size = max(1, int(chunk_size))
+    chunks = [chave_numbers[i:i + chunk_size] for i in range(0, len(chave_numbers), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks)) if chunks else 1
+    
+    if workers <= 1:
+        _init_worker(dcn_data, datasheet_data, chave_index, site_index, link_table)
+        try:
+            for chunk in chunks:
+                yield from _process_chunk(chunk)
+        finally:
+            _worker_state.clear()
+        return
+    
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(dcn_data, datasheet_data, chave_index, site_index, link_table),
+    ) as pool:
+        # map 按提交顺序返回结果，分片完成即可开始消费
+        for chunk_results in pool.map(_process_chunk, chunks):
+            yield from chunk_results
@@ -0,0 +1,158 @@
+"""分阶段性能计时 - 通过contextvars找到当前记录器，未启用时计时点几乎没有开销
+
+核心代码只调用 timer(阶段) 和 count(阶段, 计数名=值)；
+调用方用 recording(记录器) 或 activate(记录器) 开启记录，不开启时两者都是空操作。
+"""
+import contextlib
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+# 计时阶段的显示名称
+PERF_LABELS = {
+    'load': '文件加载（并行）',
+    'excel_read': 'Excel/CSV读取',
+    'header_detect': '表头检测',
+    'ip_repair': 'IP修复',
+    'ip_pack': '地址打包',
+    'compact': '数据压缩',
+    'columns': '列检测',
+    'lookup': 'CHAVE查找',
+    'site_match': 'DCN站点匹配',
+    'render': '脚本渲染',
+    'zip': 'ZIP打包',
+    'resolve': '全网配置计算',
+    'validate': '数据校验',
+    'batch': '批量生成',
+}
+
+_current = ContextVar('mwgen_perf_recorder', default=None)
+_NOOP = contextlib.nullcontext()
+
+
+class PerfRecorder:
+    """性能记录器 - 按阶段累计调用次数、耗时和计数器，并保留最近的计时明细"""
+
+    def __init__(self, max_spans=1000):
+        self.stages = {}  # 阶段 -> {'calls', 'seconds', 'max_seconds', 'counters'}
+        self.spans = deque(maxlen=max_spans)  # 最近的计时明细
+        self._lock = threading.Lock()
+
+    def _stage(self, stage):
+        if stage not in self.stages:
+            self.stages[stage] = {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'counters': {}}
+        return self.stages[stage]
+
+    @contextlib.contextmanager
+    def span(self, stage):
+        """对一段代码计时"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            with self._lock:
+                totals = self._stage(stage)
+                totals['calls'] += 1
+                totals['seconds'] += seconds
+                totals['max_seconds'] = max(totals['max_seconds'], seconds)
+                self.spans.append({'stage': stage, 'seconds': round(seconds, 6), 'at': round(time.time(), 3)})
+
+    def add(self, stage, **counters):
+        """累加阶段计数器（如扫描行数、修复的IP数、生成的字节数）"""
+        with self._lock:
+            totals = self._stage(stage)['counters']
+            for name, value in counters.items():
+                totals[name] = totals.get(name, 0) + value
+
+    def snapshot(self):
+        """可跨进程传递的原始数据（各阶段累计值和计时明细）"""
+        with self._lock:
+            stages = {stage: {**totals, 'counters': dict(totals['counters'])}
+                      for stage, totals in self.stages.items()}
+            return {'stages': stages, 'spans': list(self.spans)}
+
+    def merge(self, snapshot):
+        """并入另一个记录器的 snapshot()（如工作进程中记录的阶段）"""
+        with self._lock:
+            for stage, other in snapshot['stages'].items():
+                totals = self._stage(stage)
+                totals['calls'] += other['calls']
+                totals['seconds'] += other['seconds']
+                totals['max_seconds'] = max(totals['max_seconds'], other['max_seconds'])
+                for name, value in other['counters'].items():
+                    totals['counters'][name] = totals['counters'].get(name, 0) + value
+            self.spans.extend(snapshot['spans'])
+
+    def rows(self):
+        """按阶段汇总的表格行"""
+        with self._lock:
+            rows = []
+            for stage, totals in self.stages.items():
+                rows.append({
+                    'stage': stage,
+                    'label': PERF_LABELS.get(stage, stage),
+                    'calls': totals['calls'],
+                    'seconds': round(totals['seconds'], 6),
+                    'mean_ms': round(totals['seconds'] / totals['calls'] * 1000, 3) if totals['calls'] else None,
+                    'max_ms': round(totals['max_seconds'] * 1000, 3),
+                    **totals['counters'],
+                })
+            return rows
+
+    def as_dict(self):
+        """导出为可序列化为JSON的字典"""
+        rows = self.rows()
+        with self._lock:
+            return {'stages': rows, 'spans': list(self.spans)}
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.spans.clear()
+
+    def __len__(self):
+        return len(self.stages)
+
+
+def activate(recorder):
+    """在当前上下文（线程）中启用记录器，传入None表示关闭"""
+    return _current.set(recorder)
+
+
+@contextlib.contextmanager
+def recording(recorder):
+    """在with块内启用记录器"""
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+
+def active():
+    """当前上下文是否启用了记录器（供热点路径跳过计时）"""
+    return _current.get() is not None
+
+
+def timer(stage):
+    """对一段代码计时；未启用记录器时返回空操作"""
+    recorder = _current.get()
+    if recorder is None:
+        return _NOOP
+    return recorder.span(stage)
+
+
+def merge(snapshot):
+    """把其他进程记录的 snapshot() 并入当前记录器；未启用记录器时不做任何事"""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.merge(snapshot)
+
+
+def count(stage, **counters):
+    """累加阶段计数器；未启用记录器时不做任何事"""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.add(stage, **counters)
@@ -0,0 +1,688 @@
+"""DCN/Datasheet解析、CHAVE匹配和配置整合 - 不依赖Streamlit"""
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from . import perf
+from .addressing import (DEFAULT_MASK, INVALID, PREFIX_MASKS, format_ipv4, gateway_addresses, pack_ipv4,
+                         parse_subnets)
+from .compact import compact_frame
+from .indexes import ChaveIndex, SiteIndex
+from .ingest import SUPPORTED_EXTENSIONS, IngestReport, file_extension, read_table
+from .log import EventLog, NullLog, resolve_log
+
+IP_DOTTED_PATTERN = r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}'
+
+# DCN表头检测：只扫描前N行，按命中的已知列名个数打分
+DCN_HEADER_SCAN_ROWS = 30
+DCN_HEADER_NAMES = ('End. IP', 'Subnet', 'Obs', 'Vlan', 'IP地址', '子网掩码', '站点名称')
+# 已知工作簿的固定表头行（工作表名 -> Excel行号，从1开始），命中时跳过检测
+# 例如: {'PROJETO LÓGICO': 2}
+DCN_HEADER_PROFILES = {}
+# 生成脚本用到的DCN列（标准化后的列名）
+DCN_COLUMNS = ('IP地址', '子网掩码', '站点名称', 'VLAN')
+# 加载时由IP地址和子网打包得到的整数列（无效值为-1），见 mwgen.addressing
+ADDRESS_COLUMNS = ('IP数值', '子网数值', '前缀长度', '网关数值')
+# Datasheet表头所在的Excel行号（第一行为横幅）
+DATASHEET_HEADER_ROW = 2
+# Datasheet中的无线参数列（auto_detect_columns的列类型）
+RADIO_COLUMN_TYPES = ('bandwidth', 'tx_power', 'tx_freq', 'rx_freq')
+# Datasheet缺少无线参数列时使用的默认值（MHz / dBm，换算前）
+RADIO_DEFAULTS = {'bandwidth': 112, 'tx_power': 22, 'tx_freq': 14977, 'rx_freq': 14577}
+# 无线参数列 -> (换算倍数, 说明)：MHz → kHz，功率 ×10
+RADIO_SCALES = {
+    'bandwidth': (1000, '带宽'),
+    'tx_power': (10, '功率'),
+    'tx_freq': (1000, 'TX频率'),
+    'rx_freq': (1000, 'RX频率'),
+}
+# DCN中找不到站点或子网时使用的默认值
+DEFAULT_SITE_IPS = {'site_a': '10.211.51.202', 'site_b': '10.211.51.203'}
+DEFAULT_VLAN = 2929
+DEFAULT_GATEWAY = '10.211.51.201'
+# DCN中找不到站点时列出的相近站点（个数、最大编辑距离）
+SITE_SUGGESTION_LIMIT = 5
+SITE_SUGGESTION_DISTANCE = 3
+
+
+@lru_cache(maxsize=65536)
+def convert_ip_format(ip_str):
+    """逐值解析IP地址字符串（带缓存），无法解析时返回原值"""
+    ip_str = ip_str.strip()
+    
+    # 如果已经是正常IP格式，直接返回
+    if re.fullmatch(IP_DOTTED_PATTERN, ip_str):
+        return ip_str
+    
+    # 高优先级1: 处理逗号分隔的IP (如 "10,226,106,192")
+    if ',' in ip_str:
+        ip_parts = ip_str.split(',')
+        if len(ip_parts) == 4 and all(part.strip().isdigit() for part in ip_parts):
+            # 验证每个部分是否在有效范围内
+            if all(0 <= int(part) <= 255 for part in ip_parts):
+                return '.'.join(ip_parts)
+    
+    ip_num = ip_str.replace('.', '').replace(',', '')
+    if not ip_num.isdigit():
+        return ip_str
+    
+    # 高优先级2: 处理AABBBCCCDDD格式 (如 "10226106192")
+    if len(ip_num) == 11:
+        parts = (ip_num[:2], ip_num[2:5], ip_num[5:8], ip_num[8:])
+        if all(int(part) <= 255 for part in parts):
+            return '.'.join(parts)
+    
+    # 其他情况: 自动智能识别，尝试不同的分割方式
+    if len(ip_num) >= 7:
+        for i in range(1, 4):            # 第一部分长度
+            for j in range(1, 4):        # 第二部分长度
+                for k in range(1, 4):    # 第三部分长度
+                    if i + j + k < len(ip_num):
+                        parts = (ip_num[:i], ip_num[i:i + j], ip_num[i + j:i + j + k], ip_num[i + j + k:])
+                        if all(int(part) <= 255 for part in parts):
+                            return '.'.join(parts)
+    
+    # 如果无法解析，返回原始值
+    return ip_str
+
+
+class DataProcessor:
+    @staticmethod
+    def select_dcn_sheet(sheet_names):
+        """自动查找 PROJETO LÓGICO sheet，找不到时使用第一个工作表"""
+        for sheet in sheet_names:
+            if 'PROJETO LÓGICO' in sheet.upper() and 'AUTOMÁTICO' not in sheet.upper():
+                return sheet
+        return sheet_names[0]
+
+    @staticmethod
+    def parse_dcn_file(file, log_container=None, header_row=None):
+        """解析DCN文件
+
+        header_row 为表头所在的Excel行号（从1开始）；未指定时先查 DCN_HEADER_PROFILES，
+        仍未命中则在前 DCN_HEADER_SCAN_ROWS 行内自动检测。
+        """
+        log_container = resolve_log(log_container)
+        if file_extension(file) not in SUPPORTED_EXTENSIONS:
+            log_container.error("❌ 不支持的文件格式", stage='parse')
+            return None
+        
+        try:
+            report = IngestReport(file.name, 'dcn')
+            with perf.timer('excel_read'):
+                df = read_table(file, report, sheet_selector=DataProcessor.select_dcn_sheet)
+            perf.count('excel_read', rows=len(df))
+            
+            with perf.timer('header_detect'):
+                # 定位表头：读取时第1行已作为列名，因此Excel第r行对应数据位置 r-2
+                if header_row is None:
+                    header_row = DCN_HEADER_PROFILES.get(report.sheet)
+                if header_row is None:
+                    position = DataProcessor.detect_dcn_header(df)
+                    source = '自动检测'
+                else:
+                    position = header_row - 2
+                    source = '固定'
+                if position is None:
+                    position = -1
+                
+                # 数据清理
+                df = DataProcessor.clean_dcn_data(df, header_row=position)
+            log_container.info(f"📑 表头位于第 {position + 2} 行（{source}）", stage='parse')
+            
+            # IP地址规范化（只在加载时执行一次）
+            with perf.timer('ip_repair'):
+                df = DataProcessor.normalize_ip_column(df)
+            perf.count('ip_repair', rows=len(df), ips_repaired=df.attrs['ip_repairs'])
+            with perf.timer('ip_pack'):
+                df = DataProcessor.pack_addresses(df)
+            with perf.timer('compact'):
+                df = DataProcessor.compact_dcn_data(df)
+            
+            df.attrs['header_row'] = position + 2
+            df.attrs['ingest_report'] = report.finish(df).as_dict()
+            log_container.info(f"⏱️ {report.summary()}", stage='parse')
+            return df
+            
+        except Exception as e:
+            log_container.error(f"❌ DCN文件解析失败: {e}", stage='parse')
+            return None
+    
+    @staticmethod
+    def detect_dcn_header(df, scan_rows=DCN_HEADER_SCAN_ROWS):
+        """在前scan_rows行中按命中的已知列名个数打分，返回表头在df中的位置
+
+        现有列名的得分不低于任何候选行时返回None（保留现有列名）。
+        """
+        known = {name.casefold() for name in DCN_HEADER_NAMES}
+        current = sum(str(col).strip().casefold() in known for col in df.columns)
+        
+        head = df.iloc[:scan_rows].reset_index(drop=True)
+        hits = head.stack().astype(str).str.strip().str.casefold().isin(known)
+        scores = hits.groupby(level=0).sum()
+        if scores.empty or scores.max() <= current:
+            return None
+        return int(scores.idxmax())
+    
+    @staticmethod
+    def clean_dcn_data(df, header_row=None):
+        """清理DCN数据
+
+        header_row 为表头在df中的位置（从0开始，-1表示保留现有列名），None时自动检测。
+        """
+        if header_row is None:
+            header_row = DataProcessor.detect_dcn_header(df)
+        
+        if header_row is not None and header_row >= 0:
+            new_columns = df.iloc[header_row]
+            df = df.iloc[header_row + 1:]
+            df.columns = [str(col).strip() for col in new_columns.values]
+        
+        # 标准化列名
+        column_mapping = {
+            'End. IP': 'IP地址',
+            'Subnet': '子网掩码', 
+            'Obs': '站点名称',
+            'Vlan': 'VLAN'
+        }
+        
+        for old_col, new_col in column_mapping.items():
+            if old_col in df.columns:
+                df = df.rename(columns={old_col: new_col})
+        
+        df = df.dropna(how='all')
+        
+        return df
+
+    @staticmethod
+    def normalize_ip_column(df):
+        """加载阶段一次性规范化IP地址列（向量化），结果直接写回'IP地址'列"""
+        df.attrs['ip_normalized'] = True
+        df.attrs['ip_repairs'] = 0
+        df.attrs['ip_repair_examples'] = []
+        if 'IP地址' not in df.columns:
+            return df
+        
+        original = df['IP地址']
+        present = original.notna()
+        text = original[present].astype(str).str.strip()
+        fixed = text.copy()
+        
+        # 已经是正常IP格式的直接保留
+        pending = ~text.str.fullmatch(IP_DOTTED_PATTERN)
+        
+        # 高优先级1: 逗号分隔的IP (如 "10,226,106,192")
+        comma = pending & text.str.fullmatch(r'\d{1,3},\d{1,3},\d{1,3},\d{1,3}')
+        if comma.any():
+            octets = text[comma].str.split(',', expand=True).astype(int)
+            valid = octets.le(255).all(axis=1)
+            valid_index = valid[valid].index
+            fixed[valid_index] = text[valid_index].str.replace(',', '.', regex=False)
+            pending[valid_index] = False
+        
+        # 高优先级2: AABBBCCCDDD格式 (如 "10226106192")
+        digits = text.str.replace('.', '', regex=False).str.replace(',', '', regex=False)
+        eleven = pending & digits.str.fullmatch(r'\d{11}')
+        if eleven.any():
+            parts = [digits[eleven].str.slice(a, b) for a, b in ((0, 2), (2, 5), (5, 8), (8, 11))]
+            valid = pd.concat([part.astype(int).le(255) for part in parts], axis=1).all(axis=1)
+            valid_index = valid[valid].index
+            fixed[valid_index] = (
+                parts[0][valid_index] + '.' + parts[1][valid_index] + '.'
+                + parts[2][valid_index] + '.' + parts[3][valid_index]
+            )
+            pending[valid_index] = False
+        
+        # 其他情况: 对去重后的值调用带缓存的逐值解析
+        if pending.any():
+            fixed[pending] = text[pending].map(
+                {value: convert_ip_format(value) for value in text[pending].unique()}
+            )
+        
+        changed = fixed != original[present].astype(str)
+        df['IP地址'] = original.where(~present, fixed)
+        df.attrs['ip_repairs'] = int(changed.sum())
+        df.attrs['ip_repair_examples'] = list(zip(
+            original[present][changed].astype(str).head(10), fixed[changed].head(10)
+        ))
+        return df
+
+    @staticmethod
+    def pack_addresses(df):
+        """把规范化后的IP地址和子网打包为整数列（IP数值、子网数值、前缀长度、网关数值），结果直接写入df"""
+        ip_column = df['IP地址'] if 'IP地址' in df.columns else pd.Series(None, index=df.index, dtype=object)
+        subnet_column = df['子网掩码'] if '子网掩码' in df.columns else pd.Series(None, index=df.index, dtype=object)
+        subnet_addresses, prefixes = parse_subnets(subnet_column)
+        df['IP数值'] = pack_ipv4(ip_column)
+        df['子网数值'] = subnet_addresses
+        df['前缀长度'] = prefixes
+        df['网关数值'] = gateway_addresses(subnet_addresses)
+        return df
+
+    @staticmethod
+    def fix_ip_addresses(df, log_container):
+        """修复IP地址格式问题 - 已在加载阶段规范化过的数据直接返回"""
+        if not df.attrs.get('ip_normalized'):
+            df = DataProcessor.normalize_ip_column(df)
+        if ADDRESS_COLUMNS[-1] not in df.columns:
+            df = DataProcessor.pack_addresses(df)
+        
+        repairs = df.attrs.get('ip_repairs', 0)
+        if repairs:
+            log_container.info(f"🔧 IP地址修复: 共 {repairs} 个", stage='ip_repair', count=repairs)
+            for original, fixed in df.attrs.get('ip_repair_examples', []):
+                log_container.info(f"   {original} → {fixed}", stage='ip_repair')
+        return df
+
+    @staticmethod
+    def compact_dcn_data(df):
+        """压缩DCN数据：只保留生成脚本用到的列，VLAN收窄，重复文本转为分类类型"""
+        if not any(col in df.columns for col in DCN_COLUMNS):
+            return compact_frame(df)
+        return compact_frame(
+            df,
+            keep_columns=DCN_COLUMNS + ADDRESS_COLUMNS,
+            category_columns=('子网掩码', '站点名称', 'VLAN'),
+            numeric_columns=('VLAN', '前缀长度'),
+        )
+
+    @staticmethod
+    def compact_datasheet_data(df):
+        """压缩Datasheet数据：只保留检测到的列，站点和设备名称转为分类类型，无线参数收窄"""
+        detected_columns = DataProcessor.auto_detect_columns(df, NullLog())
+        if 'chave' not in detected_columns:
+            return compact_frame(df)
+        return compact_frame(
+            df,
+            keep_columns=detected_columns.values(),
+            category_columns=[detected_columns[key] for key in ('site_a', 'site_b', 'device')
+                              if key in detected_columns],
+            numeric_columns=[detected_columns[key] for key in RADIO_COLUMN_TYPES
+                             if key in detected_columns],
+        )
+
+    @staticmethod
+    def datasheet_usecols(columns):
+        """根据表头确定Datasheet需要读取的列位置；找不到CHAVE列时读取全部列"""
+        detected_columns = DataProcessor.auto_detect_columns(pd.DataFrame(columns=columns), NullLog())
+        if 'chave' not in detected_columns:
+            return None
+        needed = set(detected_columns.values())
+        return [position for position, col in enumerate(columns) if col in needed]
+
+    @staticmethod
+    def parse_datasheet_file(file, log_container=None):
+        """解析Datasheet文件 - 只读取需要的列，并修复列名中的换行符"""
+        log_container = resolve_log(log_container)
+        if file_extension(file) not in SUPPORTED_EXTENSIONS:
+            log_container.error("❌ 不支持的文件格式", stage='parse')
+            return None
+        
+        try:
+            report = IngestReport(file.name, 'datasheet')
+            with perf.timer('excel_read'):
+                df = read_table(file, report, header=DATASHEET_HEADER_ROW - 1,
+                                column_selector=DataProcessor.datasheet_usecols)
+            perf.count('excel_read', rows=len(df))
+            
+            # 清理列名：移除换行符和多余空格
+            df.columns = [re.sub(r'\s*\n\s*', ' ', str(col).strip()) for col in df.columns]
+            with perf.timer('compact'):
+                df = DataProcessor.compact_datasheet_data(df)
+            
+            df.attrs['header_row'] = DATASHEET_HEADER_ROW
+            df.attrs['ingest_report'] = report.finish(df).as_dict()
+            log_container.info(f"⏱️ {report.summary()}", stage='parse')
+            return df
+            
+        except Exception as e:
+            log_container.error(f"❌ Datasheet解析失败: {e}", stage='parse')
+            return None
+    
+    @staticmethod
+    def auto_detect_columns(datasheet_data, log_container):
+        """自动检测列名 - 修复换行符问题"""
+        detected_columns = {}
+        
+        # 清理后的列名映射（移除换行符）
+        column_mapping = {
+            'chave': 'Chave',
+            'site_a': 'Site ID Estação 1', 
+            'site_b': 'Site ID Estação 2',
+            'device': 'Nome Elemento Estação 1',
+            'bandwidth': 'Largura de banda do canal (MHz)',
+            'tx_power': 'Potência TX máxima (dBm)',
+            'tx_freq': 'Frequência Central Estação 1 (MHz)',
+            'rx_freq': 'Frequência Central Estação 2 (MHz)'
+        }
+        
+        # 清理实际列名（移除换行符）
+        cleaned_columns = {}
+        for actual_col in datasheet_data.columns:
+            cleaned_col = re.sub(r'\s*\n\s*', ' ', str(actual_col).strip())
+            cleaned_columns[cleaned_col] = actual_col
+        
+        # 检查每个列是否存在（使用清理后的列名）
+        for col_type, expected_col in column_mapping.items():
+            # 清理预期列名
+            cleaned_expected = re.sub(r'\s*\n\s*', ' ', expected_col.strip())
+            
+            if cleaned_expected in cleaned_columns:
+                actual_col_name = cleaned_columns[cleaned_expected]
+                detected_columns[col_type] = actual_col_name
+                log_container.success(f"✅ 找到{col_type}列: '{actual_col_name}'", stage='columns')
+            else:
+                log_container.error(f"❌ 未找到{col_type}列: '{cleaned_expected}'", stage='columns')
+                
+                # 尝试部分匹配
+                found = False
+                for cleaned_col, actual_col in cleaned_columns.items():
+                    if any(keyword in cleaned_col for keyword in expected_col.split()[:2]):
+                        detected_columns[col_type] = actual_col
+                        log_container.warning(f"⚠️ 使用部分匹配 {col_type}: '{actual_col}'", stage='columns')
+                        found = True
+                        break
+                
+                if not found:
+                    log_container.error(f"❌ 无法匹配 {col_type} 列，请检查文件格式", stage='columns')
+        
+        return detected_columns
+    
+    @staticmethod
+    def build_chave_index(datasheet_data):
+        """为Datasheet构建CHAVE索引，未找到CHAVE列时返回None"""
+        detected_columns = DataProcessor.auto_detect_columns(datasheet_data, NullLog())
+        if 'chave' not in detected_columns:
+            return None
+        return ChaveIndex(datasheet_data[detected_columns['chave']])
+
+    @staticmethod
+    def build_site_index(dcn_data):
+        """为DCN数据构建站点名称索引"""
+        if '站点名称' in dcn_data.columns:
+            return SiteIndex(dcn_data['站点名称'])
+        return SiteIndex(pd.Series([], dtype=object, name='站点名称'))
+
+    @staticmethod
+    def site_suggestions(site_index, site):
+        """DCN中找不到站点时拼写相近的候选 [(站点名称, 编辑距离), ...]，只作提示，不自动替换"""
+        return site_index.fuzzy(site, SITE_SUGGESTION_LIMIT, max_distance=SITE_SUGGESTION_DISTANCE)
+
+    @staticmethod
+    def format_site_suggestions(site, label, candidates):
+        return (f"💡 站点{label} '{site}' 在DCN中未找到，相近的站点: "
+                + '，'.join(f"{name}（距离 {distance}）" for name, distance in candidates))
+
+    @staticmethod
+    def match_site(dcn_data, site_index, site, label, log_container):
+        """通过站点索引在DCN中查找站点（不使用模糊匹配），返回该行数据字典"""
+        with perf.timer('site_match'):
+            match = site_index.lookup(site, fuzzy=False)
+        perf.count('site_match', lookups=1, rows_matched=len(match.positions))
+        if not match.positions:
+            candidates = DataProcessor.site_suggestions(site_index, site)
+            if candidates:
+                log_container.info(DataProcessor.format_site_suggestions(site, label, candidates),
+                                   stage='site_match')
+            return None
+        
+        if match.ambiguous:
+            log_container.warning(
+                f"⚠️ 站点{label}在DCN中匹配不唯一（{match.kind}匹配 {len(match.positions)} 行）: "
+                f"{match.names[:10]}，使用第一个",
+                stage='site_match'
+            )
+        
+        site_info = dcn_data.iloc[match.positions[0]].to_dict()
+        log_container.success(f"✅ 在DCN中找到站点{label}: {match.names[0]}", stage='site_match')
+        log_container.info(f"   IP地址: {site_info.get('IP地址', '未找到')}", stage='site_match')
+        return site_info
+
+    @staticmethod
+    def log_chave_miss(chave_index, chave_number, positions, row_labels, log_container):
+        """CHAVE未找到（列出相近的CHAVE）或重复出现时记录错误"""
+        if len(positions) == 0:
+            log_container.error(f"❌ 未找到CHAVE: {chave_number}", stage='lookup')
+            # 优先显示拼写相近的CHAVE，其次是前缀相近的，都没有时显示前10个可用值
+            candidates = chave_index.fuzzy(chave_number, 5)
+            suggestions = chave_index.closest(chave_number, 10)
+            if candidates:
+                log_container.info(
+                    "💡 拼写相近的CHAVE: " + '，'.join(f"{chave}（距离 {distance}）" for chave, distance in candidates),
+                    stage='lookup'
+                )
+            elif suggestions:
+                log_container.info(f"相近的CHAVE: {suggestions}", stage='lookup')
+            else:
+                log_container.info(f"可用的CHAVE值: {chave_index.sample(10)}", stage='lookup')
+            return
+        labels = [row_labels[pos] for pos in positions]
+        log_container.error(f"❌ CHAVE重复: {chave_number} 出现在 {len(positions)} 行 {labels}", stage='lookup')
+        log_container.info("💡 请先在Datasheet中消除重复的CHAVE", stage='lookup')
+
+    @staticmethod
+    def radio_integer(value):
+        """无线参数按 int(value) 向零取整，无法转换的值（空值、文本）返回None"""
+        if isinstance(value, (int, float, np.number)):
+            number = float(value)
+        else:
+            number = pd.to_numeric(pd.Series([value], dtype=object), errors='coerce').astype('float64').iloc[0]
+        return int(number) if np.isfinite(number) else None
+
+    @staticmethod
+    def find_site_config(dcn_data, datasheet_data, chave_number, log_container,
+                         chave_index=None, site_index=None):
+        """根据CHAVE查找完整配置"""
+        if dcn_data is None or datasheet_data is None:
+            return None
+        
+        log_container.info(f"🔍 正在查找CHAVE: {chave_number}", stage='lookup')
+        
+        # 未经加载阶段规范化的DCN数据，在此补做IP地址修复；已规范化但未打包地址的只补做打包
+        if not dcn_data.attrs.get('ip_normalized'):
+            dcn_data = DataProcessor.fix_ip_addresses(dcn_data, log_container)
+        elif ADDRESS_COLUMNS[-1] not in dcn_data.columns:
+            dcn_data = DataProcessor.pack_addresses(dcn_data)
+        
+        # 自动检测列名
+        with perf.timer('columns'):
+            detected_columns = DataProcessor.auto_detect_columns(datasheet_data, log_container)
+        
+        # 检查必要列
+        required_columns = ['chave', 'site_a', 'site_b', 'device']
+        missing_columns = [col for col in required_columns if col not in detected_columns]
+        
+        if missing_columns:
+            log_container.error(f"❌ 缺少必要的列: {missing_columns}", stage='lookup')
+            log_container.info("💡 请检查Datasheet文件格式，或手动指定列名", stage='lookup')
+            return None
+        
+        # 查找匹配的CHAVE
+        chave_col = detected_columns['chave']
+        with perf.timer('lookup'):
+            if chave_index is None or chave_index.column != chave_col:
+                chave_index = ChaveIndex(datasheet_data[chave_col])
+            positions = chave_index.lookup(chave_number)
+        perf.count('lookup', lookups=1, rows_matched=len(positions))
+        
+        if len(positions) != 1:
+            DataProcessor.log_chave_miss(chave_index, chave_number, positions, datasheet_data.index, log_container)
+            return None
+        
+        match_data = datasheet_data.iloc[positions[0]]
+        log_container.success(f"✅ 找到CHAVE配置", stage='lookup')
+        
+        # 提取站点和设备信息
+        site_a = str(match_data.get(detected_columns['site_a'], '')).strip()
+        site_b = str(match_data.get(detected_columns['site_b'], '')).strip()
+        device_name = str(match_data.get(detected_columns['device'], '')).strip()
+        
+        log_container.info(f"📡 站点A: {site_a}", stage='lookup')
+        log_container.info(f"📡 站点B: {site_b}", stage='lookup')
+        log_container.info(f"🖥️  设备: {device_name}", stage='lookup')
+        
+        if not site_a or not site_b or not device_name:
+            log_container.error("❌ 缺少必要的站点或设备信息", stage='lookup')
+            return None
+        
+        # 设备名转换 NO → ZT，并修复多余连字符
+        device_name = device_name.replace('NO', 'ZT')
+        # 修复多余连字符问题：将连续的两个--替换为一个-
+        device_name = re.sub(r'-+', '-', device_name)
+        log_container.info(f"🔄 设备名转换后: {device_name}", stage='lookup')
+        
+        # 在DCN中查找站点信息（使用站点索引）
+        if site_index is None:
+            site_index = DataProcessor.build_site_index(dcn_data)
+        site_a_info = DataProcessor.match_site(dcn_data, site_index, site_a, 'A', log_container)
+        site_b_info = DataProcessor.match_site(dcn_data, site_index, site_b, 'B', log_container)
+        
+        if not site_a_info or not site_b_info:
+            log_container.warning("⚠️ 在DCN中未找到完整的站点信息，使用默认值", stage='site_match')
+        
+        # 提取无线参数
+        bandwidth = match_data.get(detected_columns.get('bandwidth'), RADIO_DEFAULTS['bandwidth'])
+        tx_power_raw = match_data.get(detected_columns.get('tx_power'), RADIO_DEFAULTS['tx_power'])  # 原始值，如22
+        tx_freq_a = match_data.get(detected_columns.get('tx_freq'), RADIO_DEFAULTS['tx_freq'])  # 站点A的发射频率
+        rx_freq_a = match_data.get(detected_columns.get('rx_freq'), RADIO_DEFAULTS['rx_freq'])  # 站点A的接收频率
+        
+        # 无法转换为整数的值（空值、文本）不生成配置，规则与全网配置表一致
+        radio_values = {
+            field: DataProcessor.radio_integer(value)
+            for field, value in zip(RADIO_COLUMN_TYPES, (bandwidth, tx_power_raw, tx_freq_a, rx_freq_a))
+        }
+        invalid = [RADIO_SCALES[field][1] for field, value in radio_values.items() if value is None]
+        if invalid:
+            log_container.error(f"❌ 无线参数无效: {'、'.join(invalid)}", stage='radio')
+            return None
+        
+        # 转换频率单位 MHz → KHz (乘以1000)
+        bandwidth_khz = radio_values['bandwidth'] * 1000
+        tx_freq_a_khz = radio_values['tx_freq'] * 1000
+        rx_freq_a_khz = radio_values['rx_freq'] * 1000
+        
+        # 修正功率值：Datasheet中的值是实际值的1/10，需要乘以10
+        tx_power_corrected = radio_values['tx_power'] * 10
+        
+        # 站点B的频率应该是站点A的相反
+        # 站点B的TX频率 = 站点A的RX频率
+        # 站点B的RX频率 = 站点A的TX频率
+        tx_freq_b_khz = rx_freq_a_khz
+        rx_freq_b_khz = tx_freq_a_khz
+        
+        log_container.info(f"📡 无线参数:", stage='radio')
+        log_container.info(f"  - 带宽: {bandwidth}MHz → {bandwidth_khz}KHz", stage='radio')
+        log_container.info(f"  - 功率: {tx_power_raw}dBm(原始) → {tx_power_corrected}dBm(修正)", stage='radio')
+        log_container.info(f"  - 站点A: TX={tx_freq_a}MHz→{tx_freq_a_khz}KHz, RX={rx_freq_a}MHz→{rx_freq_a_khz}KHz", stage='radio')
+        log_container.info(f"  - 站点B: TX={rx_freq_a}MHz→{tx_freq_b_khz}KHz, RX={tx_freq_a}MHz→{rx_freq_b_khz}KHz", stage='radio')
+        
+        # 网关和掩码取自加载时打包的整数列，子网缺失或无效时使用默认值
+        def site_gateway(site_info):
+            packed = site_info.get('网关数值', INVALID) if site_info else INVALID
+            return format_ipv4(packed) if packed >= 0 else DEFAULT_GATEWAY
+        
+        def site_mask(site_info):
+            prefix = site_info.get('前缀长度', INVALID) if site_info else INVALID
+            return format_ipv4(PREFIX_MASKS[prefix]) if prefix >= 0 else DEFAULT_MASK
+        
+        gateway_a = site_gateway(site_a_info)
+        gateway_b = site_gateway(site_b_info)
+        mask_a = site_mask(site_a_info)
+        mask_b = site_mask(site_b_info)
+        
+        # 修复站点B的设备名称生成逻辑
+        if site_a in device_name:
+            site_b_device_name = device_name.replace(site_a, site_b)
+        else:
+            # 使用标准的设备名称格式
+            site_b_device_name = f"MWE-4G-{site_b}-N1-ZT"
+        
+        # 再次修复设备名称中的多余连字符
+        site_b_device_name = re.sub(r'-+', '-', site_b_device_name)
+        
+        config = {
+            'chave_number': chave_number,
+            'site_a': {
+                'site_name': site_a,
+                'device_name': device_name,
+                'ip': site_a_info.get('IP地址') if site_a_info else DEFAULT_SITE_IPS['site_a'],
+                'vlan': site_a_info.get('VLAN') if site_a_info else DEFAULT_VLAN,
+                'gateway': gateway_a,
+                'mask': mask_a,
+                'tx_frequency': tx_freq_a_khz,
+                'rx_frequency': rx_freq_a_khz
+            },
+            'site_b': {
+                'site_name': site_b,
+                'device_name': site_b_device_name,
+                'ip': site_b_info.get('IP地址') if site_b_info else DEFAULT_SITE_IPS['site_b'],
+                'vlan': site_b_info.get('VLAN') if site_b_info else DEFAULT_VLAN,
+                'gateway': gateway_b,
+                'mask': mask_b,
+                'tx_frequency': tx_freq_b_khz,
+                'rx_frequency': rx_freq_b_khz
+            },
+            'radio_params': {
+                'bandwidth': bandwidth_khz,
+                'tx_power': tx_power_corrected,  # 使用修正后的功率值
+                'modulation': 'bpsk',
+                'operation_mode': 'G02'
+            }
+        }
+        
+        return config
+
+    @staticmethod
+    def parse_chave_list(text):
+        """解析粘贴的CHAVE列表（换行、逗号、分号或空白分隔），去重并保持顺序"""
+        chaves = []
+        seen = set()
+        for item in re.split(r'[\s,;]+', text or ''):
+            key = ChaveIndex.normalize(item)
+            if key and key not in seen:
+                seen.add(key)
+                chaves.append(item.strip())
+        return chaves
+
+    @staticmethod
+    def read_chave_csv(file):
+        """从CSV文件读取CHAVE列表：优先使用名为Chave的列，否则使用第一列"""
+        df = pd.read_csv(file, dtype=str)
+        if df.empty and len(df.columns) == 0:
+            return []
+        chave_cols = [col for col in df.columns if str(col).strip().casefold() == 'chave']
+        if chave_cols:
+            values = df[chave_cols[0]].dropna().tolist()
+        else:
+            # 没有表头时，第一行本身也是CHAVE
+            values = [df.columns[0]] + df.iloc[:, 0].dropna().tolist()
+        return DataProcessor.parse_chave_list('\n'.join(str(value) for value in values))
+
+    @staticmethod
+    def find_site_configs(dcn_data, datasheet_data, chave_numbers,
+                          chave_index=None, site_index=None, progress=None):
+        """批量查找多个CHAVE的配置，返回 [(CHAVE, config或None, 失败原因), ...]"""
+        # 索引只准备一次，所有CHAVE共用
+        if chave_index is None:
+            chave_index = DataProcessor.build_chave_index(datasheet_data)
+        if site_index is None:
+            site_index = DataProcessor.build_site_index(dcn_data)
+        
+        results = []
+        total = len(chave_numbers)
+        for done, chave_number in enumerate(chave_numbers, start=1):
+            log = EventLog()
+            config = DataProcessor.find_site_config(
+                dcn_data, datasheet_data, chave_number, log,
+                chave_index=chave_index, site_index=site_index
+            )
+            errors = log.messages('error')
+            reason = errors[0] if errors else ''
+            if config is not None and log.messages('warning'):
+                reason = log.messages('warning')[0]
+            results.append((chave_number, config, reason))
+            if progress is not None:
+                progress(done, total)
+        return results
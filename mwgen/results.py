@@ -0,0 +1,86 @@
+"""单条链路的结果缓存 - CHAVE → 配置、两端脚本和ZIP包
+
+缓存键由 (DCN数据集键, Datasheet数据集键, 规范化CHAVE, 模板版本) 组成，
+同一链路再次查看或页面重跑时直接复用，不再重复查找、渲染和打包。
+"""
+import os
+import threading
+
+from .caching import ParseCache
+from .generator import ZTEScriptGenerator
+from .indexes import ChaveIndex
+from .log import EventLog
+from .packaging import build_link_zip
+
+# 结果缓存配置（可通过环境变量调整）
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('MWGEN_RESULT_CACHE_ENTRIES', '512'))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('MWGEN_RESULT_CACHE_MB', '64')) * 1024 * 1024
+
+
+class LinkResult:
+    """单条链路的完整结果：处理日志、配置和两端脚本；ZIP包在首次需要时生成并保留"""
+
+    def __init__(self, event_log, config=None, script_a=None, script_b=None):
+        self.event_log = event_log
+        self.config = config
+        self.script_a = script_a
+        self.script_b = script_b
+        self._zip_bytes = None
+        self._lock = threading.Lock()
+
+    @property
+    def site_a_name(self):
+        return self.config['site_a']['device_name']
+
+    @property
+    def site_b_name(self):
+        return self.config['site_b']['device_name']
+
+    def zip_bytes(self):
+        """两端脚本的ZIP包（只生成一次）"""
+        with self._lock:
+            if self._zip_bytes is None:
+                self._zip_bytes = build_link_zip(self.script_a, self.script_b, self.site_a_name, self.site_b_name)
+            return self._zip_bytes
+
+    def memory_usage(self):
+        """粗略估算占用的内存（字节）"""
+        size = 512 + sum(len(message) * 4 + 64 for _, _, message, _ in self.event_log.events)
+        if self.config is not None:
+            size += 2048 + (len(self.script_a) + len(self.script_b)) * 2
+        if self._zip_bytes is not None:
+            size += len(self._zip_bytes)
+        return size
+
+
+def resolve_link(link_table, chave_number, generator=ZTEScriptGenerator):
+    """从全网配置表（LinkTable）查找CHAVE配置并渲染两端脚本，查找失败时结果只包含日志"""
+    event_log = EventLog()
+    config = link_table.find_config(chave_number, event_log)
+    if not config:
+        return LinkResult(event_log)
+    return LinkResult(
+        event_log, config,
+        generator.generate_script(config, for_site_a=True),
+        generator.generate_script(config, for_site_a=False),
+    )
+
+
+class ResultCache(ParseCache):
+    """链路结果缓存 - LRU淘汰；数据集被替换且不再被任何会话使用时可按数据集失效"""
+
+    def __init__(self, max_entries=RESULT_CACHE_MAX_ENTRIES, max_bytes=RESULT_CACHE_MAX_BYTES):
+        super().__init__(max_entries, max_bytes)
+
+    @staticmethod
+    def make_key(dcn_key, datasheet_key, chave_number, template_version):
+        """生成缓存键：(DCN数据集键, Datasheet数据集键, 规范化CHAVE, 模板版本)"""
+        return (dcn_key, datasheet_key, ChaveIndex.normalize(chave_number), template_version)
+
+    def invalidate_dataset(self, dataset_key):
+        """删除使用指定数据集的全部结果，返回删除的条目数"""
+        with self._lock:
+            stale = [key for key in self._entries if dataset_key in key[:2]]
+            for key in stale:
+                self._total_bytes -= self._entries.pop(key)[1]
+            return len(stale)
@@ -0,0 +1,194 @@
+"""设备脚本模板 - 从文件加载，预编译为静态片段和参数槽位
+
+模板语法:
+    {{ name }}、{{ site.ip }}                     参数槽位（按键逐级取值）
+    {% for port in ethernet_ports %} ... {% endfor %}   按列表重复的块，可嵌套
+
+块标签后紧跟的换行符会一并去掉，因此独占一行的标签不会在输出中留下空行。
+模板编译为生成的渲染函数：静态片段是f-string中的常量，参数槽位是取值表达式，
+重复块先展开为局部变量，因此渲染开销与手写f-string相当。
+模板按文件修改时间自动重新编译，修改模板无需重新部署代码。
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'templates')
+TEMPLATE_SUFFIX = '.tpl'
+DEFAULT_TEMPLATE = 'zte_default'
+
+# 检查模板文件是否变化的最小间隔（秒）
+RELOAD_INTERVAL = float(os.environ.get('MWGEN_TEMPLATE_RELOAD_SECONDS', '2'))
+
+_TOKEN_PATTERN = re.compile(r'\{\{\s*([\w.]+)\s*\}\}|\{%\s*(.*?)\s*%\}\n?')
+_FOR_PATTERN = re.compile(r'for\s+(\w+)\s+in\s+([\w.]+)$')
+
+# 编译后的节点: (类型, 参数1, 参数2)
+_TEXT, _SLOT, _LOOP = 0, 1, 2
+
+
+class TemplateError(ValueError):
+    """模板语法错误、模板文件缺失或渲染参数缺失"""
+
+
+def _compile(source, name):
+    """把模板源码编译为节点列表，相邻静态文本合并为一个片段"""
+    root = []
+    stack = [(None, root)]
+    position = 0
+    for match in _TOKEN_PATTERN.finditer(source):
+        nodes = stack[-1][1]
+        if match.start() > position:
+            nodes.append((_TEXT, source[position:match.start()], None))
+        position = match.end()
+
+        slot, tag = match.groups()
+        if slot is not None:
+            nodes.append((_SLOT, tuple(slot.split('.')), None))
+        elif tag == 'endfor':
+            if len(stack) == 1:
+                raise TemplateError(f"{name}: 多余的 endfor")
+            stack.pop()
+        else:
+            loop = _FOR_PATTERN.match(tag)
+            if not loop:
+                raise TemplateError(f"{name}: 无法识别的标签 {{% {tag} %}}")
+            body = []
+            nodes.append((_LOOP, (loop.group(1), tuple(loop.group(2).split('.'))), body))
+            stack.append((tag, body))
+
+    if len(stack) > 1:
+        raise TemplateError(f"{name}: {{% {stack[-1][0]} %}} 缺少 endfor")
+    if position < len(source):
+        root.append((_TEXT, source[position:], None))
+    return _merge_text(root)
+
+
+def _merge_text(nodes):
+    merged = []
+    for kind, first, second in nodes:
+        if kind == _LOOP:
+            merged.append((kind, first, _merge_text(second)))
+        elif kind == _TEXT and merged and merged[-1][0] == _TEXT:
+            merged[-1] = (_TEXT, merged[-1][1] + first, None)
+        else:
+            merged.append((kind, first, second))
+    return merged
+
+
+def _path_expr(path, loop_vars):
+    head = f'_v_{path[0]}' if path[0] in loop_vars else f'ctx["{path[0]}"]'
+    return head + ''.join(f'["{key}"]' for key in path[1:])
+
+
+def _fstring_literal(text):
+    """转义静态文本，使其可放入单引号f-string"""
+    return (text.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n')
+            .replace('\r', '\\r').replace('{', '{{').replace('}', '}}'))
+
+
+def _codegen_block(nodes, function_name, parameter, loop_vars, lines, counter, indent=0):
+    """为一个块生成函数：块内循环先展开为局部变量，再返回一个f-string"""
+    pad = '    ' * indent
+    lines.append(f'{pad}def {function_name}({parameter}):')
+    pieces = []
+    for kind, first, second in nodes:
+        if kind == _TEXT:
+            pieces.append(_fstring_literal(first))
+        elif kind == _SLOT:
+            pieces.append('{' + _path_expr(first, loop_vars) + '}')
+        else:
+            variable, path = first
+            block_id = len(counter)
+            counter.append(block_id)
+            if any(node[0] == _LOOP for node in second):
+                # 含嵌套循环的块生成为内部函数
+                body = f'_block{block_id}(_v_{variable})'
+                _codegen_block(second, f'_block{block_id}', f'_v_{variable}', loop_vars | {variable},
+                               lines, counter, indent + 1)
+            else:
+                body = _fstring(second, loop_vars | {variable})
+            lines.append(f"{pad}    _loop{block_id} = ''.join([{body} "
+                         f"for _v_{variable} in {_path_expr(path, loop_vars)}])")
+            pieces.append(f'{{_loop{block_id}}}')
+    lines.append(f"{pad}    return f'{''.join(pieces)}'")
+
+
+def _fstring(nodes, loop_vars):
+    """不含循环的节点列表直接生成为一个f-string表达式"""
+    pieces = []
+    for kind, first, _ in nodes:
+        if kind == _TEXT:
+            pieces.append(_fstring_literal(first))
+        else:
+            pieces.append('{' + _path_expr(first, loop_vars) + '}')
+    return f"f'{''.join(pieces)}'"
+
+
+def _codegen(nodes):
+    """把节点列表生成为渲染函数源码"""
+    lines = []
+    _codegen_block(nodes, '_render', 'ctx', frozenset(), lines, [])
+    return '\n'.join(lines)
+
+
+class Template:
+    """预编译模板"""
+
+    def __init__(self, source, name='<string>'):
+        self.name = name
+        self.source = source
+        # 模板版本：源码哈希，可用作结果缓存键的一部分
+        self.version = hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]
+        namespace = {'__builtins__': {}}
+        exec(compile(_codegen(_compile(source, name)), name, 'exec'), namespace)
+        self._render = namespace['_render']
+
+    def render(self, context):
+        """按上下文渲染模板"""
+        try:
+            return self._render(context)
+        except (KeyError, IndexError, TypeError) as e:
+            raise TemplateError(f"{self.name}: 渲染参数缺失或类型错误: {e!r}") from e
+
+
+def template_dirs():
+    """模板搜索路径：环境变量 MWGEN_TEMPLATE_DIR（可用路径分隔符指定多个）优先，其次是内置模板目录"""
+    extra = os.environ.get('MWGEN_TEMPLATE_DIR', '')
+    return [path for path in extra.split(os.pathsep) if path] + [TEMPLATE_DIR]
+
+
+def template_path(name):
+    """查找模板文件路径"""
+    filename = name if name.endswith(TEMPLATE_SUFFIX) else name + TEMPLATE_SUFFIX
+    for directory in template_dirs():
+        path = os.path.join(directory, filename)
+        if os.path.isfile(path):
+            return path
+    raise TemplateError(f"未找到模板: {filename}（搜索路径: {template_dirs()}）")
+
+
+_templates = {}  # 模板名 -> (文件路径, 修改时间, 上次检查时间, Template)
+_templates_lock = threading.Lock()
+
+
+def load_template(name=DEFAULT_TEMPLATE):
+    """加载并缓存编译后的模板，文件变化时自动重新编译"""
+    now = time.monotonic()
+    entry = _templates.get(name)
+    if entry is not None and now - entry[2] < RELOAD_INTERVAL:
+        return entry[3]
+
+    path = template_path(name)
+    mtime = os.stat(path).st_mtime_ns
+    with _templates_lock:
+        entry = _templates.get(name)
+        if entry is not None and entry[0] == path and entry[1] == mtime:
+            template = entry[3]
+        else:
+            with open(path, encoding='utf-8') as template_file:
+                template = Template(template_file.read(), name=os.path.basename(path))
+        _templates[name] = (path, mtime, now, template)
+    return template
@@ -0,0 +1,143 @@
+configure terminal
+
+radio-global-switch enable 
+
+!
+device-para siteId  {{ site.site_name }} 
+hostname {{ site.device_name }}
+
+!
+device-para neIpType  ipv4 
+device-para neIpv4  {{ site.ip }} 
+
+!
+nms-vlan  {{ site.vlan }} 
+interface   vlan{{ site.vlan }} 
+ip address  {{ site.ip }}  {{ site.mask }} 
+$
+
+!
+ip route 0.0.0.0 0.0.0.0  {{ site.gateway }} 
+
+!
+
+clock timezone  America/Sao_Paulo  -3 
+
+
+!
+ntp  enable 
+ntp poll-interval  8 
+ntp source ipv4  {{ site.ip }} 
+
+!
+ntp server     10.192.12.200  priority  1 
+
+ntp server     10.216.96.174  priority  2 
+
+!
+snmp-server version v3  enable 
+snmp-server  enable trap snmp 
+snmp-server trap-source  {{ site.ip }} 
+
+!
+snmp-server group   group1 v3 priv read AllView write AllView notify AllView 
+snmp-server user  zte  group1 v3 auth  md5   ZXMW.nr10 priv des56   Ztesnmp2014 
+
+snmp-server group   group1 v3 priv read AllView write AllView notify AllView 
+snmp-server user  telco_zte  group1 v3 auth  md5   Telco@zte123 priv des56   Telco@zte123 
+
+!
+snmp-server host    10.98.178.109 trap version 3 priv  zte udp-port 162 snmp 
+
+snmp-server host    10.103.67.13 trap version 3 priv  zte udp-port 162 snmp 
+
+snmp-server host    10.216.59.50 trap version 3 priv  telco_zte udp-port 162 snmp 
+
+snmp-server host    10.192.67.183 trap version 3 priv  telco_zte udp-port 162 snmp 
+
+snmp-server host    10.221.63.226 trap version 3 priv  telco_zte udp-port 162 snmp 
+
+
+radio-group xpic
+xpic  xpic-1 
+mode auto
+members
+member  tu-1/1/0/1 horizontal 
+member  tu-1/1/0/2 vertical 
+activate
+yes
+$
+$
+$
+!
+pla
+pla-group  pla-1/1/0/1 
+member  tu-1/1/0/1 
+yes
+$
+member  tu-1/1/0/2 
+yes
+$
+$
+
+{% for channel in radio_channels %}
+!
+radio-channel  {{ channel.name }} 
+bandwidth  {{ radio.bandwidth }} 
+yes
+modulation
+fixed-modulation  {{ radio.modulation }} 
+$
+tx-frequency  {{ tx_frequency }} 
+rx-frequency  {{ rx_frequency }} 
+tx-power  {{ radio.tx_power }} 
+discription  To_{{ peer_suffix }}_{{ channel.suffix }} 
+operation-mode  {{ radio.operation_mode }} 
+yes
+$
+
+{% endfor %}
+!
+!
+
+{% for channel in radio_channels %}
+antenna {{ channel.antenna }}
+tu-name {{ channel.name }}
+azimuth 256.38
+elevation -1.09
+height 19.0
+install-pol-type {{ channel.polarization }}
+manufactures ZTE
+size 0.6
+type MA06U15
+$
+
+{% endfor %}
+$
+{% for port in ethernet_ports %}
+interface  {{ port }} 
+no shutdown
+description  
+speed  speed-10G 
+$
+
+{% endfor %}
+!
+{% for port in trunk_interfaces %}
+switchvlan-configuration
+interface  {{ port }} 
+switchport mode trunk
+switchport trunk vlan  {{ site.vlan }} 
+$
+$
+
+{% endfor %}
+! 
+
+line   netconf absolute-timeout 0  
+
+line netconf   idle-timeout 0  
+
+exit 
+
+write
@@ -0,0 +1,206 @@
+"""全网数据校验 - 生成脚本前一次检查所有链路
+
+基于全网链路配置表按列检查：重复或为空的CHAVE、缺少站点或设备信息、无法转换为整数的无线参数、
+DCN中找不到的站点（将使用默认IP和VLAN，并列出拼写相近的站点）、不唯一的站点匹配、无效的IP和VLAN、
+缺失的子网（将使用默认网关），以及DCN中重复的IP、不在子网内的IP和相互重叠的子网。
+结果为按CHAVE列出错误和警告的报告表。
+"""
+import pandas as pd
+
+from . import perf
+from .network import MISSING_INFO, RADIO_SCALES, SITE_LABELS, SITES, truncate_integers
+from .processor import DEFAULT_GATEWAY, DEFAULT_SITE_IPS, DEFAULT_VLAN, RADIO_DEFAULTS
+
+LEVEL_LABELS = {'error': '错误', 'warning': '警告'}
+# 检查项 -> (级别, 说明)
+CHECKS = {
+    'missing_columns': ('error', '缺少必要列'),
+    'duplicate_chave': ('error', 'CHAVE重复'),
+    'missing_info': ('error', '缺少站点或设备'),
+    'radio_invalid': ('error', '无线参数无效'),
+    'ip_invalid': ('error', 'IP地址无效'),
+    'vlan_invalid': ('error', 'VLAN无效'),
+    'ip_duplicate': ('error', 'IP地址重复'),
+    'ip_outside_subnet': ('error', 'IP不在子网内'),
+    'empty_chave': ('warning', 'CHAVE为空'),
+    'radio_default': ('warning', '使用默认无线参数'),
+    'radio_truncated': ('warning', '无线参数被取整'),
+    'site_default': ('warning', '站点使用默认值'),
+    'site_similar': ('warning', '站点有相近名称'),
+    'site_ambiguous': ('warning', '站点匹配不唯一'),
+    'gateway_default': ('warning', '使用默认网关'),
+    'subnet_overlap': ('warning', '子网重叠'),
+}
+# 会在脚本中静默使用默认值的检查项
+DEFAULT_CHECKS = ('radio_default', 'site_default', 'gateway_default')
+ISSUE_COLUMNS = ['CHAVE', 'Excel行', 'check', '说明']
+
+
+def _issues(frame, mask, check, message):
+    """mask选中的行各生成一条问题记录，message为字符串或与frame对齐的Series"""
+    selected = frame.loc[mask]
+    if isinstance(message, pd.Series):
+        message = message[mask].to_numpy(dtype=object)
+    return pd.DataFrame({'CHAVE': selected['chave'].to_numpy(), 'Excel行': selected['excel_row'].to_numpy(),
+                         'check': check, '说明': message}, columns=ISSUE_COLUMNS)
+
+
+def _concat(parts):
+    return pd.concat([part for part in parts if not part.empty] or [pd.DataFrame(columns=ISSUE_COLUMNS)],
+                     ignore_index=True)
+
+
+class ValidationReport:
+    """校验结果：每条问题一行（CHAVE、Excel行、检查项、说明）"""
+
+    def __init__(self, issues, links):
+        self.issues = issues  # DataFrame: CHAVE, Excel行（Datasheet中的行号）, check, 说明
+        self.links = links    # 检查的链路数
+        self.levels = issues['check'].map({check: level for check, (level, _) in CHECKS.items()})
+
+    def count(self, level):
+        """指定级别（'error' / 'warning'）的问题数"""
+        return int((self.levels == level).sum())
+
+    def links_with(self, checks):
+        """存在指定检查项问题的链路数（按Excel行计）"""
+        return int(self.issues.loc[self.issues['check'].isin(checks), 'Excel行'].nunique())
+
+    def summary(self):
+        errors = self.issues[self.levels == 'error']
+        return (f"检查 {self.links} 条链路：错误 {len(errors)} 个（{errors['Excel行'].nunique()} 条链路），"
+                f"警告 {self.count('warning')} 个，使用默认值 {self.links_with(DEFAULT_CHECKS)} 条链路")
+
+    def by_check(self):
+        """按检查项汇总的问题数"""
+        counts = self.issues['check'].value_counts()
+        return pd.DataFrame([
+            {'级别': LEVEL_LABELS[level], '检查项': label, '问题数': int(counts.get(check, 0))}
+            for check, (level, label) in CHECKS.items() if counts.get(check, 0)
+        ], columns=['级别', '检查项', '问题数'])
+
+    def report(self):
+        """报告表：CHAVE、Excel行、级别、检查项、说明（先错误后警告，按行排序）"""
+        report = pd.DataFrame({
+            'CHAVE': self.issues['CHAVE'],
+            'Excel行': self.issues['Excel行'],
+            '级别': self.levels.map(LEVEL_LABELS),
+            '检查项': self.issues['check'].map({check: label for check, (_, label) in CHECKS.items()}),
+            '说明': self.issues['说明'],
+        })
+        order = self.issues.assign(_error_last=self.levels != 'error') \
+            .sort_values(['_error_last', 'Excel行'], kind='stable', na_position='first').index
+        return report.loc[order].reset_index(drop=True)
+
+    def memory_usage(self):
+        return int(self.issues.memory_usage(index=True, deep=True).sum())
+
+    def __bool__(self):
+        return not self.issues.empty
+
+
+def validate_links(link_table):
+    """对全网链路配置表做一次完整校验，返回ValidationReport"""
+    with perf.timer('validate'):
+        report = _validate(link_table)
+    perf.count('validate', links=report.links, issues=len(report.issues))
+    return report
+
+
+def _validate(link_table):
+    frame = link_table.frame
+    if link_table.missing_columns:
+        issues = pd.DataFrame([{'CHAVE': '', 'Excel行': None, 'check': 'missing_columns',
+                                '说明': f"Datasheet缺少必要的列: {link_table.missing_columns}，无法生成任何脚本"}],
+                              columns=ISSUE_COLUMNS)
+        return ValidationReport(issues, 0)
+
+    parts = []
+    for field in link_table.radio_defaults:
+        parts.append(pd.DataFrame([{
+            'CHAVE': '', 'Excel行': None, 'check': 'radio_default',
+            '说明': f"未找到{RADIO_SCALES[field][1]}列，所有链路使用默认值 {RADIO_DEFAULTS[field]}",
+        }], columns=ISSUE_COLUMNS))
+    if frame.empty:
+        # 只有表头没有数据行时不需要逐行检查
+        return ValidationReport(_concat(parts), 0)
+
+    # CHAVE：为空或重复
+    keys = frame['chave_key']
+    parts.append(_issues(frame, keys == '', 'empty_chave', "CHAVE为空，无法按CHAVE生成"))
+    occurrences = keys.map(keys.value_counts())
+    duplicated = (keys != '') & (occurrences > 1)
+    parts.append(_issues(frame, duplicated, 'duplicate_chave',
+                         "CHAVE在Datasheet中出现 " + occurrences.astype(str) + " 次，生成时会失败"))
+
+    missing_info = frame['error'] == MISSING_INFO
+    parts.append(_issues(frame, missing_info, 'missing_info', "站点A、站点B或设备名称为空"))
+
+    # 无线参数：无法转换为整数，或带小数被截断
+    for field, (_, label) in RADIO_SCALES.items():
+        if field in link_table.radio_defaults:
+            continue
+        raw = frame[f'{field}_raw']
+        numbers = pd.to_numeric(raw, errors='coerce').astype('float64')
+        values = truncate_integers(raw)
+        raw_text = raw.map(str)
+        parts.append(_issues(frame, values.isna(), 'radio_invalid',
+                             label + " '" + raw_text + "' 不是有效的数字"))
+        truncated = values.notna() & (numbers != values.astype('float64'))
+        parts.append(_issues(frame, truncated, 'radio_truncated',
+                             label + " " + raw_text + " 将按 " + values.astype(str) + " 使用"))
+
+    # 站点：未找到（默认IP/VLAN）及其相近候选、不唯一的匹配、IP/VLAN无效、子网缺失（默认网关）
+    for site in SITES:
+        label = SITE_LABELS[site]
+        names = frame[site]
+        matched = frame[f'{site}_row'] >= 0
+        checked = ~missing_info
+        parts.append(_issues(
+            frame, checked & ~matched, 'site_default',
+            f"站点{label} '" + names + f"' 在DCN中未找到，将使用默认IP {DEFAULT_SITE_IPS[site]}、"
+            f"VLAN {DEFAULT_VLAN} 和网关 {DEFAULT_GATEWAY}"
+        ))
+        suggestions = names.map({
+            name: '，'.join(f"{candidate}（距离 {distance}）" for candidate, distance in candidates)
+            for name, candidates in link_table.site_suggestions.items() if candidates
+        })
+        parts.append(_issues(
+            frame, checked & ~matched & suggestions.notna(), 'site_similar',
+            f"站点{label} '" + names + "' 在DCN中未找到，相近的站点: " + suggestions.map(str) + "，请确认站点ID"
+        ))
+        parts.append(_issues(
+            frame, checked & (frame[f'{site}_matches'] > 1), 'site_ambiguous',
+            f"站点{label} '" + names + "' 在DCN中匹配 " + frame[f'{site}_matches'].astype(str) + " 个站点，将使用第一个"
+        ))
+        ip_text = frame[f'{site}_ip'].map(str).str.strip()
+        parts.append(_issues(
+            frame, checked & matched & (frame[f'{site}_ip_packed'] < 0), 'ip_invalid',
+            f"站点{label} '" + names + "' 在DCN中的IP地址无效: " + ip_text
+        ))
+        # 地址冲突在加载后的整数列上按全表检测
+        parts.append(_issues(
+            frame, checked & matched & frame[f'{site}_duplicate_ip'], 'ip_duplicate',
+            f"站点{label} '" + names + "' 的IP " + ip_text + " 在DCN中被多行使用"
+        ))
+        parts.append(_issues(
+            frame, checked & matched & frame[f'{site}_outside_subnet'], 'ip_outside_subnet',
+            f"站点{label} '" + names + "' 的IP " + ip_text + " 不在子网 "
+            + frame[f'{site}_subnet'].map(str) + " 内"
+        ))
+        parts.append(_issues(
+            frame, checked & matched & frame[f'{site}_overlapping_subnet'], 'subnet_overlap',
+            f"站点{label} '" + names + "' 的子网 " + frame[f'{site}_subnet'].map(str) + " 与DCN中的其他子网重叠"
+        ))
+        vlan = frame[f'{site}_vlan']
+        parts.append(_issues(
+            frame, checked & matched & truncate_integers(vlan).isna(), 'vlan_invalid',
+            f"站点{label} '" + names + "' 在DCN中的VLAN无效: " + vlan.map(str)
+        ))
+        parts.append(_issues(
+            frame, checked & matched & frame[f'{site}_gateway_default'], 'gateway_default',
+            f"站点{label} '" + names + "' 的子网缺失或无法解析（" + frame[f'{site}_subnet'].map(str)
+            + f"），将使用默认网关 {DEFAULT_GATEWAY}"
+        ))
+
+    return ValidationReport(_concat(parts), len(frame))
@@ -0,0 +1,176 @@
+"""Datasheet版本比较和增量批量生成
+
+每次上传的Datasheet按CHAVE计算字段指纹（站点、设备名称、无线参数分组哈希），
+新旧版本比较得到新增、删除和修改的CHAVE；批量生成时只为受影响的CHAVE重新查找和渲染，
+其余直接复用上一次的结果。
+"""
+import pandas as pd
+
+from .indexes import ChaveIndex
+from .log import NullLog
+from .processor import DataProcessor
+
+# 参与比较的字段分组（auto_detect_columns的列类型）
+FIELD_GROUPS = {
+    'sites': ('site_a', 'site_b'),
+    'device': ('device',),
+    'radio': ('bandwidth', 'tx_power', 'tx_freq', 'rx_freq'),
+}
+GROUP_LABELS = {
+    'sites': '站点',
+    'device': '设备名称',
+    'radio': '无线参数',
+    'rows': '重复行数',
+}
+
+
+def _canonical(series):
+    """统一取值表示，避免压缩后的类型差异（int8/float32/分类）影响指纹"""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype('float64')
+    return series.astype(str).str.strip()
+
+
+class DatasheetVersion:
+    """Datasheet的一个版本：规范化CHAVE -> 每行的字段分组指纹"""
+
+    def __init__(self, fingerprints, display, digest=None):
+        self.fingerprints = fingerprints  # 规范化CHAVE -> ((分组哈希, ...), ...) 每行一个
+        self.display = display            # 规范化CHAVE -> 原始CHAVE
+        self.digest = digest              # 文件内容哈希
+
+    @classmethod
+    def from_frame(cls, datasheet_data, digest=None):
+        """为解析后的Datasheet计算指纹（按列向量化哈希）"""
+        detected_columns = DataProcessor.auto_detect_columns(datasheet_data, NullLog())
+        if 'chave' not in detected_columns:
+            return cls({}, {}, digest)
+
+        group_hashes = []
+        for field_types in FIELD_GROUPS.values():
+            columns = [detected_columns[key] for key in field_types if key in detected_columns]
+            frame = pd.DataFrame({col: _canonical(datasheet_data[col]) for col in dict.fromkeys(columns)})
+            if columns:
+                group_hashes.append(pd.util.hash_pandas_object(frame, index=False).tolist())
+            else:
+                group_hashes.append([0] * len(datasheet_data))
+
+        fingerprints, display = {}, {}
+        for position, value in enumerate(datasheet_data[detected_columns['chave']].tolist()):
+            key = ChaveIndex.normalize(value)
+            if not key:
+                continue
+            if key not in fingerprints:
+                fingerprints[key] = []
+                display[key] = str(value).strip()
+            fingerprints[key].append(tuple(hashes[position] for hashes in group_hashes))
+        return cls({key: tuple(rows) for key, rows in fingerprints.items()}, display, digest)
+
+    def memory_usage(self):
+        """粗略估算占用的内存（字节）"""
+        return sum(len(key) * 2 + 64 + len(rows) * (len(FIELD_GROUPS) * 8 + 56)
+                   for key, rows in self.fingerprints.items())
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+
+class DatasheetDiff:
+    """两个Datasheet版本之间按CHAVE的差异"""
+
+    def __init__(self, added, removed, changed, old_display, new_display):
+        self.added = added      # [规范化CHAVE, ...]
+        self.removed = removed  # [规范化CHAVE, ...]
+        self.changed = changed  # {规范化CHAVE: [变更分组, ...]}
+        self._old_display = old_display
+        self._new_display = new_display
+
+    @property
+    def affected(self):
+        """需要重新生成的CHAVE（新增、删除和修改）"""
+        return set(self.added) | set(self.removed) | set(self.changed)
+
+    def summary(self):
+        return f"新增 {len(self.added)}，删除 {len(self.removed)}，修改 {len(self.changed)}"
+
+    def report(self):
+        """变更报告表：CHAVE、变更类型、变更内容"""
+        rows = [{'CHAVE': self._new_display[key], '变更': '新增', '说明': ''} for key in self.added]
+        rows += [{'CHAVE': self._old_display[key], '变更': '删除', '说明': ''} for key in self.removed]
+        rows += [
+            {'CHAVE': self._new_display[key], '变更': '修改',
+             '说明': '、'.join(GROUP_LABELS[group] for group in groups)}
+            for key, groups in self.changed.items()
+        ]
+        return pd.DataFrame(rows, columns=['CHAVE', '变更', '说明'])
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_versions(old, new):
+    """比较两个Datasheet版本，按新版本中的CHAVE顺序列出新增和修改"""
+    added, changed = [], {}
+    for key, rows in new.fingerprints.items():
+        old_rows = old.fingerprints.get(key)
+        if old_rows is None:
+            added.append(key)
+        elif old_rows != rows:
+            if len(old_rows) != len(rows):
+                changed[key] = ['rows']
+            else:
+                changed[key] = [
+                    group for index, group in enumerate(FIELD_GROUPS)
+                    if any(old_row[index] != row[index] for old_row, row in zip(old_rows, rows))
+                ]
+    removed = [key for key in old.fingerprints if key not in new.fingerprints]
+    return DatasheetDiff(added, removed, changed, old.display, new.display)
+
+
+class RenderedBatch:
+    """一次批量生成的结果：按规范化CHAVE保存成功的渲染输出，以及生成时的数据版本和上下文"""
+
+    def __init__(self, version, context):
+        self.version = version  # DatasheetVersion
+        self.context = context  # 影响输出的其他因素，如 (DCN缓存键, 模板版本)
+        self.items = {}         # 规范化CHAVE -> (CHAVE, config, 说明, 脚本A, 脚本B)
+
+    def add(self, item):
+        if item[1] is not None:
+            self.items[ChaveIndex.normalize(item[0])] = item
+
+    def memory_usage(self):
+        """粗略估算占用的内存（字节）"""
+        return sum(2048 + (len(script_a) + len(script_b)) * 2 for _, _, _, script_a, script_b in self.items.values())
+
+
+def regenerate(chave_numbers, render, version, context, previous=None):
+    """增量批量生成：只为受影响的CHAVE调用render，其余复用previous中的结果
+
+    render(CHAVE列表) 按顺序产出 (CHAVE, config, 说明, 脚本A, 脚本B)。
+    返回 (按输入顺序产出结果的迭代器, 新的RenderedBatch, 统计)；
+    DCN或模板等上下文变化时全部重新生成。
+    """
+    chave_numbers = list(chave_numbers)
+    reusable = {}
+    if previous is not None and version is not None and previous.context == context:
+        affected = diff_versions(previous.version, version).affected
+        reusable = {key: item for key, item in previous.items.items() if key not in affected}
+
+    pending = [chave for chave in chave_numbers if ChaveIndex.normalize(chave) not in reusable]
+    batch = RenderedBatch(version, context)
+    stats = {'reused': len(chave_numbers) - len(pending), 'regenerated': len(pending)}
+
+    def merged():
+        fresh = iter(render(pending)) if pending else iter(())
+        for chave_number in chave_numbers:
+            key = ChaveIndex.normalize(chave_number)
+            if key in reusable:
+                _, config, reason, script_a, script_b = reusable[key]
+                item = (chave_number, config, reason, script_a, script_b)
+            else:
+                item = next(fresh)
+            batch.add(item)
+            yield item
+
+    return merged(), batch, stats
@@ -1,10 +1,20 @@
 import streamlit as st
 import pandas as pd
-import base64
+import json
+import os
 from datetime import datetime
-import re
-import zipfile
-import io
+
+from mwgen import perf
+from mwgen.caching import DISK_CACHE_MAX_BYTES, DatasetRegistry, DiskCache, ParseCache
+from mwgen.generator import ZTEScriptGenerator
+from mwgen.loading import load_concurrently, load_datasheet, load_dcn, make_pool
+from mwgen.network import LinkTable
+from mwgen.packaging import BatchArchive, package_rendered
+from mwgen.parallel import generate_parallel
+from mwgen.processor import DataProcessor
+from mwgen.results import ResultCache, resolve_link
+from mwgen.validation import validate_links
+from mwgen.versioning import DatasheetVersion, diff_versions, regenerate
 
 # 页面配置
 st.set_page_config(
@@ -16,671 +26,363 @@ st.set_page_config(
 st.title("📡 ZTE微波脚本生成器")
 st.markdown("**123**")
 
-class DataProcessor:
-    @staticmethod
-    def parse_dcn_file(file):
-        """解析DCN文件"""
-        try:
-            if file.name.endswith('.csv'):
-                df = pd.read_csv(file)
-            elif file.name.endswith(('.xlsx', '.xls')):
-                excel_file = pd.ExcelFile(file)
-                sheet_names = excel_file.sheet_names
-                
-                # 自动查找 PROJETO LÓGICO sheet
-                target_sheet = None
-                for sheet in sheet_names:
-                    if 'PROJETO LÓGICO' in sheet.upper() and 'AUTOMÁTICO' not in sheet.upper():
-                        target_sheet = sheet
-                        break
-                
-                if target_sheet is None:
-                    target_sheet = sheet_names[0]
-                
-                df = pd.read_excel(file, sheet_name=target_sheet)
-            else:
-                st.error("❌ 不支持的文件格式")
-                return None
-            
-            # 数据清理
-            df = DataProcessor.clean_dcn_data(df)
-            return df
-            
-        except Exception as e:
-            st.error(f"❌ DCN文件解析失败: {e}")
-            return None
-    
-    @staticmethod
-    def clean_dcn_data(df):
-        """清理DCN数据"""
-        df = df.dropna(how='all')
-        
-        # 查找数据开始的行
-        for idx, row in df.iterrows():
-            row_str = ' '.join([str(x) for x in row.values if pd.notna(x)])
-            if any(keyword in row_str for keyword in ['End. IP', '10.211.', 'IP地址']):
-                new_columns = df.iloc[idx]
-                df = df.iloc[idx + 1:]
-                df.columns = [str(col).strip() for col in new_columns.values]
-                break
-        
-        # 标准化列名
-        column_mapping = {
-            'End. IP': 'IP地址',
-            'Subnet': '子网掩码', 
-            'Obs': '站点名称',
-            'Vlan': 'VLAN'
-        }
-        
-        for old_col, new_col in column_mapping.items():
-            if old_col in df.columns:
-                df = df.rename(columns={old_col: new_col})
-        
-        df = df.dropna(how='all')
-        
-        return df
-
-    @staticmethod
-    def fix_ip_addresses(df, log_container):
-        """修复IP地址格式问题"""
-        if 'IP地址' not in df.columns:
-            return df
-        
-        def convert_ip_format(ip_value):
-            if pd.isna(ip_value):
-                return ip_value
-            
-            ip_str = str(ip_value).strip()
-            
-            # 如果已经是正常IP格式，直接返回
-            if re.match(r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$', ip_str):
-                return ip_str
-            
-            # 高优先级1: 处理逗号分隔的IP (如 "10,226,106,192")
-            if ',' in ip_str:
-                ip_parts = ip_str.split(',')
-                if len(ip_parts) == 4:
-                    # 验证每个部分是否在有效范围内
-                    if all(0 <= int(part) <= 255 for part in ip_parts):
-                        return '.'.join(ip_parts)
-            
-            # 高优先级2: 处理AABBBCCCDDD格式 (如 "10226106192")
-            ip_num = ip_str.replace('.', '').replace(',', '')
-            if ip_num.isdigit() and len(ip_num) == 11:
-                # AABBBCCCDDD 格式: AA=10, BBB=226, CCC=106, DDD=192
-                part1 = ip_num[:2]    # 10
-                part2 = ip_num[2:5]   # 226
-                part3 = ip_num[5:8]   # 106
-                part4 = ip_num[8:]    # 192
-                
-                # 验证每个部分是否在有效范围内
-                if (0 <= int(part1) <= 255 and 
-                    0 <= int(part2) <= 255 and 
-                    0 <= int(part3) <= 255 and 
-                    0 <= int(part4) <= 255):
-                    return f"{part1}.{part2}.{part3}.{part4}"
-            
-            # 其他情况: 自动智能识别
-            if ip_num.isdigit() and len(ip_num) >= 7:
-                # 尝试不同的分割方式
-                for i in range(1, 4):    # 第一部分长度
-                    for j in range(1, 4): # 第二部分长度
-                        for k in range(1, 4): # 第三部分长度
-                            if i + j + k < len(ip_num):
-                                part1 = ip_num[:i]
-                                part2 = ip_num[i:i+j]
-                                part3 = ip_num[i+j:i+j+k]
-                                part4 = ip_num[i+j+k:]
-                                
-                                # 验证每个部分是否在有效范围内
-                                if (0 <= int(part1) <= 255 and 
-                                    0 <= int(part2) <= 255 and 
-                                    0 <= int(part3) <= 255 and 
-                                    0 <= int(part4) <= 255):
-                                    return f"{part1}.{part2}.{part3}.{part4}"
-            
-            # 如果无法解析，返回原始值
-            return ip_str
-        
-        # 应用IP地址格式修复
-        original_ips = df['IP地址'].tolist()
-        df['IP地址'] = df['IP地址'].apply(convert_ip_format)
-        
-        # 在日志容器中显示修复信息
-        for i, (original, fixed) in enumerate(zip(original_ips, df['IP地址'])):
-            if original != fixed:
-                log_container.info(f"🔧 IP地址修复: {original} → {fixed}")
-        
-        return df
 
-    @staticmethod
-    def parse_datasheet_file(file):
-        """解析Datasheet文件 - 修复换行符问题"""
+LOG_PAGE_SIZE = 50
+# CHAVE输入建议的最大数量
+SUGGESTION_LIMIT = 8
+
+
+def render_event_log(event_log, key, title="📋 处理日志"):
+    """一次性渲染结构化处理日志：级别统计、按阶段汇总、分页明细和完整日志下载"""
+    counts = event_log.level_counts()
+    with st.expander(f"{title}（{len(event_log)} 条，警告 {counts['warning']}，错误 {counts['error']}）", expanded=False):
+        if not len(event_log):
+            st.caption("暂无日志")
+            return
+        
+        stage_summary = pd.DataFrame(event_log.stage_summary())
+        stage_summary = stage_summary.rename(columns={
+            'label': '阶段', 'events': '事件数', 'warnings': '警告', 'errors': '错误', 'count': '计数'
+        }).drop(columns=['stage'])
+        st.dataframe(stage_summary, hide_index=True)
+        
+        records = pd.DataFrame(event_log.records())
+        pages = max(1, -(-len(records) // LOG_PAGE_SIZE))
+        page = st.number_input("页码", min_value=1, max_value=pages, value=1, key=f"{key}_page") if pages > 1 else 1
+        start = (page - 1) * LOG_PAGE_SIZE
+        st.dataframe(records.iloc[start:start + LOG_PAGE_SIZE], hide_index=True)
+        st.caption(f"第 {page}/{pages} 页，共 {len(records)} 条")
+        
+        st.download_button(
+            "📥 下载完整日志 (JSON)",
+            data=lambda records=event_log.records(): json.dumps(records, ensure_ascii=False, indent=2),
+            file_name=f"{key}.json",
+            mime="application/json",
+            on_click="ignore",
+            key=f"{key}_download",
+        )
+
+
+@st.cache_resource
+def get_result_cache():
+    """进程级链路结果缓存 - 配置、脚本和ZIP包按数据集版本、CHAVE和模板版本复用"""
+    return ResultCache()
+
+@st.cache_resource
+def get_dataset_registry():
+    """进程级数据集注册表 - 所有会话共享同一份解析结果，并持久化到磁盘供重启后复用"""
+    disk = None
+    if DISK_CACHE_MAX_BYTES > 0:
         try:
-            if file.name.endswith('.csv'):
-                df = pd.read_csv(file, header=1)
-            elif file.name.endswith(('.xlsx', '.xls')):
-                # 先读取原始数据，处理列名中的换行符
-                df_raw = pd.read_excel(file, header=1)
-                
-                # 清理列名：移除换行符和多余空格
-                df_raw.columns = [re.sub(r'\s*\n\s*', ' ', str(col).strip()) for col in df_raw.columns]
-                
-                df = df_raw
-            else:
-                st.error("❌ 不支持的文件格式")
-                return None
-                
-            return df
-            
-        except Exception as e:
-            st.error(f"❌ Datasheet解析失败: {e}")
-            return None
-    
-    @staticmethod
-    def auto_detect_columns(datasheet_data, log_container):
-        """自动检测列名 - 修复换行符问题"""
-        detected_columns = {}
-        
-        # 清理后的列名映射（移除换行符）
-        column_mapping = {
-            'chave': 'Chave',
-            'site_a': 'Site ID Estação 1', 
-            'site_b': 'Site ID Estação 2',
-            'device': 'Nome Elemento Estação 1',
-            'bandwidth': 'Largura de banda do canal (MHz)',
-            'tx_power': 'Potência TX máxima (dBm)',
-            'tx_freq': 'Frequência Central Estação 1 (MHz)',
-            'rx_freq': 'Frequência Central Estação 2 (MHz)'
-        }
-        
-        # 清理实际列名（移除换行符）
-        cleaned_columns = {}
-        for actual_col in datasheet_data.columns:
-            cleaned_col = re.sub(r'\s*\n\s*', ' ', str(actual_col).strip())
-            cleaned_columns[cleaned_col] = actual_col
-        
-        # 检查每个列是否存在（使用清理后的列名）
-        for col_type, expected_col in column_mapping.items():
-            # 清理预期列名
-            cleaned_expected = re.sub(r'\s*\n\s*', ' ', expected_col.strip())
-            
-            if cleaned_expected in cleaned_columns:
-                actual_col_name = cleaned_columns[cleaned_expected]
-                detected_columns[col_type] = actual_col_name
-                log_container.success(f"✅ 找到{col_type}列: '{actual_col_name}'")
-            else:
-                log_container.error(f"❌ 未找到{col_type}列: '{cleaned_expected}'")
-                
-                # 尝试部分匹配
-                found = False
-                for cleaned_col, actual_col in cleaned_columns.items():
-                    if any(keyword in cleaned_col for keyword in expected_col.split()[:2]):
-                        detected_columns[col_type] = actual_col
-                        log_container.warning(f"⚠️ 使用部分匹配 {col_type}: '{actual_col}'")
-                        found = True
-                        break
-                
-                if not found:
-                    log_container.error(f"❌ 无法匹配 {col_type} 列，请检查文件格式")
-        
-        return detected_columns
-    
-    @staticmethod
-    def find_site_config(dcn_data, datasheet_data, chave_number, log_container):
-        """根据CHAVE查找完整配置"""
-        if dcn_data is None or datasheet_data is None:
-            return None
-        
-        log_container.info(f"🔍 正在查找CHAVE: {chave_number}")
-        
-        # 修复DCN数据中的IP地址格式
-        dcn_data = DataProcessor.fix_ip_addresses(dcn_data, log_container)
-        
-        # 自动检测列名
-        detected_columns = DataProcessor.auto_detect_columns(datasheet_data, log_container)
-        
-        # 检查必要列
-        required_columns = ['chave', 'site_a', 'site_b', 'device']
-        missing_columns = [col for col in required_columns if col not in detected_columns]
-        
-        if missing_columns:
-            log_container.error(f"❌ 缺少必要的列: {missing_columns}")
-            log_container.info("💡 请检查Datasheet文件格式，或手动指定列名")
-            return None
-        
-        # 查找匹配的CHAVE
-        chave_col = detected_columns['chave']
-        datasheet_data[chave_col] = datasheet_data[chave_col].astype(str).str.strip()
-        matches = datasheet_data[datasheet_data[chave_col] == chave_number.strip()]
-        
-        if len(matches) == 0:
-            log_container.error(f"❌ 未找到CHAVE: {chave_number}")
-            # 显示可用的CHAVE值
-            unique_chaves = datasheet_data[chave_col].unique()[:10]  # 只显示前10个
-            log_container.info(f"可用的CHAVE值: {list(unique_chaves)}")
-            return None
-        
-        match_data = matches.iloc[0]
-        log_container.success(f"✅ 找到CHAVE配置")
-        
-        # 提取站点和设备信息
-        site_a = str(match_data.get(detected_columns['site_a'], '')).strip()
-        site_b = str(match_data.get(detected_columns['site_b'], '')).strip()
-        device_name = str(match_data.get(detected_columns['device'], '')).strip()
-        
-        log_container.info(f"📡 站点A: {site_a}")
-        log_container.info(f"📡 站点B: {site_b}")
-        log_container.info(f"🖥️  设备: {device_name}")
-        
-        if not site_a or not site_b or not device_name:
-            log_container.error("❌ 缺少必要的站点或设备信息")
-            return None
-        
-        # 设备名转换 NO → ZT，并修复多余连字符
-        device_name = device_name.replace('NO', 'ZT')
-        # 修复多余连字符问题：将连续的两个--替换为一个-
-        device_name = re.sub(r'-+', '-', device_name)
-        log_container.info(f"🔄 设备名转换后: {device_name}")
-        
-        # 在DCN中查找站点信息
-        site_a_info = None
-        site_b_info = None
-        
-        for _, site_row in dcn_data.iterrows():
-            site_name = str(site_row.get('站点名称', '')).strip()
-            if site_a in site_name:
-                site_a_info = site_row.to_dict()
-                log_container.success(f"✅ 在DCN中找到站点A: {site_name}")
-                log_container.info(f"   IP地址: {site_a_info.get('IP地址', '未找到')}")
-            if site_b in site_name:
-                site_b_info = site_row.to_dict()
-                log_container.success(f"✅ 在DCN中找到站点B: {site_name}")
-                log_container.info(f"   IP地址: {site_b_info.get('IP地址', '未找到')}")
-        
-        if not site_a_info or not site_b_info:
-            log_container.warning("⚠️ 在DCN中未找到完整的站点信息，使用默认值")
-        
-        # 提取无线参数
-        bandwidth = match_data.get(detected_columns.get('bandwidth'), 112)
-        tx_power_raw = match_data.get(detected_columns.get('tx_power'), 22)  # 原始值，如22
-        tx_freq_a = match_data.get(detected_columns.get('tx_freq'), 14977)  # 站点A的发射频率
-        rx_freq_a = match_data.get(detected_columns.get('rx_freq'), 14577)  # 站点A的接收频率
-        
-        # 转换频率单位 MHz → KHz (乘以1000)
-        bandwidth_khz = int(bandwidth) * 1000
-        tx_freq_a_khz = int(tx_freq_a) * 1000
-        rx_freq_a_khz = int(rx_freq_a) * 1000
-        
-        # 修正功率值：Datasheet中的值是实际值的1/10，需要乘以10
-        tx_power_corrected = int(tx_power_raw) * 10
-        
-        # 站点B的频率应该是站点A的相反
-        # 站点B的TX频率 = 站点A的RX频率
-        # 站点B的RX频率 = 站点A的TX频率
-        tx_freq_b_khz = rx_freq_a_khz
-        rx_freq_b_khz = tx_freq_a_khz
-        
-        log_container.info(f"📡 无线参数:")
-        log_container.info(f"  - 带宽: {bandwidth}MHz → {bandwidth_khz}KHz")
-        log_container.info(f"  - 功率: {tx_power_raw}dBm(原始) → {tx_power_corrected}dBm(修正)")
-        log_container.info(f"  - 站点A: TX={tx_freq_a}MHz→{tx_freq_a_khz}KHz, RX={rx_freq_a}MHz→{rx_freq_a_khz}KHz")
-        log_container.info(f"  - 站点B: TX={rx_freq_a}MHz→{tx_freq_b_khz}KHz, RX={tx_freq_a}MHz→{rx_freq_b_khz}KHz")
-        
-        # 计算网关
-        def calculate_gateway(ip_with_subnet):
-            if not ip_with_subnet or '/' not in str(ip_with_subnet):
-                return '10.211.51.201'
-            network_ip = str(ip_with_subnet).split('/')[0]
-            ip_parts = network_ip.split('.')
-            return f"{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}.{int(ip_parts[3]) + 1}"
-        
-        gateway_a = calculate_gateway(site_a_info.get('子网掩码') if site_a_info else None)
-        gateway_b = calculate_gateway(site_b_info.get('子网掩码') if site_b_info else None)
-        
-        # 修复站点B的设备名称生成逻辑
-        if site_a in device_name:
-            site_b_device_name = device_name.replace(site_a, site_b)
-        else:
-            # 使用标准的设备名称格式
-            site_b_device_name = f"MWE-4G-{site_b}-N1-ZT"
-        
-        # 再次修复设备名称中的多余连字符
-        site_b_device_name = re.sub(r'-+', '-', site_b_device_name)
-        
-        config = {
-            'chave_number': chave_number,
-            'site_a': {
-                'site_name': site_a,
-                'device_name': device_name,
-                'ip': site_a_info.get('IP地址') if site_a_info else '10.211.51.202',
-                'vlan': site_a_info.get('VLAN') if site_a_info else 2929,
-                'gateway': gateway_a,
-                'tx_frequency': tx_freq_a_khz,
-                'rx_frequency': rx_freq_a_khz
-            },
-            'site_b': {
-                'site_name': site_b,
-                'device_name': site_b_device_name,
-                'ip': site_b_info.get('IP地址') if site_b_info else '10.211.51.203',
-                'vlan': site_b_info.get('VLAN') if site_b_info else 2929,
-                'gateway': gateway_b,
-                'tx_frequency': tx_freq_b_khz,
-                'rx_frequency': rx_freq_b_khz
-            },
-            'radio_params': {
-                'bandwidth': bandwidth_khz,
-                'tx_power': tx_power_corrected,  # 使用修正后的功率值
-                'modulation': 'bpsk',
-                'operation_mode': 'G02'
-            }
-        }
-        
-        return config
-
-# ZTEScriptGenerator 类保持不变
-class ZTEScriptGenerator:
-    @staticmethod
-    def generate_script(config, for_site_a=True):
-        """生成精确的ZTE脚本 - 修复频率映射问题"""
-        if for_site_a:
-            site = config['site_a']
-            peer = config['site_b']
-            site_id = site['site_name']
-            tx_frequency = site['tx_frequency']  # 使用站点A自己的TX频率
-            rx_frequency = site['rx_frequency']  # 使用站点A自己的RX频率
-        else:
-            site = config['site_b']
-            peer = config['site_a']
-            site_id = site['site_name']
-            tx_frequency = site['tx_frequency']  # 使用站点B自己的TX频率
-            rx_frequency = site['rx_frequency']  # 使用站点B自己的RX频率
-        
-        # 生成对端描述
-        peer_suffix = peer['site_name'].split('-')[-1] if '-' in peer['site_name'] else peer['site_name']
-        
-        script = f"""configure terminal
-
-radio-global-switch enable 
-
-!
-device-para siteId  {site_id} 
-hostname {site['device_name']}
-
-!
-device-para neIpType  ipv4 
-device-para neIpv4  {site['ip']} 
-
-!
-nms-vlan  {site['vlan']} 
-interface   vlan{site['vlan']} 
-ip address  {site['ip']}  255.255.255.248 
-$
-
-!
-ip route 0.0.0.0 0.0.0.0  {site['gateway']} 
-
-!
-
-clock timezone  America/Sao_Paulo  -3 
-
-
-!
-ntp  enable 
-ntp poll-interval  8 
-ntp source ipv4  {site['ip']} 
-
-!
-ntp server     10.192.12.200  priority  1 
-
-ntp server     10.216.96.174  priority  2 
-
-!
-snmp-server version v3  enable 
-snmp-server  enable trap snmp 
-snmp-server trap-source  {site['ip']} 
-
-!
-snmp-server group   group1 v3 priv read AllView write AllView notify AllView 
-snmp-server user  zte  group1 v3 auth  md5   ZXMW.nr10 priv des56   Ztesnmp2014 
-
-snmp-server group   group1 v3 priv read AllView write AllView notify AllView 
-snmp-server user  telco_zte  group1 v3 auth  md5   Telco@zte123 priv des56   Telco@zte123 
-
-!
-snmp-server host    10.98.178.109 trap version 3 priv  zte udp-port 162 snmp 
-
-snmp-server host    10.103.67.13 trap version 3 priv  zte udp-port 162 snmp 
-
-snmp-server host    10.216.59.50 trap version 3 priv  telco_zte udp-port 162 snmp 
-
-snmp-server host    10.192.67.183 trap version 3 priv  telco_zte udp-port 162 snmp 
-
-snmp-server host    10.221.63.226 trap version 3 priv  telco_zte udp-port 162 snmp 
-
-
-radio-group xpic
-xpic  xpic-1 
-mode auto
-members
-member  tu-1/1/0/1 horizontal 
-member  tu-1/1/0/2 vertical 
-activate
-yes
-$
-$
-$
-!
-pla
-pla-group  pla-1/1/0/1 
-member  tu-1/1/0/1 
-yes
-$
-member  tu-1/1/0/2 
-yes
-$
-$
-
-!
-radio-channel  radio-1/1/0/1 
-bandwidth  {config['radio_params']['bandwidth']} 
-yes
-modulation
-fixed-modulation  {config['radio_params']['modulation']} 
-$
-tx-frequency  {tx_frequency} 
-rx-frequency  {rx_frequency} 
-tx-power  {config['radio_params']['tx_power']} 
-discription  To_{peer_suffix}_H1 
-operation-mode  {config['radio_params']['operation_mode']} 
-yes
-$
-
-!
-radio-channel  radio-1/1/0/2 
-bandwidth  {config['radio_params']['bandwidth']} 
-yes
-modulation
-fixed-modulation  {config['radio_params']['modulation']} 
-$
-tx-frequency  {tx_frequency} 
-rx-frequency  {rx_frequency} 
-tx-power  {config['radio_params']['tx_power']} 
-discription  To_{peer_suffix}_V1 
-operation-mode  {config['radio_params']['operation_mode']} 
-yes
-$
-
-!
-!
-
-antenna 1
-tu-name radio-1/1/0/1
-azimuth 256.38
-elevation -1.09
-height 19.0
-install-pol-type horizontal
-manufactures ZTE
-size 0.6
-type MA06U15
-$
-
-antenna 2
-tu-name radio-1/1/0/2
-azimuth 256.38
-elevation -1.09
-height 19.0
-install-pol-type vertical
-manufactures ZTE
-size 0.6
-type MA06U15
-$
-
-$
-interface  xgei-1/1/0/5 
-no shutdown
-description  
-speed  speed-10G 
-$
-
-interface  xgei-1/1/0/6 
-no shutdown
-description  
-speed  speed-10G 
-$
-
-interface  xgei-1/1/0/7 
-no shutdown
-description  
-speed  speed-10G 
-$
-
-interface  xgei-1/1/0/8 
-no shutdown
-description  
-speed  speed-10G 
-$
-
-!
-switchvlan-configuration
-interface  pla-1/1/0/1 
-switchport mode trunk
-switchport trunk vlan  {site['vlan']} 
-$
-$
-
-switchvlan-configuration
-interface  xgei-1/1/0/5 
-switchport mode trunk
-switchport trunk vlan  {site['vlan']} 
-$
-$
-
-switchvlan-configuration
-interface  xgei-1/1/0/6 
-switchport mode trunk
-switchport trunk vlan  {site['vlan']} 
-$
-$
-
-switchvlan-configuration
-interface  xgei-1/1/0/7 
-switchport mode trunk
-switchport trunk vlan  {site['vlan']} 
-$
-$
-
-switchvlan-configuration
-interface  xgei-1/1/0/8 
-switchport mode trunk
-switchport trunk vlan  {site['vlan']} 
-$
-$
-
-! 
-
-line   netconf absolute-timeout 0  
-
-line netconf   idle-timeout 0  
-
-exit 
-
-write
-"""
-        return script
-
-def create_download_link(content, filename, text):
-    """创建下载链接"""
-    b64 = base64.b64encode(content.encode()).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}">{text}</a>'
-    return href
-
-def create_zip_download(script_a, script_b, site_a_name, site_b_name, chave_number):
-    """创建ZIP打包下载链接"""
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # 添加站点A脚本
-        zip_file.writestr(f"{site_a_name}.txt", script_a)
-        # 添加站点B脚本
-        zip_file.writestr(f"{site_b_name}.txt", script_b)
-    
-    zip_buffer.seek(0)
-    b64_zip = base64.b64encode(zip_buffer.read()).decode()
-    zip_filename = f"{chave_number}.zip"
-    
-    href = f'<a href="data:application/zip;base64,{b64_zip}" download="{zip_filename}">📦 下载ZIP包 ({zip_filename})</a>'
-    return href
-
-# 初始化会话状态
-if 'dcn_data' not in st.session_state:
-    st.session_state.dcn_data = None
-if 'datasheet_data' not in st.session_state:
-    st.session_state.datasheet_data = None
+            disk = DiskCache()
+        except OSError:
+            disk = None
+    return DatasetRegistry(disk=disk)
+
+@st.cache_resource
+def get_load_pool():
+    """进程级文件加载进程池 - DCN和Datasheet同时需要解析时并行加载"""
+    return make_pool()
+
+# 初始化会话状态（数据集只保存注册表句柄，不保存数据副本）
+if 'dcn_handle' not in st.session_state:
+    st.session_state.dcn_handle = None
+if 'datasheet_handle' not in st.session_state:
+    st.session_state.datasheet_handle = None
 if 'config' not in st.session_state:
     st.session_state.config = None
+if 'link_result' not in st.session_state:
+    st.session_state.link_result = None
+if 'chave_index_handle' not in st.session_state:
+    st.session_state.chave_index_handle = None
+if 'site_index_handle' not in st.session_state:
+    st.session_state.site_index_handle = None
+if 'batch_handle' not in st.session_state:
+    st.session_state.batch_handle = None
+if 'rendered_batch_handle' not in st.session_state:
+    st.session_state.rendered_batch_handle = None
+if 'datasheet_version_handle' not in st.session_state:
+    st.session_state.datasheet_version_handle = None
+if 'datasheet_change' not in st.session_state:
+    st.session_state.datasheet_change = None
+if 'link_table_handle' not in st.session_state:
+    st.session_state.link_table_handle = None
+if 'validation_handle' not in st.session_state:
+    st.session_state.validation_handle = None
+if 'perf_recorder' not in st.session_state:
+    st.session_state.perf_recorder = perf.PerfRecorder()
 
 # 文件上传
 st.sidebar.header("文件上传")
 
 dcn_file = st.sidebar.file_uploader("上传DCN文件", type=['xlsx', 'xls', 'csv'], key="dcn")
+dcn_header_row = st.sidebar.number_input(
+    "DCN表头所在行（0 = 自动检测）", min_value=0, max_value=10000, value=0, step=1,
+    help="已知工作簿格式时可固定表头行号，跳过自动检测"
+) or None
 datasheet_file = st.sidebar.file_uploader("上传Datasheet", type=['xlsx', 'xls', 'csv'], key="datasheet")
+perf_enabled = st.sidebar.checkbox("⏱️ 记录性能数据", value=False, help="按阶段统计耗时和计数，在页面底部查看")
+# 只在启用时记录，关闭时各计时点为空操作
+perf.activate(st.session_state.perf_recorder if perf_enabled else None)
 
 processor = DataProcessor()
 generator = ZTEScriptGenerator()
+dataset_registry = get_dataset_registry()
+result_cache = get_result_cache()
+
+# 由DCN和Datasheet计算得到的句柄，任一数据集变化时立即释放
+DERIVED_HANDLES = ('link_table_handle', 'validation_handle', 'batch_handle')
+# 上次批量的渲染结果（不含ZIP）在Datasheet修订后的增量生成中复用，只在DCN变化时释放
+RELEASED_ON_CHANGE = {
+    'dcn_handle': DERIVED_HANDLES + ('rendered_batch_handle',),
+    'datasheet_handle': DERIVED_HANDLES,
+}
+
+def release_handle(state_key):
+    """释放会话持有的句柄"""
+    handle = st.session_state[state_key]
+    st.session_state[state_key] = None
+    if handle is not None:
+        handle.release()
+
+def hold_dataset(state_key, cache_key, parse_func, persist=True):
+    """让会话持有数据集句柄（同一数据集重跑时复用已有句柄），返回共享的数据"""
+    handle = st.session_state[state_key]
+    if handle is None or handle.key != cache_key:
+        previous = handle
+        handle = dataset_registry.acquire(cache_key, parse_func, persist)
+        st.session_state[state_key] = handle
+        if previous is not None:
+            # 旧版本已无会话使用时，其链路结果一并失效
+            previous.release()
+            if dataset_registry.references(previous.key) == 0:
+                result_cache.invalidate_dataset(previous.key)
+            for derived_key in RELEASED_ON_CHANGE.get(state_key, ()):
+                release_handle(derived_key)
+    return handle.value if handle is not None else None
+
+def held_dataset(state_key):
+    """返回会话当前持有的数据集，未加载时返回None"""
+    handle = st.session_state[state_key]
+    return handle.value if handle is not None else None
+
+def show_parse_errors(parse_log):
+    """显示解析阶段的错误（解析成功的结果会被缓存，失败不缓存）"""
+    for message in parse_log.messages('error'):
+        st.error(message)
+
+def show_ingest_report(df):
+    """显示文件解析耗时和吞吐量"""
+    if 'disk_cache_seconds' in df.attrs:
+        st.caption(f"💾 从磁盘缓存加载，耗时 {df.attrs['disk_cache_seconds']:.3f} 秒")
+        return
+    report = df.attrs.get('ingest_report')
+    if report:
+        st.caption(
+            f"⏱️ 解析耗时 {report['total_seconds']:.2f} 秒（读取 {report['read_seconds']:.2f} 秒），"
+            f"{report['rows_per_second']:,.0f} 行/秒，读取 {report['columns_read']}/{report['columns_total']} 列，"
+            f"引擎 {report['engine']}"
+        )
+
+def show_memory_report(df):
+    """在数据预览中显示压缩前后的内存占用"""
+    if 'memory_after' in df.attrs:
+        before = df.attrs['memory_before'] / 1024 / 1024
+        after = df.attrs['memory_after'] / 1024 / 1024
+        saved = 1 - after / before if before else 0
+        st.caption(f"🗜️ 内存占用: {before:.2f} MB → {after:.2f} MB（节省 {saved:.0%}），"
+                   f"保留 {len(df.columns)} 列")
+
+def needs_loading(state_key, cache_key):
+    """会话未持有该数据集，且共享注册表（内存或磁盘）中也没有时才需要解析"""
+    handle = st.session_state[state_key]
+    return (handle is None or handle.key != cache_key) and not dataset_registry.contains(cache_key)
+
+def load_result(name, job):
+    """本次加载的结果；注册表在检查后淘汰了数据集时在当前进程补做"""
+    if name not in loaded:
+        func, *args = job
+        loaded[name] = func(*args)
+    return loaded[name]
+
+# 需要解析的文件同时提交到加载进程池，等待时间取较慢的一个
+load_jobs = {}
+if dcn_file:
+    dcn_key = ParseCache.make_key('dcn', dcn_file, header_row=dcn_header_row)
+    dcn_job = (load_dcn, dcn_file.getvalue(), dcn_file.name, dcn_header_row)
+    if needs_loading('dcn_handle', dcn_key):
+        load_jobs['DCN'] = dcn_job
+if datasheet_file:
+    datasheet_key = ParseCache.make_key('datasheet', datasheet_file)
+    datasheet_job = (load_datasheet, datasheet_file.getvalue(), datasheet_file.name, datasheet_key[1])
+    if needs_loading('datasheet_handle', datasheet_key):
+        load_jobs['Datasheet'] = datasheet_job
+
+loaded = {}
+if load_jobs:
+    load_progress = st.progress(0.0, text=f"⏳ 正在解析 {'、'.join(load_jobs)}…")
+
+    def on_loaded(name, done, total):
+        load_progress.progress(done / total, text=f"⏳ {name} 解析完成（{done}/{total}）")
+
+    with perf.timer('load'):
+        loaded = load_concurrently(load_jobs, get_load_pool(), on_loaded)
+    load_progress.empty()
 
 if dcn_file:
-    st.session_state.dcn_data = processor.parse_dcn_file(dcn_file)
-    if st.session_state.dcn_data is not None:
-        st.success(f"✅ DCN文件加载成功，共 {len(st.session_state.dcn_data)} 条记录")
+    dcn_data = hold_dataset('dcn_handle', dcn_key, lambda: load_result('DCN', dcn_job)['data'])
+    if 'DCN' in loaded:
+        show_parse_errors(loaded['DCN']['log'])
+    if dcn_data is not None:
+        st.success(f"✅ DCN文件加载成功，共 {len(dcn_data)} 条记录"
+                   f"（表头位于第 {dcn_data.attrs.get('header_row', 1)} 行）")
+        show_ingest_report(dcn_data)
+        if dcn_data.attrs.get('ip_repairs'):
+            st.info(f"🔧 加载时已修复 {dcn_data.attrs['ip_repairs']:,} 个IP地址格式")
+        # 站点索引随数据集缓存，仅在文件内容变化时重建
+        hold_dataset(
+            'site_index_handle', ('site_index',) + dcn_key[1:],
+            lambda: loaded['DCN']['site_index'] if 'DCN' in loaded else processor.build_site_index(dcn_data)
+        )
         # 显示DCN数据预览
         with st.expander("📊 DCN数据预览", expanded=False):
-            st.dataframe(st.session_state.dcn_data.head())
+            show_memory_report(dcn_data)
+            st.dataframe(dcn_data.head())
 
 if datasheet_file:
-    st.session_state.datasheet_data = processor.parse_datasheet_file(datasheet_file)
-    if st.session_state.datasheet_data is not None:
-        st.success(f"✅ Datasheet加载成功，共 {len(st.session_state.datasheet_data)} 条记录")
+    datasheet_data = hold_dataset(
+        'datasheet_handle', datasheet_key, lambda: load_result('Datasheet', datasheet_job)['data']
+    )
+    if 'Datasheet' in loaded:
+        show_parse_errors(loaded['Datasheet']['log'])
+    if datasheet_data is not None:
+        st.success(f"✅ Datasheet加载成功，共 {len(datasheet_data)} 条记录")
+        show_ingest_report(datasheet_data)
+        # CHAVE索引随数据集缓存，仅在文件内容变化时重建
+        hold_dataset(
+            'chave_index_handle', ('chave_index',) + datasheet_key[1:],
+            lambda: loaded['Datasheet']['chave_index'] if 'Datasheet' in loaded
+            else processor.build_chave_index(datasheet_data)
+        )
+        # 新版本与上一版本按CHAVE比较，供变更报告和增量批量生成使用
+        previous_version_handle = st.session_state.datasheet_version_handle
+        datasheet_version = hold_dataset(
+            'datasheet_version_handle', ('datasheet_version',) + datasheet_key[1:],
+            lambda: loaded['Datasheet']['version'] if 'Datasheet' in loaded
+            else DatasheetVersion.from_frame(datasheet_data, datasheet_key[1])
+        )
+        if previous_version_handle is not None and datasheet_version is not None \
+                and previous_version_handle.key != st.session_state.datasheet_version_handle.key:
+            st.session_state.datasheet_change = diff_versions(previous_version_handle.value, datasheet_version)
+        change = st.session_state.datasheet_change
+        if change is not None:
+            with st.expander(f"🔄 与上一版本相比: {change.summary()}", expanded=bool(change)):
+                if change:
+                    change_report = change.report()
+                    st.dataframe(change_report, width='stretch', hide_index=True)
+                    st.download_button(
+                        "📥 下载变更报告 (CSV)",
+                        data=lambda report=change_report: report.to_csv(index=False).encode('utf-8-sig'),
+                        file_name=f"datasheet_changes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv",
+                        on_click="ignore",
+                        key="download_datasheet_changes",
+                    )
+                else:
+                    st.caption("没有影响脚本的变更")
+        with st.expander("📊 Datasheet数据预览", expanded=False):
+            show_memory_report(datasheet_data)
+            st.dataframe(datasheet_data.head())
+
+# 当前会话持有的共享数据集（本次未上传文件时沿用之前加载的数据）
+dcn_data = held_dataset('dcn_handle')
+datasheet_data = held_dataset('datasheet_handle')
+site_index = held_dataset('site_index_handle')
+chave_index = held_dataset('chave_index_handle')
+
+def hold_link_table():
+    """会话持有当前两个数据集对应的全网配置表（按两个数据集版本缓存，首次使用时计算）"""
+    return hold_dataset(
+        'link_table_handle',
+        ('link_table', st.session_state.dcn_handle.key, st.session_state.datasheet_handle.key),
+        lambda: LinkTable.build(dcn_data, datasheet_data, chave_index, site_index)
+    )
+
+# 数据校验：一次检查全部链路，列出错误、警告和将使用默认值的链路
+if dcn_data is not None and datasheet_data is not None:
+    validation_key = ('validation', st.session_state.dcn_handle.key, st.session_state.datasheet_handle.key)
+    with st.expander("🩺 数据校验", expanded=False):
+        if st.button("检查全部链路", key="run_validation"):
+            hold_dataset('validation_handle', validation_key, lambda: validate_links(hold_link_table()))
+        validation_handle = st.session_state.validation_handle
+        if validation_handle is None or validation_handle.key != validation_key:
+            st.caption("检查重复CHAVE、缺失的站点和IP、无效的无线参数，以及会静默使用默认值的链路")
+        else:
+            validation = validation_handle.value
+            if validation.count('error'):
+                st.error(validation.summary())
+            elif validation:
+                st.warning(validation.summary())
+            else:
+                st.success(validation.summary())
+            if validation:
+                st.dataframe(validation.by_check(), hide_index=True)
+                validation_report = validation.report()
+                st.dataframe(validation_report, width='stretch', hide_index=True)
+                st.download_button(
+                    "📥 下载校验报告 (CSV)",
+                    data=lambda report=validation_report: report.to_csv(index=False).encode('utf-8-sig'),
+                    file_name=f"validation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv",
+                    on_click="ignore",
+                    key="download_validation",
+                )
 
 # CHAVE输入和脚本生成
 st.markdown("---")
-chave_number = st.text_input("输入CHAVE号码:", placeholder="例如: CODV29, 4G-CORD10")
+# 两个文件都加载完成后才能输入CHAVE
+chave_number = st.text_input(
+    "输入CHAVE号码:", placeholder="例如: CODV29, 4G-CORD10", key="chave_input",
+    disabled=dcn_data is None or datasheet_data is None,
+    help=None if dcn_data is not None and datasheet_data is not None else "请先上传DCN文件和Datasheet",
+)
 
-if chave_number and st.session_state.dcn_data is not None and st.session_state.datasheet_data is not None:
-    # 创建日志容器
-    with st.expander("📋 处理日志", expanded=False):
-        log_container = st.container()
-        
-        with log_container:
-            config = processor.find_site_config(
-                st.session_state.dcn_data, 
-                st.session_state.datasheet_data, 
-                chave_number,
-                log_container
+def use_suggestion(suggestion):
+    st.session_state.chave_input = suggestion
+
+# 输入不是完整的CHAVE时，按前缀给出建议
+if chave_number and chave_index is not None and not chave_index.lookup(chave_number):
+    suggestions = chave_index.suggest(chave_number, SUGGESTION_LIMIT)
+    suggestion_title = "💡 以此开头的CHAVE:"
+    if not suggestions:
+        # 没有前缀匹配时按拼写相近程度给出候选
+        suggestions = [chave for chave, _ in chave_index.fuzzy(chave_number, SUGGESTION_LIMIT)]
+        suggestion_title = "💡 您是否要找:"
+    if suggestions:
+        st.caption(suggestion_title)
+        suggestion_cols = st.columns(min(len(suggestions), 4))
+        for i, suggestion in enumerate(suggestions):
+            suggestion_cols[i % len(suggestion_cols)].button(
+                suggestion, key=f"suggest_{i}", on_click=use_suggestion, args=(suggestion,)
             )
+
+if chave_number and dcn_data is not None and datasheet_data is not None:
+    # 同一数据集版本、CHAVE和模板下直接复用上次的配置、脚本和ZIP包
+    result_key = ResultCache.make_key(
+        st.session_state.dcn_handle.key, st.session_state.datasheet_handle.key,
+        chave_number, generator.template_version()
+    )
+    link_result = result_cache.get_or_parse(
+        result_key,
+        lambda: resolve_link(hold_link_table(), chave_number)
+    )
+    render_event_log(link_result.event_log, key="lookup_log")
     
-    if config:
-        st.session_state.config = config
+    if not link_result.config and link_result.event_log.messages('error'):
+        st.error(link_result.event_log.messages('error')[0])
+    if link_result.config:
+        st.session_state.config = link_result.config
+        st.session_state.link_result = link_result
         st.success("🎯 配置匹配成功！")
 
 # 并排显示脚本
@@ -688,12 +390,13 @@ if hasattr(st.session_state, 'config') and st.session_state.config:
     st.markdown("---")
     st.subheader("📜 生成的配置脚本")
     
-    # 生成两个站点的脚本
-    script_a = generator.generate_script(st.session_state.config, for_site_a=True)
-    script_b = generator.generate_script(st.session_state.config, for_site_a=False)
+    # 两个站点的脚本（来自结果缓存）
+    link_result = st.session_state.link_result
+    script_a = link_result.script_a
+    script_b = link_result.script_b
     
-    site_a_name = st.session_state.config['site_a']['device_name']
-    site_b_name = st.session_state.config['site_b']['device_name']
+    site_a_name = link_result.site_a_name
+    site_b_name = link_result.site_b_name
     
     # 并排显示脚本
     col1, col2 = st.columns(2)
@@ -706,7 +409,8 @@ if hasattr(st.session_state, 'config') and st.session_state.config:
         st.info(f"功率: {st.session_state.config['radio_params']['tx_power']} dBm")
         with st.expander(f"查看 {site_a_name} 脚本", expanded=True):
             st.code(script_a, language='bash')
-        st.markdown(create_download_link(script_a, f"{site_a_name}.txt", "📥 下载脚本"), unsafe_allow_html=True)
+        st.download_button("📥 下载脚本", data=script_a, file_name=f"{site_a_name}.txt",
+                           mime="text/plain", on_click="ignore", key="download_script_a")
     
     with col2:
         st.subheader(f"📍 {site_b_name}")
@@ -716,12 +420,22 @@ if hasattr(st.session_state, 'config') and st.session_state.config:
         st.info(f"功率: {st.session_state.config['radio_params']['tx_power']} dBm")
         with st.expander(f"查看 {site_b_name} 脚本", expanded=True):
             st.code(script_b, language='bash')
-        st.markdown(create_download_link(script_b, f"{site_b_name}.txt", "📥 下载脚本"), unsafe_allow_html=True)
+        st.download_button("📥 下载脚本", data=script_b, file_name=f"{site_b_name}.txt",
+                           mime="text/plain", on_click="ignore", key="download_script_b")
     
     # ZIP打包下载
     st.markdown("---")
     st.subheader("📦 批量下载")
-    st.markdown(create_zip_download(script_a, script_b, site_a_name, site_b_name, chave_number), unsafe_allow_html=True)
+    zip_filename = f"{chave_number}.zip"
+    st.download_button(
+        f"📦 下载ZIP包 ({zip_filename})",
+        # 延迟生成：只有点击下载时才打包，之后复用同一份字节
+        data=lambda link_result=link_result: link_result.zip_bytes(),
+        file_name=zip_filename,
+        mime="application/zip",
+        on_click="ignore",
+        key="download_link_zip",
+    )
     st.info(f"ZIP包包含: {site_a_name}.txt 和 {site_b_name}.txt")
 
 # 配置详情折叠页
@@ -729,6 +443,117 @@ if hasattr(st.session_state, 'config') and st.session_state.config:
     with st.expander("🔧 配置详情", expanded=False):
         st.json(st.session_state.config)
 
+# 批量生成
+st.markdown("---")
+st.subheader("🗂️ 批量生成")
+
+batch_text = st.text_area("粘贴CHAVE列表（每行一个，或用逗号分隔）:", height=120)
+batch_csv = st.file_uploader("或上传CHAVE列表CSV", type=['csv'], key="batch_csv")
+batch_all = st.checkbox("生成Datasheet中的全部CHAVE")
+batch_workers = st.number_input("并行进程数", min_value=1, max_value=os.cpu_count() or 1, value=1,
+                                help="大批量（上千条链路）时可增加进程数")
+
+data_ready = dcn_data is not None and datasheet_data is not None
+if st.button("🚀 批量生成", disabled=not data_ready):
+    if batch_all:
+        chave_index = chave_index or processor.build_chave_index(datasheet_data)
+        batch_chaves = chave_index.all_chaves() if chave_index is not None else []
+    else:
+        batch_chaves = processor.parse_chave_list(batch_text)
+        if batch_csv is not None:
+            batch_chaves = processor.parse_chave_list(
+                '\n'.join(batch_chaves + processor.read_chave_csv(batch_csv))
+            )
+    
+    if not batch_chaves:
+        st.warning("⚠️ 请输入或上传至少一个CHAVE")
+    else:
+        progress_bar = st.progress(0.0, text=f"正在处理 {len(batch_chaves)} 个CHAVE...")
+        previous_batch = held_dataset('rendered_batch_handle')
+
+        def render_batch():
+            # 批量查找直接读全网配置表
+            link_table = hold_link_table()
+            # 与上次批量结果相比，只为Datasheet中有变化的CHAVE重新生成；DCN或模板变化时全部重新生成
+            rendered, rendered_batch, batch_stats = regenerate(
+                batch_chaves,
+                lambda pending: generate_parallel(
+                    dcn_data,
+                    datasheet_data,
+                    pending,
+                    workers=int(batch_workers),
+                    link_table=link_table,
+                ),
+                held_dataset('datasheet_version_handle'),
+                (st.session_state.dcn_handle.key, generator.template_version()),
+                previous_batch,
+            )
+            
+            def with_progress(items):
+                # 约每1%刷新一次进度条，避免逐条发送前端消息
+                step = max(1, len(batch_chaves) // 100)
+                for done, item in enumerate(items, start=1):
+                    if done % step == 0 or done == len(batch_chaves):
+                        progress_bar.progress(done / len(batch_chaves))
+                    yield item
+            
+            with perf.timer('batch'):
+                zip_bytes, summary = package_rendered(with_progress(rendered))
+            perf.count('batch', chaves=len(batch_chaves))
+            return BatchArchive(zip_bytes, summary, batch_stats, rendered_batch,
+                                f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip")
+        
+        # 批量结果放在共享注册表中（只在内存中），会话只持有句柄；同一批量在各会话间复用
+        batch_key = BatchArchive.make_key(st.session_state.dcn_handle.key, st.session_state.datasheet_handle.key,
+                                          generator.template_version(), batch_chaves)
+        batch_archive = hold_dataset('batch_handle', batch_key, render_batch, persist=False)
+        # 渲染结果另外持有，Datasheet更新后ZIP随批量句柄释放，渲染结果留待下次增量生成
+        if batch_archive is not None:
+            hold_dataset('rendered_batch_handle', ('rendered',) + batch_key[1:],
+                         lambda: batch_archive.rendered, persist=False)
+        progress_bar.empty()
+
+batch_archive = held_dataset('batch_handle')
+if batch_archive is not None:
+    summary = batch_archive.summary
+    succeeded = int((summary['状态'] == '✅ 成功').sum())
+    st.success(f"🎯 批量生成完成: 成功 {succeeded} 个，失败 {len(summary) - succeeded} 个")
+    if batch_archive.stats['reused']:
+        st.caption(f"♻️ 复用上次结果 {batch_archive.stats['reused']} 个，"
+                   f"重新生成 {batch_archive.stats['regenerated']} 个")
+    st.dataframe(summary, width='stretch')
+    st.download_button(
+        f"📦 下载批量ZIP包 ({batch_archive.filename})",
+        data=lambda archive=batch_archive: archive.zip_bytes,
+        file_name=batch_archive.filename,
+        mime="application/zip",
+        on_click="ignore",
+        key="download_batch_zip",
+    )
+
+# 性能面板
+if perf_enabled:
+    perf_recorder = st.session_state.perf_recorder
+    with st.expander("⏱️ 性能", expanded=False):
+        if len(perf_recorder) == 0:
+            st.caption("暂无数据：上传文件、查找CHAVE或批量生成后显示各阶段耗时")
+        else:
+            st.dataframe(pd.DataFrame(perf_recorder.rows()), width='stretch', hide_index=True)
+            perf_col1, perf_col2 = st.columns(2)
+            with perf_col1:
+                st.download_button(
+                    "📥 导出性能数据 (JSON)",
+                    data=lambda: json.dumps(perf_recorder.as_dict(), ensure_ascii=False, indent=2),
+                    file_name=f"perf_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                    mime="application/json",
+                    on_click="ignore",
+                    key="perf_download",
+                )
+            with perf_col2:
+                if st.button("🧹 清空性能数据", key="perf_reset"):
+                    perf_recorder.reset()
+                    st.rerun()
+
 st.sidebar.markdown("---")
 st.sidebar.info("""
 **工具特性:**
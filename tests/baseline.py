@@ -0,0 +1,90 @@
+"""旧版 DataProcessor.find_site_config 的配置规则（去掉日志），作为新实现逐字节比对的基准
+
+站点按子串逐行匹配DCN的'站点名称'，多行匹配时最后一行生效；网关为子网地址最后一段加1；
+无线参数直接int()转换。配置中没有掩码，脚本中的掩码固定为 255.255.255.248。
+"""
+import re
+
+COLUMNS = {
+    'chave': 'Chave',
+    'site_a': 'Site ID Estação 1',
+    'site_b': 'Site ID Estação 2',
+    'device': 'Nome Elemento Estação 1',
+    'bandwidth': 'Largura de banda do canal (MHz)',
+    'tx_power': 'Potência TX máxima (dBm)',
+    'tx_freq': 'Frequência Central Estação 1 (MHz)',
+    'rx_freq': 'Frequência Central Estação 2 (MHz)',
+}
+
+
+def calculate_gateway(ip_with_subnet):
+    if not ip_with_subnet or '/' not in str(ip_with_subnet):
+        return '10.211.51.201'
+    network_ip = str(ip_with_subnet).split('/')[0]
+    ip_parts = network_ip.split('.')
+    return f"{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}.{int(ip_parts[3]) + 1}"
+
+
+def find_site_config(dcn_data, datasheet_data, chave_number):
+    chaves = datasheet_data[COLUMNS['chave']].astype(str).str.strip()
+    matches = datasheet_data[chaves == chave_number.strip()]
+    if len(matches) == 0:
+        return None
+    match_data = matches.iloc[0]
+
+    site_a = str(match_data.get(COLUMNS['site_a'], '')).strip()
+    site_b = str(match_data.get(COLUMNS['site_b'], '')).strip()
+    device_name = str(match_data.get(COLUMNS['device'], '')).strip()
+    if not site_a or not site_b or not device_name:
+        return None
+    device_name = re.sub(r'-+', '-', device_name.replace('NO', 'ZT'))
+
+    site_a_info = None
+    site_b_info = None
+    for _, site_row in dcn_data.iterrows():
+        site_name = str(site_row.get('站点名称', '')).strip()
+        if site_a in site_name:
+            site_a_info = site_row.to_dict()
+        if site_b in site_name:
+            site_b_info = site_row.to_dict()
+
+    bandwidth = match_data.get(COLUMNS['bandwidth'], 112)
+    tx_power_raw = match_data.get(COLUMNS['tx_power'], 22)
+    tx_freq_a = match_data.get(COLUMNS['tx_freq'], 14977)
+    rx_freq_a = match_data.get(COLUMNS['rx_freq'], 14577)
+    tx_freq_a_khz = int(tx_freq_a) * 1000
+    rx_freq_a_khz = int(rx_freq_a) * 1000
+
+    if site_a in device_name:
+        site_b_device_name = device_name.replace(site_a, site_b)
+    else:
+        site_b_device_name = f"MWE-4G-{site_b}-N1-ZT"
+    site_b_device_name = re.sub(r'-+', '-', site_b_device_name)
+
+    return {
+        'chave_number': chave_number,
+        'site_a': {
+            'site_name': site_a,
+            'device_name': device_name,
+            'ip': site_a_info.get('IP地址') if site_a_info else '10.211.51.202',
+            'vlan': site_a_info.get('VLAN') if site_a_info else 2929,
+            'gateway': calculate_gateway(site_a_info.get('子网掩码') if site_a_info else None),
+            'tx_frequency': tx_freq_a_khz,
+            'rx_frequency': rx_freq_a_khz,
+        },
+        'site_b': {
+            'site_name': site_b,
+            'device_name': site_b_device_name,
+            'ip': site_b_info.get('IP地址') if site_b_info else '10.211.51.203',
+            'vlan': site_b_info.get('VLAN') if site_b_info else 2929,
+            'gateway': calculate_gateway(site_b_info.get('子网掩码') if site_b_info else None),
+            'tx_frequency': rx_freq_a_khz,
+            'rx_frequency': tx_freq_a_khz,
+        },
+        'radio_params': {
+            'bandwidth': int(bandwidth) * 1000,
+            'tx_power': int(tx_power_raw) * 10,
+            'modulation': 'bpsk',
+            'operation_mode': 'G02',
+        },
+    }
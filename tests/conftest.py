@@ -0,0 +1,26 @@
+"""测试共用的工作簿解析（数据来自 benchmarks/synthetic.py）"""
+import pytest
+
+from benchmarks.synthetic import datasheet_rows, dcn_rows, to_file
+from mwgen.log import NullLog
+from mwgen.processor import DataProcessor
+
+
+def parse_rows(dcn_rows, datasheet_rows):
+    """把DCN和Datasheet的行写成xlsx再按正式流程解析，返回 (dcn_data, datasheet_data)"""
+    dcn = DataProcessor.parse_dcn_file(to_file(dcn_rows, 'dcn.xlsx', sheet_name='PROJETO LÓGICO'), NullLog())
+    datasheet = DataProcessor.parse_datasheet_file(to_file(datasheet_rows, 'datasheet.xlsx'), NullLog())
+    return dcn, datasheet
+
+
+@pytest.fixture
+def workbooks():
+    return parse_rows
+
+
+@pytest.fixture(scope='session')
+def synthetic():
+    """120条链路的合成数据，其中一条链路的站点ID拼写错误"""
+    datasheet = datasheet_rows(120, 120)
+    datasheet[5][3] = 'S0000O7'
+    return parse_rows(dcn_rows(120), datasheet)
@@ -0,0 +1,118 @@
+"""IPv4整数模型: 与逐条字符串处理（旧版规则、ipaddress模块）的结果一致"""
+import ipaddress
+import random
+
+import numpy as np
+import pytest
+
+import baseline
+from benchmarks.synthetic import datasheet_rows, dcn_rows
+from mwgen.addressing import (INVALID, PREFIX_MASKS, address_conflicts, gateway_addresses, pack_ipv4,
+                              parse_subnets, unpack_ipv4)
+from mwgen.log import NullLog
+from mwgen.network import LinkTable
+from mwgen.processor import ADDRESS_COLUMNS, DataProcessor
+
+
+def random_addresses(rng, n):
+    return ['.'.join(str(rng.randrange(256)) for _ in range(4)) for _ in range(n)]
+
+
+def test_pack_round_trip():
+    addresses = random_addresses(random.Random(0), 200) + ['0.0.0.0', '255.255.255.255']
+    packed = pack_ipv4(addresses)
+    assert [int(ipaddress.IPv4Address(address)) for address in addresses] == packed.tolist()
+    assert unpack_ipv4(packed).tolist() == addresses
+
+
+@pytest.mark.parametrize('value', ['10.0.0.256', '10.0.0', '', None, 'abc', '10.0.0.1.5'])
+def test_pack_invalid(value):
+    assert pack_ipv4([value])[0] == INVALID
+    assert unpack_ipv4(pack_ipv4([value]))[0] is None
+
+
+def test_parse_subnets():
+    addresses, prefixes = parse_subnets(['10.0.0.8/29', '10.0.0.8 / 255.255.255.252', '10.0.0.8/255.0.255.0',
+                                         '10.0.0.8/33', '10.0.0.8', '10.0.0.8/0.0.0.0'])
+    assert prefixes.tolist() == [29, 30, INVALID, INVALID, INVALID, 0]
+    assert addresses.tolist()[:2] == [int(ipaddress.IPv4Address('10.0.0.8'))] * 2
+    assert addresses.tolist()[2:5] == [INVALID] * 3
+
+
+def test_mask_prefix_matches_bit_count():
+    rng = random.Random(1)
+    masks = [int(PREFIX_MASKS[rng.randrange(33)]) for _ in range(100)] + [rng.getrandbits(32) for _ in range(100)]
+    values = [f"10.0.0.0/{ipaddress.IPv4Address(mask)}" for mask in masks]
+    _, prefixes = parse_subnets(values)
+    for mask, prefix in zip(masks, prefixes.tolist()):
+        ones = bin(mask).count('1')
+        contiguous = mask == (0xFFFFFFFF << (32 - ones)) & 0xFFFFFFFF
+        assert prefix == (ones if contiguous else INVALID)
+
+
+def test_gateway_matches_baseline():
+    subnets = random_addresses(random.Random(2), 200)
+    gateways = unpack_ipv4(gateway_addresses(pack_ipv4(subnets)))
+    for subnet, gateway in zip(subnets, gateways):
+        if subnet.endswith('.255'):
+            assert gateway is None
+        else:
+            assert gateway == baseline.calculate_gateway(f"{subnet}/29")
+
+
+def test_address_conflicts_match_ipaddress():
+    rng = random.Random(3)
+    addresses, networks = [], []
+    for _ in range(300):
+        prefix = rng.choice((24, 28, 29, 29, 29, 30, 30))
+        network = ipaddress.IPv4Network((f"10.0.{rng.randrange(64)}.{rng.randrange(256)}", prefix), strict=False)
+        host = network.network_address + rng.randrange(network.num_addresses)
+        if rng.random() < 0.1:
+            host = ipaddress.IPv4Address(rng.getrandbits(32))
+        elif addresses and rng.random() < 0.1:
+            host, network = addresses[-1], networks[-1]
+        addresses.append(str(host))
+        networks.append(network)
+    subnets = [str(network) for network in networks]
+    packed = pack_ipv4(addresses)
+    subnet_addresses, prefixes = parse_subnets(subnets)
+    conflicts = address_conflicts(packed, subnet_addresses, prefixes)
+    assert all(0 < flags.sum() < len(flags) for flags in conflicts.values())
+
+    for i, (address, network) in enumerate(zip(addresses, networks)):
+        assert conflicts['duplicate_ip'][i] == (addresses.count(address) > 1)
+        assert conflicts['outside_subnet'][i] == (ipaddress.IPv4Address(address) not in network)
+        assert conflicts['overlapping_subnet'][i] == any(
+            other != network and other.overlaps(network) for other in networks)
+
+
+def test_address_conflicts_ignore_invalid():
+    conflicts = address_conflicts(np.array([INVALID, INVALID]), np.array([INVALID, INVALID]), np.array([29, 29]))
+    assert not any(flags.any() for flags in conflicts.values())
+
+
+def test_mask_from_dcn_subnet(workbooks):
+    dcn = dcn_rows(2)
+    dcn[3][2] = dcn[3][2].replace('/29', '/30')
+    dcn[4][2] = dcn[4][2].replace('/29', '/255.255.255.240')
+    rows = datasheet_rows(1, 2)
+    rows[2][2], rows[2][3] = 'S000000', 'S000001'
+    table = LinkTable.build(*workbooks(dcn, rows))
+    _, config, _ = table.result('CH000000')
+    assert config['site_a']['mask'] == '255.255.255.252'
+    assert config['site_b']['mask'] == '255.255.255.240'
+
+
+def test_unpacked_dcn_is_packed_on_lookup(synthetic):
+    """已规范化但缺少整数地址列的DCN（如库调用方自行构造的）仍按子网计算网关和掩码"""
+    dcn, datasheet = synthetic
+    def unpacked():
+        frame = dcn.drop(columns=list(ADDRESS_COLUMNS))
+        assert frame.attrs.get('ip_normalized')
+        return frame
+
+    table = LinkTable.build(unpacked(), datasheet)
+    for chave in datasheet['Chave'][:10]:
+        expected = DataProcessor.find_site_config(dcn, datasheet, chave, NullLog())
+        assert DataProcessor.find_site_config(unpacked(), datasheet, chave, NullLog()) == expected
+        assert table.result(chave)[1] == expected
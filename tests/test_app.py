@@ -0,0 +1,69 @@
+"""页面会话状态: 数据集更新后不再显示由旧数据计算的结果"""
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import datasheet_rows, dcn_rows, to_file
+
+RUN_TIMEOUT = 120
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # 不写磁盘缓存；注册表等进程级资源每个测试重新创建
+    monkeypatch.setattr('mwgen.caching.DISK_CACHE_MAX_BYTES', 0)
+    st.cache_resource.clear()
+    at = AppTest.from_file('../streamlit_app.py', default_timeout=RUN_TIMEOUT)
+    at.run()
+    yield at
+    st.cache_resource.clear()
+
+
+def upload(at, label, rows, name, sheet_name='Sheet1'):
+    uploader = next(u for u in at.sidebar.get('file_uploader') if u.label == label)
+    uploader.clear().upload(name, to_file(rows, name, sheet_name).getvalue())
+    at.run()
+    assert not at.exception
+
+
+def run_batch(at):
+    next(c for c in at.checkbox if c.label == "生成Datasheet中的全部CHAVE").check()
+    next(b for b in at.button if b.label == "🚀 批量生成").click()
+    at.run()
+    assert not at.exception
+    return at.session_state['batch_handle'].value
+
+
+def batch_shown(at):
+    return any(message.value.startswith("批量生成完成") for message in at.success)
+
+
+def test_reupload_releases_derived_handles(app):
+    upload(app, "上传DCN文件", dcn_rows(20), 'dcn.xlsx', sheet_name='PROJETO LÓGICO')
+    rows = datasheet_rows(20, 20)
+    upload(app, "上传Datasheet", rows, 'datasheet.xlsx')
+    next(b for b in app.button if b.label == "检查全部链路").click()
+    app.run()
+    first = run_batch(app)
+    assert first.stats['regenerated'] == 20
+    assert app.session_state['link_table_handle'] is not None
+    assert app.session_state['validation_handle'] is not None
+    assert batch_shown(app)
+
+    # Datasheet修订：旧的批量结果不再显示，渲染结果保留用于增量生成
+    rows[2][7] = 56 if rows[2][7] != 56 else 28
+    upload(app, "上传Datasheet", rows, 'datasheet_v2.xlsx')
+    for state_key in ('link_table_handle', 'validation_handle', 'batch_handle'):
+        assert app.session_state[state_key] is None
+    assert app.session_state['rendered_batch_handle'] is not None
+    assert not batch_shown(app)
+    assert not any("批量ZIP包" in button.label for button in app.get('download_button'))
+
+    second = run_batch(app)
+    assert second.stats == {'reused': 19, 'regenerated': 1}
+    assert batch_shown(app)
+
+    # DCN更新：渲染结果无法复用，一并释放
+    upload(app, "上传DCN文件", dcn_rows(21), 'dcn_v2.xlsx', sheet_name='PROJETO LÓGICO')
+    assert app.session_state['batch_handle'] is None
+    assert app.session_state['rendered_batch_handle'] is None
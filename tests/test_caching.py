@@ -0,0 +1,87 @@
+"""数据集注册表: 按会话引用计数，被引用的条目不会被淘汰"""
+import gc
+
+from mwgen.caching import DatasetRegistry, DiskCache
+
+
+class Dataset:
+    def __init__(self, name):
+        self.name = name
+
+
+def parser(name, calls=None):
+    def parse():
+        if calls is not None:
+            calls.append(name)
+        return Dataset(name)
+    return parse
+
+
+def test_acquire_shares_value():
+    registry = DatasetRegistry()
+    calls = []
+    first = registry.acquire('a', parser('a', calls))
+    second = registry.acquire('a', parser('a', calls))
+    assert first.value is second.value
+    assert calls == ['a']
+    assert registry.references('a') == 2
+
+
+def test_release_is_idempotent():
+    registry = DatasetRegistry()
+    first = registry.acquire('a', parser('a'))
+    second = registry.acquire('a', parser('a'))
+    first.release()
+    first.release()
+    assert registry.references('a') == 1
+    second.release()
+    assert registry.references('a') == 0
+
+
+def test_collected_handle_releases_reference():
+    registry = DatasetRegistry()
+    handle = registry.acquire('a', parser('a'))
+    kept = registry.acquire('a', parser('a'))
+    del handle
+    gc.collect()
+    assert registry.references('a') == 1
+    assert kept.value.name == 'a'
+
+
+def test_failed_parse_holds_no_reference():
+    registry = DatasetRegistry()
+    assert registry.acquire('a', lambda: None) is None
+    assert registry.references('a') == 0
+
+
+def test_eviction_skips_referenced_entries():
+    registry = DatasetRegistry(max_entries=2)
+    handles = {name: registry.acquire(name, parser(name)) for name in 'abcd'}
+    # 全部被引用时超出上限也不淘汰
+    assert registry.stats()['entries'] == 4
+    assert registry.stats()['referenced'] == 4
+
+    del handles['a'], handles['c']
+    gc.collect()
+    assert registry.references('a') == 0
+    assert not registry.contains('a') and not registry.contains('c')
+    assert registry.contains('b') and registry.contains('d')
+    stats = registry.stats()
+    assert (stats['entries'], stats['referenced'], stats['handles']) == (2, 2, 2)
+
+
+def test_unreferenced_entries_evicted_in_lru_order():
+    registry = DatasetRegistry(max_entries=2)
+    for name in 'abc':
+        registry.acquire(name, parser(name)).release()
+    assert not registry.contains('a')
+    assert registry.contains('b') and registry.contains('c')
+
+
+def test_memory_only_entries_skip_disk(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    registry = DatasetRegistry(disk=disk)
+    registry.acquire('kept', parser('kept')).release()
+    registry.acquire('batch', parser('batch'), persist=False).release()
+    assert disk.contains('kept')
+    assert not disk.contains('batch')
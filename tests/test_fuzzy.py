@@ -0,0 +1,53 @@
+"""模糊索引: 拼写相近的站点只作提示，不能替换为DCN中的站点"""
+import pandas as pd
+
+from benchmarks.synthetic import datasheet_rows, dcn_rows
+from mwgen.indexes import ChaveIndex, SiteIndex, edit_distance
+from mwgen.log import EventLog
+from mwgen.network import LinkTable
+from mwgen.processor import DEFAULT_SITE_IPS, DataProcessor
+from mwgen.validation import validate_links
+
+SITE_A, SITE_B = 2, 3  # synthetic.datasheet_rows 中前两行是横幅和表头
+
+
+def test_edit_distance():
+    assert edit_distance('kitten', 'sitting', 5) == 3
+    assert edit_distance('CODV29', 'CODV29', 2) == 0
+    # 超过上限时只返回上限+1
+    assert edit_distance('abc', 'xyzuvw', 2) == 3
+
+
+def test_site_lookup_is_exact_and_fuzzy_only_suggests():
+    index = SiteIndex(pd.Series(['MW-SPABC01', 'MW-SPOLD33', 'RAN-XYZ77']))
+    assert index.lookup('SPABC01').positions == [0]
+    assert index.lookup('XYZ7').positions == [2]
+    assert index.lookup('SPABC09').positions == []
+    assert ('MW-SPABC01', 1) in index.fuzzy('SPABC09')
+
+
+def test_chave_index():
+    index = ChaveIndex(pd.Series(['CODV29', 'CODV30', ' codv31 ']))
+    assert list(index.lookup('CODV29')) == [0]
+    assert list(index.lookup('codv31')) == [2]
+    assert len(index.lookup('CODX99')) == 0
+    assert index.fuzzy('CODW29')[0] == ('CODV29', 1)
+
+
+def test_similar_site_names_fall_back_to_defaults(workbooks):
+    rows = datasheet_rows(3, 3)
+    rows[2][SITE_A] = 'S000009'  # 与 S000000 仅差一个字符
+    rows[2][SITE_B] = '000001'   # 是 S000001 的子串，与旧版一样按子串匹配
+    dcn, datasheet = workbooks(dcn_rows(3), rows)
+    chave = rows[2][0]
+
+    log = EventLog()
+    config = DataProcessor.find_site_config(dcn, datasheet, chave, log)
+    assert config['site_a']['ip'] == DEFAULT_SITE_IPS['site_a']
+    assert config['site_b']['ip'] == dcn.loc[dcn['站点名称'].str.contains('S000001'), 'IP地址'].iloc[0]
+    assert any("相近的站点" in message for message in log.messages('info'))
+
+    table = LinkTable.build(dcn, datasheet)
+    assert table.result(chave)[1] == config
+    checks = set(validate_links(table).issues['check'])
+    assert {'site_default', 'site_similar'} <= checks
@@ -0,0 +1,98 @@
+"""全网配置表（LinkTable）: 配置和脚本必须与旧版逐行查找逐字节一致"""
+import numpy as np
+import pytest
+
+import baseline
+from benchmarks.bench_template import legacy_generate_script
+from benchmarks.synthetic import datasheet_rows, dcn_rows
+from mwgen.generator import ZTEScriptGenerator
+from mwgen.log import EventLog
+from mwgen.network import LinkTable
+from mwgen.processor import DataProcessor
+from mwgen.results import resolve_link
+from mwgen.validation import validate_links
+
+BANDWIDTH = 'Largura de banda do canal (MHz)'
+
+
+def without_mask(config):
+    return {key: {k: v for k, v in value.items() if k != 'mask'} if isinstance(value, dict) else value
+            for key, value in config.items()}
+
+
+@pytest.fixture(scope='module')
+def table(synthetic):
+    return LinkTable.build(*synthetic)
+
+
+def test_matches_baseline(synthetic, table):
+    dcn, datasheet = synthetic
+    for chave in datasheet['Chave']:
+        expected = baseline.find_site_config(dcn, datasheet, chave)
+        _, config, _ = table.result(chave)
+        assert without_mask(config) == expected
+        for for_site_a in (True, False):
+            assert ZTEScriptGenerator.generate_script(config, for_site_a) == \
+                legacy_generate_script(expected, for_site_a)
+
+
+def test_ambiguous_site_is_reported(workbooks):
+    """站点在DCN中出现多次时使用第一行并给出警告（旧版静默使用最后一行）"""
+    dcn = dcn_rows(3)
+    duplicate = list(dcn[3])
+    duplicate[1] = '10.226.250.2'
+    dcn.append(duplicate)
+    rows = datasheet_rows(1, 3)
+    rows[2][2] = 'S000000'
+    dcn, datasheet = workbooks(dcn, rows)
+    table = LinkTable.build(dcn, datasheet)
+
+    log = EventLog()
+    config = table.find_config('CH000000', log)
+    assert config['site_a']['ip'] == '10.226.100.2'
+    assert any("匹配不唯一" in message for message in log.messages('warning'))
+    assert 'site_ambiguous' in set(validate_links(table).issues['check'])
+
+
+def test_find_config_matches_find_site_config(synthetic, table):
+    dcn, datasheet = synthetic
+    for chave in list(datasheet['Chave'][:20]) + ['CH999999']:
+        expected_log, log = EventLog(), EventLog()
+        expected = DataProcessor.find_site_config(dcn, datasheet, chave, expected_log)
+        assert table.find_config(chave, log) == expected
+        assert log.events == expected_log.events
+
+
+def test_excel_row(table):
+    assert table.frame['excel_row'].iloc[0] == 3
+
+
+def test_empty_datasheet(synthetic):
+    dcn, datasheet = synthetic
+    empty = datasheet.iloc[:0].copy()
+    table = LinkTable.build(dcn, empty)
+    report = validate_links(table)
+    assert report.links == 0
+    assert report.count('error') == 0
+    assert table.result('CH000000') == ('CH000000', None, "❌ 未找到CHAVE: CH000000")
+    assert resolve_link(table, 'CH000000').config is None
+
+
+@pytest.mark.parametrize('value', [np.nan, 'abc'])
+def test_invalid_radio_parameter(synthetic, value):
+    dcn, datasheet = synthetic
+    datasheet = datasheet.copy()
+    datasheet[BANDWIDTH] = datasheet[BANDWIDTH].astype(object)
+    datasheet.loc[datasheet.index[0], BANDWIDTH] = value
+    chave = datasheet['Chave'].iloc[0]
+    table = LinkTable.build(dcn, datasheet)
+
+    assert table.result(chave) == (chave, None, "❌ 无线参数无效: 带宽")
+    result = resolve_link(table, chave)
+    assert result.config is None
+    assert "❌ 无线参数无效: 带宽" in result.event_log.messages('error')
+    log = EventLog()
+    assert DataProcessor.find_site_config(dcn, datasheet, chave, log) is None
+    assert log.events == result.event_log.events
+    # 其余链路不受影响
+    assert table.result(datasheet['Chave'].iloc[1])[1] is not None
@@ -0,0 +1,55 @@
+"""模板编译器: 默认模板的输出必须与旧版手写f-string逐字节一致"""
+import pytest
+
+from benchmarks.bench_template import legacy_generate_script, sample_config
+from mwgen.generator import ZTEScriptGenerator
+from mwgen.template import Template, TemplateError
+
+
+@pytest.mark.parametrize('i', range(0, 600, 7))
+def test_default_template_matches_legacy(i):
+    config = sample_config(i)
+    for for_site_a in (True, False):
+        assert ZTEScriptGenerator.generate_script(config, for_site_a) == legacy_generate_script(config, for_site_a)
+
+
+def test_config_without_mask_uses_default_mask():
+    config = sample_config(3)
+    expected = legacy_generate_script(config)
+    for site in ('site_a', 'site_b'):
+        del config[site]['mask']
+    script = ZTEScriptGenerator.generate_script(config)
+    assert script == expected
+    assert f"ip address  {config['site_a']['ip']}  255.255.255.248" in script
+
+
+def test_mask_from_config():
+    config = sample_config(5)
+    config['site_a']['mask'] = '255.255.255.252'
+    script = ZTEScriptGenerator.generate_script(config)
+    assert f"ip address  {config['site_a']['ip']}  255.255.255.252" in script
+
+
+def test_loops_and_nested_slots():
+    template = Template("{% for x in items %}\n{{ x.name }}:{% for y in x.values %}{{ y }},{% endfor %};\n{% endfor %}\n")
+    context = {'items': [{'name': 'a', 'values': [1, 2]}, {'name': 'b', 'values': []}]}
+    assert template.render(context) == "a:1,2,;\nb:;\n"
+
+
+def test_braces_in_static_text():
+    assert Template("{x} {{ v }} }{").render({'v': 1}) == "{x} 1 }{"
+
+
+@pytest.mark.parametrize('source', [
+    "{% endfor %}",
+    "{% for x in items %}",
+    "{% if x %}{% endfor %}",
+])
+def test_syntax_errors(source):
+    with pytest.raises(TemplateError):
+        Template(source)
+
+
+def test_missing_parameter():
+    with pytest.raises(TemplateError):
+        Template("{{ site.ip }}").render({'site': {}})
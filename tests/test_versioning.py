@@ -0,0 +1,95 @@
+"""增量批量生成: 只为Datasheet中有变化的CHAVE重新渲染，复用的输出与全部重新生成一致"""
+import pytest
+
+from mwgen.generator import ZTEScriptGenerator
+from mwgen.network import LinkTable
+from mwgen.parallel import generate_parallel
+from mwgen.versioning import DatasheetVersion, diff_versions, regenerate
+
+BANDWIDTH = 'Largura de banda do canal (MHz)'
+MISSING = 'CH999999'
+
+
+def generate(dcn, datasheet, chave_numbers):
+    return list(generate_parallel(dcn, datasheet, chave_numbers, workers=1,
+                                  link_table=LinkTable.build(dcn, datasheet)))
+
+
+def run_batch(dcn, datasheet, chave_numbers, context, previous=None):
+    """返回 (结果列表, RenderedBatch, 重新渲染的CHAVE)"""
+    rendered = []
+
+    def render(pending):
+        rendered.extend(pending)
+        return generate(dcn, datasheet, pending)
+
+    items, batch, stats = regenerate(chave_numbers, render, DatasheetVersion.from_frame(datasheet),
+                                     context, previous)
+    items = list(items)
+    assert stats == {'reused': len(chave_numbers) - len(rendered), 'regenerated': len(rendered)}
+    return items, batch, rendered
+
+
+@pytest.fixture(scope='module')
+def first_batch(synthetic):
+    dcn, datasheet = synthetic
+    chave_numbers = list(datasheet['Chave']) + [MISSING]
+    context = ('dcn', ZTEScriptGenerator.template_version())
+    items, batch, rendered = run_batch(dcn, datasheet, chave_numbers, context)
+    assert rendered == chave_numbers
+    return chave_numbers, context, batch
+
+
+def revise(datasheet, position):
+    revised = datasheet.copy()
+    label = revised.index[position]
+    revised.loc[label, BANDWIDTH] = 56 if revised.loc[label, BANDWIDTH] != 56 else 28
+    return revised
+
+
+def test_only_changed_chave_is_regenerated(synthetic, first_batch):
+    dcn, datasheet = synthetic
+    chave_numbers, context, previous = first_batch
+    revised = revise(datasheet, 3)
+    changed = revised['Chave'].iloc[3]
+
+    diff = diff_versions(previous.version, DatasheetVersion.from_frame(revised))
+    assert (diff.added, diff.removed) == ([], [])
+    assert diff.changed == {changed.casefold(): ['radio']}
+
+    items, _, rendered = run_batch(dcn, revised, chave_numbers, context, previous)
+    # 查找失败的CHAVE不保存结果，每次都重新查找
+    assert rendered == [changed, MISSING]
+    assert items == generate(dcn, revised, chave_numbers)
+
+
+def test_unchanged_datasheet_reuses_everything(synthetic, first_batch):
+    dcn, datasheet = synthetic
+    chave_numbers, context, previous = first_batch
+    items, _, rendered = run_batch(dcn, datasheet.copy(), chave_numbers, context, previous)
+    assert rendered == [MISSING]
+    assert items == generate(dcn, datasheet, chave_numbers)
+
+
+def test_added_and_removed_chaves(synthetic, first_batch):
+    dcn, datasheet = synthetic
+    chave_numbers, context, previous = first_batch
+    revised = datasheet.copy()
+    revised.loc[revised.index[0], 'Chave'] = 'CH500000'
+    diff = diff_versions(previous.version, DatasheetVersion.from_frame(revised))
+    assert diff.added == ['ch500000']
+    assert diff.removed == [chave_numbers[0].casefold()]
+
+    requested = ['CH500000'] + chave_numbers[1:10]
+    items, _, rendered = run_batch(dcn, revised, requested, context, previous)
+    assert rendered == ['CH500000']
+    assert items == generate(dcn, revised, requested)
+
+
+@pytest.mark.parametrize('context', [('dcn-v2', None), ('dcn', 'other-template')])
+def test_context_change_regenerates_everything(synthetic, first_batch, context):
+    dcn, datasheet = synthetic
+    chave_numbers, previous_context, previous = first_batch
+    context = (context[0], context[1] or previous_context[1])
+    _, _, rendered = run_batch(dcn, datasheet, chave_numbers, context, previous)
+    assert rendered == chave_numbers